@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+from app.api.v1.admin.admin_model import AdminUser
+from app.metrics import MetricsRegistry, registry
+
+ADMIN_SESSION_CACHE_SIZE = int(os.getenv("ADMIN_SESSION_CACHE_SIZE", "1024"))
+ADMIN_SESSION_CACHE_TTL_SECONDS = float(os.getenv("ADMIN_SESSION_CACHE_TTL_SECONDS", "60"))
+
+
+class AdminSessionCache:
+    """
+    Process-wide LRU of verified session tokens and the admin they belong to.
+    An entry lives for the TTL or until its token expires, whichever is
+    sooner. Role and activation changes made through AdminService evict the
+    admin's entries here and, over NOTIFY, in other processes; the TTL bounds
+    staleness against changes made directly in the database.
+    """
+
+    def __init__(
+        self,
+        max_size: int = ADMIN_SESSION_CACHE_SIZE,
+        ttl: float = ADMIN_SESSION_CACHE_TTL_SECONDS,
+        metrics: MetricsRegistry = registry,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[AdminUser, float]]" = OrderedDict()
+        metrics.gauge("admin_session_cache_entries", fn=lambda: len(self._entries))
+        self._hits = metrics.counter("admin_session_cache_hits_total")
+        self._misses = metrics.counter("admin_session_cache_misses_total")
+
+    def get(self, token: str) -> Optional[AdminUser]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and time.monotonic() < entry[1]:
+                self._entries.move_to_end(token)
+                self._hits.inc()
+                return entry[0]
+            if entry is not None:
+                del self._entries[token]
+        self._misses.inc()
+        return None
+
+    def set(self, token: str, admin: AdminUser, token_expires_at: Optional[datetime] = None) -> None:
+        """Cache a verified token. token_expires_at is naive UTC, as tokens carry it."""
+        lifetime = self.ttl
+        if token_expires_at is not None:
+            lifetime = min(lifetime, (token_expires_at - datetime.utcnow()).total_seconds())
+        if lifetime <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (admin, time.monotonic() + lifetime)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_admin(self, admin_id: int) -> None:
+        """Drop every cached session of one admin."""
+        with self._lock:
+            for token in [token for token, (admin, _) in self._entries.items() if admin.id == admin_id]:
+                del self._entries[token]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def apply_admin_notification(payload: str) -> None:
+    """Evict an admin changed by another process, announced over NOTIFY with its id."""
+    admin_session_cache.invalidate_admin(int(payload))
+
+
+admin_session_cache = AdminSessionCache()
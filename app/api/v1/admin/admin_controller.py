@@ -1,30 +1,54 @@
 import logging
-from fastapi import APIRouter, HTTPException, Depends, status, Response
+from fastapi import APIRouter, HTTPException, Depends, status, Request, Response
 from fastapi.responses import JSONResponse
 from app.api.v1.admin.admin_service import AdminService
-from app.api.v1.admin.admin_model import AdminUser, AdminLogin, AdminCreate
+from app.api.v1.admin.admin_model import AdminUser, AdminLogin, AdminCreate, AdminUpdate
+from app.api.v1.admin.admin_throttle import login_throttle
 from app.api.v1.admin.dependencies import get_service, get_current_admin
+from app.password_pool import PasswordPoolBusy
 from app.security import create_admin_token
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+def _server_busy(error: PasswordPoolBusy) -> HTTPException:
+    """503 for a request turned away because every password hashing worker is taken."""
+    logger.warning(f"{error}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, try again shortly",
+        headers={"Retry-After": "1"}
+    )
+
 @router.post("/login")
-def login(
+async def login(
     credentials: AdminLogin,
+    request: Request,
     response: Response,
     service: AdminService = Depends(get_service)
 ) -> dict:
     """
-    Authenticate an admin user and set a session cookie.
+    Authenticate an admin user and set a session cookie. Attempts are
+    throttled per username and per client IP, which behind a reverse proxy
+    is only the real client's when FORWARDED_ALLOW_IPS trusts that proxy.
     """
+    client_ip = request.client.host if request.client else None
+    retry_after = login_throttle.acquire(credentials.username, client_ip)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(retry_after)}
+        )
+
     try:
-        admin = service.authenticate(credentials.username, credentials.password)
+        admin = await service.authenticate(credentials.username, credentials.password)
         if not admin:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid username or password"
             )
+        login_throttle.succeeded(credentials.username)
         
         # Create token
         token = create_admin_token(admin.id, admin.username, expires_in_hours=2)
@@ -49,6 +73,8 @@ def login(
         }
     except HTTPException:
         raise
+    except PasswordPoolBusy as e:
+        raise _server_busy(e)
     except Exception as e:
         logger.error(f"Error during login: {e}", exc_info=True)
         raise HTTPException(
@@ -57,7 +83,7 @@ def login(
         )
 
 @router.post("/logout")
-def logout(response: Response) -> dict:
+async def logout(response: Response) -> dict:
     """
     Logout by clearing the session cookie.
     """
@@ -65,7 +91,7 @@ def logout(response: Response) -> dict:
     return {"message": "Logout successful"}
 
 @router.get("/me")
-def get_current_user(
+async def get_current_user(
     current_admin: AdminUser = Depends(get_current_admin)
 ) -> AdminUser:
     """
@@ -74,7 +100,7 @@ def get_current_user(
     return current_admin
 
 @router.post("/users")
-def create_admin_user(
+async def create_admin_user(
     payload: AdminCreate,
     current_admin: AdminUser = Depends(get_current_admin),
     service: AdminService = Depends(get_service)
@@ -90,10 +116,44 @@ def create_admin_user(
         )
     
     try:
-        return service.create_admin(payload)
+        return await service.create_admin(payload)
+    except PasswordPoolBusy as e:
+        raise _server_busy(e)
     except Exception as e:
         logger.error(f"Error creating admin user: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating admin user: {str(e)}"
         )
+
+@router.patch("/users/{admin_id}")
+async def update_admin_user(
+    admin_id: int,
+    payload: AdminUpdate,
+    current_admin: AdminUser = Depends(get_current_admin),
+    service: AdminService = Depends(get_service)
+) -> AdminUser:
+    """
+    Change an admin user's role or deactivate them. Requires ADMIN role.
+    Their existing sessions stop working on the next request.
+    """
+    if current_admin.role.value != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only ADMIN role can update admin users"
+        )
+    
+    try:
+        admin = await service.update_admin(admin_id, payload)
+    except Exception as e:
+        logger.error(f"Error updating admin user {admin_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error updating admin user: {str(e)}"
+        )
+    if not admin:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Admin user {admin_id} not found"
+        )
+    return admin
@@ -28,4 +28,7 @@ class AdminCreate(BaseModel):
 class AdminLogin(BaseModel):
     username: str
     password: str
-    
\ No newline at end of file
+
+class AdminUpdate(BaseModel):
+    role: Optional[AdminRole] = None
+    is_active: Optional[bool] = None
@@ -3,7 +3,8 @@ from typing import Optional
 from sqlmodel import SQLModel, Field, Column, String, Session, select
 from sqlalchemy.engine import Engine
 from app.api.v1.admin.admin_model import AdminUser, AdminRole
-from app.db import get_engine
+from app.db import get_engine, UnitOfWork
+from app.notify import notify_async, ADMIN_CHANNEL
 
 class AdminUserSQLModel(SQLModel, table=True):
     __tablename__ = "admin_users"
@@ -41,6 +42,18 @@ class AdminUserSQLModel(SQLModel, table=True):
             is_active=admin_user.is_active
         )
 
+def _new_admin_user(username: str, password_hash: str, role: AdminRole) -> AdminUserSQLModel:
+    now = datetime.utcnow()
+    return AdminUserSQLModel(
+        username=username,
+        password_hash=password_hash,
+        role=role,
+        created_at=now,
+        updated_at=now,
+        last_login_at=None,
+        is_active=True
+    )
+
 class AdminRepository:
     def __init__(self, engine: Engine = None):
         self.engine = engine or get_engine()
@@ -66,6 +79,15 @@ class AdminRepository:
                 return result.to_domain()
             return None
 
+    def create_admin(self, username: str, password_hash: str, role: AdminRole) -> AdminUser:
+        """Create a new, active admin user with the provided password hash."""
+        with self._get_session() as session:
+            admin_sql = _new_admin_user(username, password_hash, role)
+            session.add(admin_sql)
+            session.commit()
+            session.refresh(admin_sql)
+            return admin_sql.to_domain()
+
     def create_admin_user(self, admin_user: AdminUser, password_hash: str) -> AdminUser:
         """Create a new admin user with the provided password hash."""
         with self._get_session() as session:
@@ -85,4 +107,62 @@ class AdminRepository:
                 admin.updated_at = datetime.utcnow()
                 session.add(admin)
                 session.commit()
-            
\ No newline at end of file
+
+class AsyncAdminRepository:
+    """AdminRepository on a UnitOfWork, for request handlers."""
+
+    def __init__(self, uow: UnitOfWork):
+        self.session = uow.session
+
+    async def get_by_username(self, username: str) -> Optional[AdminUserSQLModel]:
+        """Get an admin user by username, including password_hash for verification."""
+        statement = select(AdminUserSQLModel).where(AdminUserSQLModel.username == username)
+        return (await self.session.exec(statement)).first()
+
+    async def get_by_id(self, admin_id: int) -> Optional[AdminUser]:
+        """Get an admin user by ID."""
+        result = await self.session.get(AdminUserSQLModel, admin_id)
+        if result:
+            return result.to_domain()
+        return None
+
+    async def create_admin(self, username: str, password_hash: str, role: AdminRole) -> AdminUser:
+        """Create a new, active admin user with the provided password hash."""
+        admin_sql = _new_admin_user(username, password_hash, role)
+        self.session.add(admin_sql)
+        await self.session.flush()
+        return admin_sql.to_domain()
+
+    async def update_last_login(self, admin_id: int) -> Optional[AdminUser]:
+        """
+        Update the last_login_at timestamp for an admin user. Returns the
+        admin as now stored, or None if they no longer exist.
+        """
+        admin = await self.session.get(AdminUserSQLModel, admin_id, populate_existing=True)
+        if not admin:
+            return None
+        admin.last_login_at = datetime.utcnow()
+        admin.updated_at = datetime.utcnow()
+        self.session.add(admin)
+        await self.session.flush()
+        return admin.to_domain()
+
+    async def update_admin(
+        self, admin_id: int, role: Optional[AdminRole] = None, is_active: Optional[bool] = None
+    ) -> Optional[AdminUser]:
+        """
+        Change an admin's role and/or active flag. Other processes are told to
+        drop the admin's cached sessions once the transaction commits.
+        """
+        admin = await self.session.get(AdminUserSQLModel, admin_id)
+        if not admin:
+            return None
+        if role is not None:
+            admin.role = role
+        if is_active is not None:
+            admin.is_active = is_active
+        admin.updated_at = datetime.utcnow()
+        self.session.add(admin)
+        await self.session.flush()
+        await notify_async(self.session, ADMIN_CHANNEL, [str(admin_id)])
+        return admin.to_domain()
@@ -1,60 +1,75 @@
 import logging
-from datetime import datetime
 from typing import Optional
-from app.api.v1.admin.admin_model import AdminUser, AdminCreate
-from app.api.v1.admin.admin_repository import AdminRepository, AdminUserSQLModel
-from app.security import hash_password, verify_password
+from app.api.v1.admin.admin_model import AdminUser, AdminCreate, AdminUpdate
+from app.api.v1.admin.admin_cache import AdminSessionCache, admin_session_cache
+from app.api.v1.admin.admin_repository import AsyncAdminRepository
+from app.password_pool import PasswordHashPool, password_pool
+from app.db import UnitOfWork
 
 logger = logging.getLogger(__name__)
 
 class AdminService:
-    def __init__(self, repository: AdminRepository = None):
-        self.repository = repository or AdminRepository()
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        repository: AsyncAdminRepository = None,
+        session_cache: AdminSessionCache = None,
+        hasher: PasswordHashPool = None
+    ):
+        self.uow = uow
+        self.repository = repository or AsyncAdminRepository(uow)
+        self.session_cache = session_cache or admin_session_cache
+        self.hasher = hasher or password_pool
 
-    def create_admin(self, payload: AdminCreate) -> AdminUser:
+    async def create_admin(self, payload: AdminCreate) -> AdminUser:
         """Create a new admin user."""
-        # Hash the password
-        password_hash = hash_password(payload.password)
-        
-        # Create SQLModel directly (don't need domain model until after save)
-        now = datetime.utcnow()
-        admin_sql = AdminUserSQLModel(
-            username=payload.username,
-            password_hash=password_hash,
-            role=payload.role,
-            created_at=now,
-            updated_at=now,
-            last_login_at=None,
-            is_active=True
-        )
-        
-        # Save to database
-        with self.repository._get_session() as session:
-            session.add(admin_sql)
-            session.commit()
-            session.refresh(admin_sql)
-            # Return domain model after save (now has id)
-            return admin_sql.to_domain()
+        password_hash = await self.hasher.hash_password(payload.password)
+        admin = await self.repository.create_admin(payload.username, password_hash, payload.role)
+        await self.uow.commit()
+        return admin
 
-    def authenticate(self, username: str, password: str) -> Optional[AdminUser]:
-        """Authenticate an admin user by username and password."""
-        admin_sql = self.repository.get_by_username(username)
+    async def update_admin(self, admin_id: int, payload: AdminUpdate) -> Optional[AdminUser]:
+        """Change an admin's role or active flag; their cached sessions are dropped on commit."""
+        admin = await self.repository.update_admin(admin_id, payload.role, payload.is_active)
+        if not admin:
+            return None
+        self.uow.after_commit(lambda: self.session_cache.invalidate_admin(admin_id))
+        await self.uow.commit()
+        return admin
+
+    async def authenticate(self, username: str, password: str) -> Optional[AdminUser]:
+        """
+        Authenticate an admin user by username and password. Unknown and
+        inactive users still cost one password verification, so response
+        times do not reveal which usernames exist.
+        """
+        admin_sql = await self.repository.get_by_username(username)
+        # Copied out before the rollback below expires the loaded row
+        admin = admin_sql.to_domain() if admin_sql else None
+        password_hash = admin_sql.password_hash if admin_sql else None
+        # Give the connection back to the pool while the password is checked
+        await self.uow.rollback()
+        password_valid = await self.hasher.verify_password(password, password_hash)
         
-        if not admin_sql:
+        if not admin:
             logger.debug(f"Authentication failed: user '{username}' not found")
             return None
         
-        if not admin_sql.is_active:
+        if not admin.is_active:
             logger.warning(f"Attempted login for inactive admin: {username}")
             return None
         
-        password_valid = verify_password(password, admin_sql.password_hash)
         if not password_valid:
             logger.debug(f"Authentication failed: invalid password for user '{username}'")
             return None
         
-        # Update last login timestamp
-        self.repository.update_last_login(admin_sql.id)
+        # Re-read the admin while recording the login, in case they changed during verification
+        admin = await self.repository.update_last_login(admin.id)
+        if not admin or not admin.is_active:
+            logger.warning(f"Admin '{username}' was removed or deactivated during login")
+            await self.uow.rollback()
+            return None
+        await self.uow.commit()
         
         # Return domain model (without password_hash)
-        return admin_sql.to_domain()
\ No newline at end of file
+        return admin
@@ -0,0 +1,82 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Optional
+from app.metrics import registry
+
+LOGIN_WINDOW_SECONDS = float(os.getenv("LOGIN_WINDOW_SECONDS", "60"))
+LOGIN_MAX_ATTEMPTS_PER_USERNAME = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_USERNAME", "5"))
+LOGIN_MAX_ATTEMPTS_PER_IP = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_IP", "20"))
+# Bounds memory when attempts come from many addresses or usernames
+LOGIN_THROTTLE_MAX_KEYS = 10000
+
+
+class SlidingWindowLimiter:
+    """Allows `limit` attempts per key within any `window`-second span."""
+
+    def __init__(self, limit: int, window: float, max_keys: int = LOGIN_THROTTLE_MAX_KEYS):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._attempts: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def acquire(self, key: str) -> Optional[float]:
+        """
+        Record an attempt for key. Returns None if it is allowed, otherwise
+        the seconds until the oldest attempt leaves the window.
+        """
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None:
+                attempts = self._attempts[key] = deque()
+            self._attempts.move_to_end(key)
+            while attempts and attempts[0] <= now - self.window:
+                attempts.popleft()
+            if len(attempts) >= self.limit:
+                return attempts[0] + self.window - now
+            attempts.append(now)
+            while len(self._attempts) > self.max_keys:
+                self._attempts.popitem(last=False)
+            return None
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._attempts.pop(key, None)
+
+
+class LoginThrottle:
+    """
+    Limits login attempts per username and per client IP, checked before any
+    password hashing so throttled attempts cost next to nothing. A successful
+    login clears the username's attempts.
+    """
+
+    def __init__(
+        self,
+        per_username: int = LOGIN_MAX_ATTEMPTS_PER_USERNAME,
+        per_ip: int = LOGIN_MAX_ATTEMPTS_PER_IP,
+        window: float = LOGIN_WINDOW_SECONDS,
+    ):
+        self.usernames = SlidingWindowLimiter(per_username, window)
+        self.ips = SlidingWindowLimiter(per_ip, window)
+        self._throttled = registry.counter("admin_login_throttled_total")
+
+    def acquire(self, username: str, ip: Optional[str]) -> Optional[int]:
+        """Returns None if the attempt may proceed, otherwise a Retry-After in seconds."""
+        retry_after = self.ips.acquire(ip or "unknown")
+        if retry_after is None:
+            retry_after = self.usernames.acquire(username.lower())
+        if retry_after is None:
+            return None
+        self._throttled.inc()
+        return max(math.ceil(retry_after), 1)
+
+    def succeeded(self, username: str) -> None:
+        self.usernames.reset(username.lower())
+
+
+login_throttle = LoginThrottle()
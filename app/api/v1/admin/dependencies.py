@@ -1,25 +1,33 @@
 """Dependency injection for admin module."""
 from fastapi import Depends, HTTPException, status, Request
-from app.api.v1.admin.admin_repository import AdminRepository
+from app.api.v1.admin.admin_repository import AsyncAdminRepository
 from app.api.v1.admin.admin_service import AdminService
+from datetime import datetime
+from typing import Optional
 from app.api.v1.admin.admin_model import AdminUser
+from app.api.v1.admin.admin_cache import admin_session_cache
 from app.security import verify_admin_token
+from app.db import UnitOfWork, get_unit_of_work
 
-def get_repository() -> AdminRepository:
-    return AdminRepository()
+async def get_repository(
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function")
+) -> AsyncAdminRepository:
+    return AsyncAdminRepository(uow)
 
-def get_service(
-    repository: AdminRepository = Depends(get_repository)
+async def get_service(
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function"),
+    repository: AsyncAdminRepository = Depends(get_repository)
 ) -> AdminService:
-    return AdminService(repository)
+    return AdminService(uow, repository)
 
-def get_current_admin(
+async def get_current_admin(
     request: Request,
     service: AdminService = Depends(get_service)
 ) -> AdminUser:
     """
     Dependency to get the current authenticated admin from the session cookie.
-    Raises HTTPException if not authenticated.
+    Raises HTTPException if not authenticated. Tokens verified recently are
+    answered from the session cache without a database round trip.
     """
     # Get token from cookie
     token = request.cookies.get("admin_session")
@@ -28,6 +36,10 @@ def get_current_admin(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated"
         )
+
+    admin = admin_session_cache.get(token)
+    if admin:
+        return admin
     
     # Verify token
     payload = verify_admin_token(token)
@@ -45,7 +57,7 @@ def get_current_admin(
             detail="Invalid token payload"
         )
     
-    admin = service.repository.get_by_id(admin_id)
+    admin = await service.repository.get_by_id(admin_id)
     if not admin:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -58,4 +70,19 @@ def get_current_admin(
             detail="Admin account is inactive"
         )
     
+    expires_at = payload.get("expires_at")
+    admin_session_cache.set(token, admin, datetime.fromisoformat(expires_at) if expires_at else None)
     return admin
+
+async def get_optional_admin(
+    request: Request,
+    service: AdminService = Depends(get_service)
+) -> Optional[AdminUser]:
+    """
+    Dependency for endpoints open to everyone that treat admins differently.
+    Returns the authenticated admin, or None.
+    """
+    try:
+        return await get_current_admin(request, service)
+    except HTTPException:
+        return None
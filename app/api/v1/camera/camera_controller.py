@@ -0,0 +1,78 @@
+import hmac
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Request, Response, status
+from app.api.v1.camera.camera_snapshot import frame_cache, frame_source, is_jpeg
+from app.http_cache import etag_matches
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+CAMERA_INGEST_TOKEN = os.getenv("CAMERA_INGEST_TOKEN")
+CAMERA_SNAPSHOT_MAX_AGE_SECONDS = int(os.getenv("CAMERA_SNAPSHOT_MAX_AGE_SECONDS", "2"))
+CAMERA_SNAPSHOT_MAX_BYTES = int(os.getenv("CAMERA_SNAPSHOT_MAX_BYTES", str(5 * 1024 * 1024)))
+
+
+@router.api_route("/camera/snapshot.jpg", methods=["GET", "HEAD"])
+async def get_snapshot(request: Request) -> Response:
+    """
+    The latest camera frame, for clients that cannot open a WebRTC session.
+    Served straight from memory; the short max-age lets browsers and CDNs
+    absorb bursts, and If-None-Match revalidation answers 304.
+    """
+    frame = frame_cache.frame
+    if frame is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="No camera frame available yet",
+            headers={"Retry-After": "5"}
+        )
+
+    headers = {
+        "ETag": frame.etag,
+        "Last-Modified": frame.last_modified,
+        "Cache-Control": f"public, max-age={CAMERA_SNAPSHOT_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), frame.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=frame.data, media_type="image/jpeg", headers=headers)
+
+
+@router.put("/camera/snapshot.jpg", status_code=status.HTTP_204_NO_CONTENT)
+async def put_snapshot(
+    request: Request,
+    authorization: Optional[str] = Header(default=None),
+    x_captured_at: Optional[datetime] = Header(default=None)
+) -> Response:
+    """
+    Replace the latest frame. Pushed by the edge device as a raw JPEG body
+    with `Authorization: Bearer <CAMERA_INGEST_TOKEN>`; the optional
+    X-Captured-At header (ISO 8601) sets Last-Modified. With
+    CAMERA_SNAPSHOT_FILE set, the frame is also written there for the other
+    workers to load.
+    """
+    if not CAMERA_INGEST_TOKEN:
+        raise HTTPException(status_code=500, detail="CAMERA_INGEST_TOKEN is not set")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), CAMERA_INGEST_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid camera token")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > CAMERA_SNAPSHOT_MAX_BYTES:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Frame too large")
+    data = await request.body()
+    if len(data) > CAMERA_SNAPSHOT_MAX_BYTES:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Frame too large")
+    if not is_jpeg(data):
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Body is not a JPEG")
+
+    frame = frame_cache.set(data, x_captured_at)
+    if frame_source:
+        try:
+            await frame_source.publish(frame)
+        except Exception as e:
+            # This worker serves the frame regardless; the others keep the previous one
+            logger.error(f"Error sharing camera frame: {e}", exc_info=True)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+from app.metrics import MetricsRegistry, registry
+
+logger = logging.getLogger(__name__)
+
+# Frames pushed to one worker reach the others only through this file; without
+# it, run a single worker or GETs on the others serve stale frames or 503
+CAMERA_SNAPSHOT_FILE = os.getenv("CAMERA_SNAPSHOT_FILE")
+CAMERA_SNAPSHOT_FILE_POLL_SECONDS = float(os.getenv("CAMERA_SNAPSHOT_FILE_POLL_SECONDS", "1"))
+
+JPEG_START = b"\xff\xd8\xff"
+JPEG_END = b"\xff\xd9"
+
+
+@dataclass(frozen=True)
+class Frame:
+    """One encoded frame with its validators computed once, when it arrives."""
+    data: bytes
+    etag: str
+    captured_at: datetime
+
+    @property
+    def last_modified(self) -> str:
+        return format_datetime(self.captured_at, usegmt=True)
+
+
+def is_jpeg(data: bytes) -> bool:
+    """Cheap check for a complete JPEG, which also rejects files caught mid-write."""
+    return data.startswith(JPEG_START) and data.endswith(JPEG_END)
+
+
+class FrameCache:
+    """
+    Holds the latest camera frame. Frames are immutable and replaced by
+    swapping a single reference, so readers never lock or copy.
+    """
+
+    def __init__(self, metrics: MetricsRegistry = registry):
+        self._frame: Optional[Frame] = None
+        self._received_at: Optional[float] = None
+        self._updates = metrics.counter("camera_frames_received_total")
+        metrics.gauge("camera_frame_age_seconds", fn=lambda: self.age if self.age is not None else -1)
+
+    @property
+    def frame(self) -> Optional[Frame]:
+        return self._frame
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the latest frame arrived, or None without one."""
+        if self._received_at is None:
+            return None
+        return time.monotonic() - self._received_at
+
+    def set(self, data: bytes, captured_at: Optional[datetime] = None) -> Frame:
+        """Make data the latest frame. A naive captured_at is taken as UTC."""
+        captured_at = captured_at or datetime.now(timezone.utc)
+        if captured_at.tzinfo is None:
+            captured_at = captured_at.replace(tzinfo=timezone.utc)
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        frame = Frame(data=data, etag=f'"{digest}"', captured_at=captured_at.replace(microsecond=0))
+        self._frame = frame
+        self._received_at = time.monotonic()
+        self._updates.inc()
+        return frame
+
+
+class FrameSource(ABC):
+    """Feeds frames into a cache from somewhere other than the ingest endpoint."""
+
+    @abstractmethod
+    async def start(self, cache: FrameCache) -> None:
+        ...
+
+    @abstractmethod
+    async def stop(self) -> None:
+        ...
+
+    async def publish(self, frame: Frame) -> None:
+        """Share a frame pushed to this worker with the other workers, if the source can."""
+
+
+class FileFrameSource(FrameSource):
+    """
+    Reloads a JPEG from disk whenever its modification time changes. Frames
+    pushed to any worker are written to the same file, so every worker
+    serves the latest one within a poll interval. Something else, e.g. the
+    edge device, may also write the file directly.
+    """
+
+    def __init__(self, path: str, poll_interval: float = CAMERA_SNAPSHOT_FILE_POLL_SECONDS):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+        self._mtime: Optional[float] = None
+
+    async def start(self, cache: FrameCache) -> None:
+        if self._task is None:
+            await self._load(cache)
+            self._task = asyncio.create_task(self._poll(cache))
+            logger.info(f"Loading camera frames from {self.path}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _write(self, frame: Frame) -> None:
+        # Write beside the target and rename over it, so readers never see half a frame
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(frame.data)
+        captured_at = frame.captured_at.timestamp()
+        os.utime(temp_path, (captured_at, captured_at))
+        os.replace(temp_path, self.path)
+        # Already in this worker's cache, so the poller need not load it again
+        self._mtime = os.stat(self.path).st_mtime
+
+    async def publish(self, frame: Frame) -> None:
+        await asyncio.to_thread(self._write, frame)
+
+    def _read_if_changed(self) -> Optional[bytes]:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return None
+        if mtime == self._mtime:
+            return None
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self._mtime = mtime
+        return data
+
+    async def _load(self, cache: FrameCache) -> None:
+        data = await asyncio.to_thread(self._read_if_changed)
+        if data is None:
+            return
+        if not is_jpeg(data):
+            logger.warning(f"Ignoring {self.path}: not a complete JPEG")
+            return
+        cache.set(data, datetime.fromtimestamp(self._mtime, timezone.utc))
+
+    async def _poll(self, cache: FrameCache) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._load(cache)
+            except Exception as e:
+                logger.error(f"Error loading camera frame from {self.path}: {e}", exc_info=True)
+
+
+frame_cache = FrameCache()
+frame_source: Optional[FrameSource] = FileFrameSource(CAMERA_SNAPSHOT_FILE) if CAMERA_SNAPSHOT_FILE else None
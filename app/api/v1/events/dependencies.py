@@ -1,16 +1,45 @@
 """Dependency injection for events module."""
+from typing import Optional
 from fastapi import Depends
-from app.api.v1.events.events_repository import EventsRepository
+from app.api.v1.events.events_repository import AsyncEventsRepository
+from app.api.v1.events.events_rollup_repository import AsyncEventRollupRepository
 from app.api.v1.events.events_service import EventsService
+from app.api.v1.events.events_queue import EventsIngestQueue, EVENTS_INGEST_MODE
 from app.api.v1.state.state_service import StateService
 from app.api.v1.state.dependencies import get_service as get_state_service
+from app.db import UnitOfWork, get_unit_of_work
 
 
-def get_repository() -> EventsRepository:
-    return EventsRepository()
+# Shares the request's unit of work with the state service, so an event and
+# the state it produces are written in one transaction
+async def get_repository(
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function")
+) -> AsyncEventsRepository:
+    return AsyncEventsRepository(uow)
 
-def get_service(
-    repository: EventsRepository = Depends(get_repository),
-    state_service: StateService = Depends(get_state_service)
+async def get_rollup_repository(
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function")
+) -> AsyncEventRollupRepository:
+    return AsyncEventRollupRepository(uow)
+
+async def get_service(
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function"),
+    repository: AsyncEventsRepository = Depends(get_repository),
+    state_service: StateService = Depends(get_state_service),
+    rollup_repository: AsyncEventRollupRepository = Depends(get_rollup_repository)
+) -> EventsService:
+    return EventsService(uow, repository, state_service, rollup_repository)
+
+# An export streams after the endpoint returns, so its unit of work is held
+# until the response has been sent rather than released with the function
+async def get_export_service(
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> EventsService:
-    return EventsService(repository, state_service)
+    return EventsService(uow)
+
+
+# One queue per process, only when write-behind ingestion is enabled
+_ingest_queue = EventsIngestQueue() if EVENTS_INGEST_MODE == "async" else None
+
+async def get_ingest_queue() -> Optional[EventsIngestQueue]:
+    return _ingest_queue
@@ -1,26 +1,136 @@
 import logging
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Body, Response, status
+from fastapi.responses import StreamingResponse
 from app.api.v1.events.events_service import EventsService
-from app.api.v1.events.events_model import Event
-from app.api.v1.events.dependencies import get_service
+from app.api.v1.events.events_model import (
+    Event, EventsQuery, EventPage, EventBatchResult, EventStatsQuery, EventStats, EventsExportQuery
+)
+from app.api.v1.events.events_export import MEDIA_TYPES, encode_rows, gzip_stream
+from app.api.v1.events.events_repository import EXPORT_COLUMNS
+from app.api.v1.events.events_queue import EventsIngestQueue, IngestQueueUnavailable
+from app.api.v1.events.dependencies import get_service, get_export_service, get_ingest_queue
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.get("/events")
-def get_events(service: EventsService = Depends(get_service)) -> List[Event]:
+MAX_BATCH_SIZE = 1000
+
+@router.get("/events", response_model=EventPage)
+async def get_events(
+    query: EventsQuery = Query(),
+    service: EventsService = Depends(get_service)
+) -> Response:
+    """
+    List events newest first. Pass the returned next_cursor back as cursor
+    to fetch the following page. With recent=N, just the newest N matching
+    events are returned, usually from memory, and no cursor.
+    """
     try:
-        return service.get_events()
+        # Encoded from column tuples, so response_model only documents the shape
+        if query.recent is not None:
+            content = await service.get_recent_events_json(query)
+        else:
+            content = await service.get_events_json(query)
+        return Response(content=content, media_type="application/json")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting events: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error getting events: {str(e)}")
 
 
+async def _log_export_errors(content: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # Headers are already sent once streaming starts, so failures can only be logged
+    try:
+        async for chunk in content:
+            yield chunk
+    except Exception as e:
+        logger.error(f"Error exporting events: {e}", exc_info=True)
+        raise
+
+
+@router.get("/events/export")
+async def export_events(
+    query: EventsExportQuery = Query(),
+    service: EventsService = Depends(get_export_service)
+) -> StreamingResponse:
+    """
+    Download every matching event, oldest first, as NDJSON or CSV. Rows are
+    streamed from a server-side cursor, so memory use does not grow with
+    the size of the export. Pass gzip=true to compress on the fly.
+    """
+    content = encode_rows(service.export_events(query), EXPORT_COLUMNS, query.format)
+    filename = f"events.{query.format.value}"
+    media_type = MEDIA_TYPES[query.format]
+    if query.gzip:
+        content = gzip_stream(content)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        _log_export_errors(content),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/events/stats")
+async def get_event_stats(
+    query: EventStatsQuery = Query(),
+    service: EventsService = Depends(get_service)
+) -> EventStats:
+    """
+    Openings, open durations and per-device event counts per hour or day,
+    read from the rollup tables. Buckets without events are omitted.
+    """
+    try:
+        return await service.get_stats(query)
+    except Exception as e:
+        logger.error(f"Error getting event stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error getting event stats: {str(e)}")
+
+
 @router.post("/events")
-def create_event(event: Event, service: EventsService = Depends(get_service)) -> Event:
+async def create_event(
+    event: Event,
+    response: Response,
+    service: EventsService = Depends(get_service),
+    ingest_queue: Optional[EventsIngestQueue] = Depends(get_ingest_queue)
+) -> Event:
+    """
+    Ingest an event. With write-behind ingestion enabled the event is queued
+    for a background bulk insert and 202 is returned.
+    """
     try:
-        return service.create_event(event)
+        if ingest_queue is None:
+            return await service.create_event(event)
+        
+        await ingest_queue.enqueue(event)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return event
+    except IngestQueueUnavailable as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Error creating event: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error creating event: {str(e)}")
+
+
+@router.post("/events/batch")
+async def create_events(
+    events: List[Event] = Body(min_length=1, max_length=MAX_BATCH_SIZE),
+    service: EventsService = Depends(get_service)
+) -> EventBatchResult:
+    """
+    Ingest a batch of buffered events in one insert. Events already stored
+    are skipped and counted as duplicates, repeats within the batch as repeated.
+    """
+    try:
+        return await service.create_events(events)
+    except Exception as e:
+        logger.error(f"Error creating events batch: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error creating events batch: {str(e)}")
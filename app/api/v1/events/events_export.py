@@ -0,0 +1,58 @@
+"""Encoding of streamed event rows as NDJSON or CSV, optionally gzip-compressed."""
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, List, Sequence
+from app.api.v1.events.events_model import ExportFormat
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _plain(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def encode_ndjson(columns: Sequence[str], rows: List[Sequence]) -> bytes:
+    """One JSON object per line, in the same shape the API returns events."""
+    lines = [
+        json.dumps(dict(zip(columns, map(_plain, row))), separators=(",", ":"))
+        for row in rows
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def encode_csv(rows: List[Sequence]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([map(_plain, row) for row in rows])
+    return buffer.getvalue().encode("utf-8")
+
+
+async def encode_rows(
+    chunks: AsyncIterator[List[Sequence]], columns: Sequence[str], export_format: ExportFormat
+) -> AsyncIterator[bytes]:
+    """Encode each chunk of rows as it arrives; CSV output starts with a header row."""
+    if export_format == ExportFormat.CSV:
+        yield encode_csv([columns])
+    async for rows in chunks:
+        if export_format == ExportFormat.CSV:
+            yield encode_csv(rows)
+        else:
+            yield encode_ndjson(columns, rows)
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a single gzip member, chunk by chunk."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
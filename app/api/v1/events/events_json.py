@@ -0,0 +1,30 @@
+"""
+Precompiled JSON encoding of event listings, straight from selected column
+tuples. Skips building and re-validating a model per row, and produces the
+same JSON as FastAPI serializing an EventPage.
+"""
+from typing import List, Optional, Sequence
+from pydantic_core import SchemaSerializer, core_schema
+
+# Same fields, in the same order, as events_model.Event
+EVENT_COLUMNS = ("event_id", "source_device_id", "bridge_state", "bridge_confidence", "timestamp")
+
+_EVENT_SCHEMA = core_schema.typed_dict_schema({
+    "event_id": core_schema.typed_dict_field(core_schema.str_schema()),
+    "source_device_id": core_schema.typed_dict_field(core_schema.str_schema()),
+    # BridgeState is a str enum, so its members serialize as their values
+    "bridge_state": core_schema.typed_dict_field(core_schema.str_schema()),
+    "bridge_confidence": core_schema.typed_dict_field(core_schema.float_schema()),
+    "timestamp": core_schema.typed_dict_field(core_schema.datetime_schema()),
+})
+
+_EVENT_PAGE_SERIALIZER = SchemaSerializer(core_schema.typed_dict_schema({
+    "items": core_schema.typed_dict_field(core_schema.list_schema(_EVENT_SCHEMA)),
+    "next_cursor": core_schema.typed_dict_field(core_schema.nullable_schema(core_schema.str_schema())),
+}))
+
+
+def encode_event_page(rows: List[Sequence], next_cursor: Optional[str]) -> bytes:
+    """Encode rows whose leading columns are EVENT_COLUMNS as an EventPage JSON document."""
+    items = [dict(zip(EVENT_COLUMNS, row)) for row in rows]
+    return _EVENT_PAGE_SERIALIZER.to_json({"items": items, "next_cursor": next_cursor})
@@ -1,6 +1,7 @@
 from enum import Enum
-from datetime import datetime
-from pydantic import BaseModel
+from datetime import datetime, timezone
+from typing import Annotated, Dict, List, Optional
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, model_validator
 
 
 class BridgeState(str, Enum):
@@ -11,12 +12,118 @@ class BridgeState(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
+def to_naive_utc(value: datetime) -> datetime:
+    """Timestamps are stored without a time zone, as UTC; convert any that carry one."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# A datetime as stored: aware inputs such as "...Z" or "...+02:00" become naive UTC
+UtcDatetime = Annotated[datetime, AfterValidator(to_naive_utc)]
+
+
 class Event(BaseModel):
     event_id: str
     source_device_id: str
     bridge_state: BridgeState
     bridge_confidence: float
-    timestamp: datetime
+    timestamp: UtcDatetime
 
     class Config:
         from_attributes = True
+
+
+class EventsFilter(BaseModel):
+    """Filters shared by event listing and export."""
+    source_device_id: Optional[str] = None
+    bridge_state: Optional[BridgeState] = None
+    min_confidence: Optional[float] = Field(default=None, ge=0, le=1)
+    since: Optional[UtcDatetime] = None
+    until: Optional[UtcDatetime] = None
+
+
+class EventsQuery(EventsFilter):
+    """Filters and keyset cursor for listing events, newest first."""
+    cursor: Optional[str] = None
+    limit: int = Field(default=100, ge=1, le=1000)
+    # Just the newest `recent` matching events, served from memory when possible
+    recent: Optional[int] = Field(default=None, ge=1, le=1000)
+
+    @model_validator(mode="after")
+    def check_recent(self) -> "EventsQuery":
+        if self.recent is not None and self.cursor:
+            raise ValueError("recent cannot be combined with cursor")
+        return self
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class EventsExportQuery(EventsFilter):
+    """Filters and output format for exporting events, oldest first."""
+    format: ExportFormat = ExportFormat.NDJSON
+    gzip: bool = False
+
+
+class EventPage(BaseModel):
+    items: List[Event]
+    next_cursor: Optional[str] = None
+
+
+class EventBatchResult(BaseModel):
+    inserted: int
+    # Already stored before this batch
+    duplicates: int
+    # Repeats of another event in the same batch
+    repeated: int = 0
+
+
+class StatsBucket(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+# Longest range a single stats request may cover, in buckets
+MAX_STATS_BUCKETS = 1000
+
+
+class EventStatsQuery(BaseModel):
+    """Time range [from, to) and bucket size for rollup statistics."""
+    model_config = ConfigDict(populate_by_name=True)
+
+    from_: UtcDatetime = Field(alias="from")
+    to: UtcDatetime
+    bucket: StatsBucket = StatsBucket.DAY
+    source_device_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_range(self) -> "EventStatsQuery":
+        if self.to <= self.from_:
+            raise ValueError("to must be after from")
+        bucket_seconds = 3600 if self.bucket == StatsBucket.HOUR else 86400
+        if (self.to - self.from_).total_seconds() / bucket_seconds > MAX_STATS_BUCKETS:
+            raise ValueError(f"Range covers more than {MAX_STATS_BUCKETS} {self.bucket.value} buckets")
+        return self
+
+
+class EventStatsBucket(BaseModel):
+    """
+    Totals for one bucket. Open periods are attributed to the bucket in which
+    they started; open_periods counts only those that have since closed.
+    """
+    bucket_start: datetime
+    event_count: int
+    openings: int
+    open_periods: int
+    open_seconds: float
+    average_open_seconds: Optional[float] = None
+    max_open_seconds: float
+    device_event_counts: Dict[str, int]
+
+
+class EventStats(BaseModel):
+    bucket: StatsBucket
+    items: List[EventStatsBucket]
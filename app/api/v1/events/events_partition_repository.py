@@ -0,0 +1,182 @@
+import logging
+import os
+import re
+from typing import Iterator, List, Optional, Tuple
+from datetime import datetime
+from sqlmodel import Session
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.api.v1.events.events_model import Event
+from app.api.v1.events.events_repository import _insert_events_statement
+from app.db import get_engine
+
+logger = logging.getLogger(__name__)
+
+EVENTS_PARTITION_MONTHS_AHEAD = int(os.getenv("EVENTS_PARTITION_MONTHS_AHEAD", "3"))
+
+DEFAULT_PARTITION = "events_default"
+
+_PARTITION_NAME_PATTERN = re.compile(r"^events_(\d{4})_(\d{2})$")
+
+
+def month_start(timestamp: datetime) -> datetime:
+    return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"events_{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """The month a partition covers, or None for tables that are not monthly partitions."""
+    match = _PARTITION_NAME_PATTERN.match(name)
+    if match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+class EventsPartitionRepository:
+    """
+    Maintenance of the monthly range partitions behind the events table:
+    creating them ahead of time, exporting and dropping old ones, and
+    loading archived events back in.
+    """
+
+    def __init__(self, engine: Engine = None):
+        self.engine = engine or get_engine()
+
+    def _get_session(self) -> Session:
+        """Create and return a database session."""
+        return Session(self.engine)
+
+    def is_partitioned(self) -> bool:
+        with self._get_session() as session:
+            relkind = session.execute(
+                text("SELECT relkind FROM pg_class WHERE oid = to_regclass('events')")
+            ).scalar()
+        return relkind == "p"
+
+    def _partition_names(self, session: Session) -> List[str]:
+        return session.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = 'events'::regclass"
+        )).scalars().all()
+
+    def get_partitions(self) -> List[Tuple[str, datetime]]:
+        """Monthly partitions currently attached, oldest first."""
+        with self._get_session() as session:
+            names = self._partition_names(session)
+        partitions = [(name, partition_month(name)) for name in names]
+        return sorted(
+            [(name, month) for name, month in partitions if month is not None],
+            key=lambda partition: partition[1]
+        )
+
+    def ensure_partitions(self, start: datetime, end: datetime, session: Session = None) -> List[str]:
+        """
+        Create the monthly partitions covering [start, end) that do not exist
+        yet, plus the default partition that catches anything outside them.
+        Runs in its own transaction unless a session is passed in, in which
+        case committing is left to the caller. Returns the names created.
+        """
+        if session is None:
+            with self._get_session() as session:
+                created = self.ensure_partitions(start, end, session)
+                session.commit()
+                return created
+
+        existing = set(self._partition_names(session))
+        session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF events DEFAULT"
+        ))
+        created = []
+        month = month_start(start)
+        while month < end:
+            name = partition_name(month)
+            if name not in existing:
+                self._create_partition(session, month)
+                created.append(name)
+            month = add_months(month, 1)
+        return created
+
+    def _create_partition(self, session: Session, month: datetime) -> None:
+        name = partition_name(month)
+        bounds = {"lower": month, "upper": add_months(month, 1)}
+        in_range = "timestamp >= :lower AND timestamp < :upper"
+
+        # Postgres refuses to create a partition whose rows already sit in the
+        # default partition, so those rows are moved across in the same transaction
+        has_stray_rows = session.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"), bounds
+        ).scalar()
+        if has_stray_rows:
+            session.execute(text(f"ALTER TABLE events DETACH PARTITION {DEFAULT_PARTITION}"))
+        session.execute(text(
+            f"CREATE TABLE {name} PARTITION OF events "
+            f"FOR VALUES FROM ('{bounds['lower'].isoformat()}') TO ('{bounds['upper'].isoformat()}')"
+        ))
+        if has_stray_rows:
+            session.execute(text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} RETURNING *) "
+                f"INSERT INTO events SELECT * FROM moved"
+            ), bounds)
+            session.execute(text(f"ALTER TABLE events ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        logger.info(f"Created events partition {name}")
+
+    def ensure_upcoming_partitions(self, months_ahead: int = EVENTS_PARTITION_MONTHS_AHEAD) -> List[str]:
+        """Create partitions from the previous month through months_ahead months from now."""
+        current = month_start(datetime.now())
+        return self.ensure_partitions(add_months(current, -1), add_months(current, months_ahead + 1))
+
+    def stream_partition(self, name: str, batch_size: int = 5000) -> Iterator[Event]:
+        """Read a partition in timestamp order through a server-side cursor."""
+        with self.engine.connect() as connection:
+            result = connection.execution_options(yield_per=batch_size).execute(text(
+                f"SELECT event_id, source_device_id, bridge_state, bridge_confidence, timestamp "
+                f"FROM {name} ORDER BY timestamp, id"
+            ))
+            for row in result.mappings():
+                yield Event.model_validate(dict(row))
+
+    def drop_partition(self, name: str, expected_rows: int) -> None:
+        """
+        Detach a partition from events and drop it. Refuses (and rolls back)
+        if it no longer holds exactly expected_rows, e.g. because late events
+        arrived after it was exported. Callers announce the drop on
+        EVENTS_RELOAD_CHANNEL once done.
+        """
+        with self._get_session() as session:
+            session.execute(text(f"ALTER TABLE events DETACH PARTITION {name}"))
+            rows = session.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+            if rows != expected_rows:
+                session.rollback()
+                raise RuntimeError(
+                    f"{name} holds {rows} events but {expected_rows} were exported"
+                )
+            session.execute(text(f"DROP TABLE {name}"))
+            session.commit()
+        logger.info(f"Dropped events partition {name}")
+
+    def import_events(self, events: List[Event]) -> int:
+        """
+        Load archived events, creating partitions for their months as needed.
+        Events already present are skipped. Returns the number inserted.
+        No per-event notifications are sent: these are history, not new
+        readings. Callers announce the import on EVENTS_RELOAD_CHANNEL once
+        done, so running servers reload their recent events.
+        """
+        if not events:
+            return 0
+        oldest = min(event.timestamp for event in events)
+        newest = max(event.timestamp for event in events)
+        self.ensure_partitions(oldest, add_months(month_start(newest), 1))
+        with self._get_session() as session:
+            inserted_ids = session.exec(_insert_events_statement(events)).scalars().all()
+            session.commit()
+        return len(inserted_ids)
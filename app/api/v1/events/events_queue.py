@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, List, Optional
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+from app.api.v1.events.events_model import Event
+from app.api.v1.events.events_service import EventsService
+from app.db import UnitOfWork
+from app.metrics import MetricsRegistry, registry
+
+logger = logging.getLogger(__name__)
+
+EVENTS_INGEST_MODE = os.getenv("EVENTS_INGEST_MODE", "sync").lower()
+EVENTS_INGEST_QUEUE_SIZE = int(os.getenv("EVENTS_INGEST_QUEUE_SIZE", "10000"))
+EVENTS_INGEST_BATCH_SIZE = int(os.getenv("EVENTS_INGEST_BATCH_SIZE", "500"))
+EVENTS_INGEST_FLUSH_INTERVAL_MS = int(os.getenv("EVENTS_INGEST_FLUSH_INTERVAL_MS", "200"))
+EVENTS_INGEST_ENQUEUE_TIMEOUT_MS = int(os.getenv("EVENTS_INGEST_ENQUEUE_TIMEOUT_MS", "100"))
+EVENTS_INGEST_MAX_RETRIES = int(os.getenv("EVENTS_INGEST_MAX_RETRIES", "3"))
+EVENTS_INGEST_RETRY_BACKOFF_MS = int(os.getenv("EVENTS_INGEST_RETRY_BACKOFF_MS", "200"))
+
+# Longest wait between attempts at a batch the database keeps refusing
+MAX_RETRY_BACKOFF_SECONDS = 5.0
+
+
+class IngestQueueUnavailable(Exception):
+    """Raised when an event cannot be enqueued because the queue is not running."""
+
+
+class IngestQueueFull(IngestQueueUnavailable):
+    """Raised when an event cannot be enqueued before the enqueue timeout."""
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether a failed write may succeed if tried again unchanged, e.g. the database was unreachable."""
+    if isinstance(error, (OSError, asyncio.TimeoutError, PoolTimeoutError, OperationalError, InterfaceError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+class EventsIngestQueue:
+    """
+    Write-behind buffer for incoming events. Requests enqueue and return;
+    a single background task drains the queue into bulk inserts whenever
+    batch_size events are waiting or flush_interval has elapsed.
+
+    Queued events have already been acknowledged, so a failed flush is not
+    dropped. Transient errors are retried with backoff, and a batch that
+    still fails is held back and written ahead of newer events. Any other
+    error splits the batch in halves, down to single events, so one bad
+    event is the only one lost.
+    """
+
+    def __init__(
+        self,
+        max_size: int = EVENTS_INGEST_QUEUE_SIZE,
+        batch_size: int = EVENTS_INGEST_BATCH_SIZE,
+        flush_interval: float = EVENTS_INGEST_FLUSH_INTERVAL_MS / 1000,
+        enqueue_timeout: float = EVENTS_INGEST_ENQUEUE_TIMEOUT_MS / 1000,
+        service_factory: Callable[[UnitOfWork], EventsService] = EventsService,
+        max_retries: int = EVENTS_INGEST_MAX_RETRIES,
+        retry_backoff: float = EVENTS_INGEST_RETRY_BACKOFF_MS / 1000,
+        metrics: MetricsRegistry = registry,
+    ):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.service_factory = service_factory
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        # Binds to an event loop on first use, not here
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: Optional[asyncio.Future] = None
+        self._batch: List[Event] = []
+        # Events whose flush failed transiently, written before anything newer
+        self._held_back: List[Event] = []
+
+        metrics.gauge("events_ingest_queue_depth", fn=lambda: self.depth)
+        self._enqueued = metrics.counter("events_ingest_enqueued_total")
+        self._rejected = metrics.counter("events_ingest_rejected_total")
+        self._flushed = metrics.counter("events_ingest_flushed_total")
+        self._failed = metrics.counter("events_ingest_failed_total")
+        self._retried = metrics.counter("events_ingest_retried_total")
+        self._flush_latency = metrics.histogram("events_ingest_flush_seconds")
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() + len(self._held_back)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Events ingest queue started")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write out everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # A flush interrupted by cancellation keeps running under shield
+        if self._in_flight is not None:
+            await self._in_flight
+            self._in_flight = None
+
+        pending, self._held_back, self._batch = self._held_back + self._batch, [], []
+        for start in range(0, len(pending), self.batch_size):
+            await self._flush(pending[start:start + self.batch_size])
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+
+        if self._held_back:
+            self._failed.inc(len(self._held_back))
+            logger.error(f"Dropping {len(self._held_back)} queued events the database refused until shutdown")
+            self._held_back = []
+        logger.info("Events ingest queue stopped")
+
+    async def enqueue(self, event: Event) -> None:
+        """Enqueue an event, waiting up to enqueue_timeout for room before giving up."""
+        if self._task is None:
+            # Nothing would flush it until the next start()
+            self._rejected.inc()
+            raise IngestQueueUnavailable("Events ingest queue is not running")
+        try:
+            await asyncio.wait_for(self._queue.put(event), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected.inc()
+            raise IngestQueueFull("Events ingest queue is full")
+        self._enqueued.inc()
+
+    def _drain(self, limit: int) -> List[Event]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._held_back:
+                # The database just failed repeatedly, so give it a moment first
+                await asyncio.sleep(min(self.retry_backoff * 2 ** self.max_retries, MAX_RETRY_BACKOFF_SECONDS))
+                self._batch = self._held_back[:self.batch_size]
+                self._held_back = self._held_back[self.batch_size:]
+            else:
+                self._batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+
+            # Keep collecting until the batch is full or the interval runs out
+            while len(self._batch) < self.batch_size:
+                self._batch.extend(self._drain(self.batch_size - len(self._batch)))
+                remaining = deadline - loop.time()
+                if len(self._batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            batch, self._batch = self._batch, []
+            self._in_flight = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._in_flight)
+            self._in_flight = None
+
+    async def _flush(self, batch: List[Event]) -> None:
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            await self._write(batch)
+        finally:
+            self._flush_latency.observe(time.perf_counter() - started)
+
+    async def _write(self, batch: List[Event]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with UnitOfWork() as uow:
+                    await self.service_factory(uow).create_events(batch)
+                self._flushed.inc(len(batch))
+                return
+            except Exception as e:
+                if not is_transient_error(e):
+                    error = e
+                    break
+                if attempt == self.max_retries:
+                    self._held_back.extend(batch)
+                    logger.warning(f"Holding back {len(batch)} queued events after {attempt + 1} failed flushes: {e}")
+                    return
+                self._retried.inc(len(batch))
+                await asyncio.sleep(min(self.retry_backoff * 2 ** attempt, MAX_RETRY_BACKOFF_SECONDS))
+
+        if len(batch) == 1:
+            self._failed.inc()
+            logger.error(f"Dropping queued event {batch[0].event_id}: {error}", exc_info=error)
+            return
+        # Find the bad events by halving, so the rest of the batch still lands
+        middle = len(batch) // 2
+        await self._write(batch[:middle])
+        await self._write(batch[middle:])
@@ -0,0 +1,257 @@
+"""
+In-memory window of the newest events, held column by column in arrays so a
+few thousand events cost tens of bytes each instead of a model object apiece.
+"""
+import asyncio
+import logging
+import os
+import threading
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.api.v1.events.events_model import BridgeState, Event, EventsFilter, to_naive_utc
+from app.api.v1.events.events_repository import AsyncEventsRepository
+from app.db import UnitOfWork
+from app.metrics import MetricsRegistry, registry
+
+logger = logging.getLogger(__name__)
+
+EVENTS_RECENT_CAPACITY = int(os.getenv("EVENTS_RECENT_CAPACITY", "5000"))
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_STATES = list(BridgeState)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+
+
+def _to_micros(timestamp: datetime) -> int:
+    return (to_naive_utc(timestamp) - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+class RecentEventsBuffer:
+    """
+    The newest `capacity` events, oldest to newest by timestamp, in a ring of
+    preallocated arrays: timestamps as integer microseconds, confidences as
+    doubles, bridge states as one-byte enum codes and device IDs as indexes
+    into an interned table. Appending an in-order event is O(1); a late event
+    is slotted into place, and one older than everything held once the ring
+    is full is left to the database.
+
+    The buffer is only consulted once load() has filled it from the database.
+    Until it first fills up it holds every event there is, so a query that
+    runs out of buffered events has still been answered in full.
+    """
+
+    def __init__(self, capacity: int = EVENTS_RECENT_CAPACITY, metrics: MetricsRegistry = registry):
+        self.capacity = max(capacity, 1)
+        self._lock = threading.Lock()
+        self._timestamps = array("q", bytes(8 * self.capacity))
+        self._confidences = array("d", bytes(8 * self.capacity))
+        self._states = array("B", bytes(self.capacity))
+        self._devices = array("I", bytes(4 * self.capacity))
+        self._event_ids: List[Optional[str]] = [None] * self.capacity
+        self._device_names: List[str] = []
+        self._device_codes: Dict[str, int] = {}
+        # (event_id, timestamp) of every buffered event, the same key the table is unique on
+        self._keys: Set[Tuple[str, int]] = set()
+        self._start = 0
+        self._count = 0
+        self._ready = False
+        self._complete = False
+        self._reload: Optional[asyncio.Task] = None
+
+        metrics.gauge("events_recent_buffered", fn=lambda: self._count)
+        self._hits = metrics.counter("events_recent_queries_total", outcome="hit")
+        self._misses = metrics.counter("events_recent_queries_total", outcome="miss")
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def _slot(self, position: int) -> int:
+        return (self._start + position) % self.capacity
+
+    def _device_code(self, source_device_id: str) -> int:
+        code = self._device_codes.get(source_device_id)
+        if code is None:
+            code = self._device_codes[source_device_id] = len(self._device_names)
+            self._device_names.append(source_device_id)
+        return code
+
+    def _insert_position(self, micros: int) -> int:
+        # After any events with the same timestamp, so ties keep insertion order
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamps[self._slot(middle)] <= micros:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _move(self, source: int, target: int) -> None:
+        self._timestamps[target] = self._timestamps[source]
+        self._confidences[target] = self._confidences[source]
+        self._states[target] = self._states[source]
+        self._devices[target] = self._devices[source]
+        self._event_ids[target] = self._event_ids[source]
+
+    def _add(self, event: Event) -> None:
+        micros = _to_micros(event.timestamp)
+        key = (event.event_id, micros)
+        if key in self._keys:
+            return
+        full = self._count == self.capacity
+        if full:
+            self._complete = False
+            if micros < self._timestamps[self._start]:
+                return
+
+        position = self._insert_position(micros)
+        if full:
+            oldest = self._start
+            self._keys.discard((self._event_ids[oldest], self._timestamps[oldest]))
+            self._start = self._slot(1)
+            self._count -= 1
+            position -= 1
+
+        # Shift anything newer up one slot to make room
+        for index in range(self._count, position, -1):
+            self._move(self._slot(index - 1), self._slot(index))
+
+        slot = self._slot(position)
+        self._timestamps[slot] = micros
+        self._confidences[slot] = event.bridge_confidence
+        self._states[slot] = _STATE_CODES[BridgeState(event.bridge_state)]
+        self._devices[slot] = self._device_code(event.source_device_id)
+        self._event_ids[slot] = event.event_id
+        self._keys.add(key)
+        self._count += 1
+
+    def add(self, events: Iterable[Event]) -> None:
+        """Record committed events. Ones already buffered are ignored."""
+        with self._lock:
+            for event in events:
+                self._add(event)
+
+    def load(self, events_newest_first: List[Event]) -> None:
+        """
+        Merge the newest events from the database and start serving. Fewer
+        than capacity means the database holds no others.
+        """
+        with self._lock:
+            for event in reversed(events_newest_first):
+                self._add(event)
+            self._complete = len(events_newest_first) < self.capacity and self._count < self.capacity
+            self._ready = True
+
+    def invalidate(self) -> None:
+        """Forget everything and stop serving until the next load()."""
+        with self._lock:
+            self._event_ids = [None] * self.capacity
+            self._device_names, self._device_codes = [], {}
+            self._keys = set()
+            self._start = self._count = 0
+            self._ready = self._complete = False
+
+    def newest(self, limit: int, query: EventsFilter) -> Optional[List[tuple]]:
+        """
+        Up to `limit` events matching query as EVENT_COLUMNS tuples, newest
+        first, or None if the answer may include events no longer buffered.
+        """
+        since = _to_micros(query.since) if query.since else None
+        until = _to_micros(query.until) if query.until else None
+        state = _STATE_CODES[query.bridge_state] if query.bridge_state else None
+
+        rows = []
+        reached_since = False
+        with self._lock:
+            if not self._ready:
+                self._misses.inc()
+                return None
+            device = None
+            position = self._count - 1
+            if query.source_device_id is not None:
+                device = self._device_codes.get(query.source_device_id)
+                if device is None:
+                    # Never seen, so nothing buffered can match
+                    position = -1
+
+            while position >= 0 and len(rows) < limit:
+                slot = self._slot(position)
+                position -= 1
+                micros = self._timestamps[slot]
+                if since is not None and micros < since:
+                    # Everything further back is older still
+                    reached_since = True
+                    break
+                if until is not None and micros >= until:
+                    continue
+                if device is not None and self._devices[slot] != device:
+                    continue
+                if state is not None and self._states[slot] != state:
+                    continue
+                confidence = self._confidences[slot]
+                if query.min_confidence is not None and confidence < query.min_confidence:
+                    continue
+                rows.append((
+                    self._event_ids[slot],
+                    self._device_names[self._devices[slot]],
+                    _STATES[self._states[slot]],
+                    confidence,
+                    _from_micros(micros),
+                ))
+
+            if len(rows) < limit and not reached_since and not self._complete:
+                # More matches may lie past the oldest buffered event
+                self._misses.inc()
+                return None
+
+        self._hits.inc()
+        return rows
+
+    async def reload(self) -> None:
+        """Fill the buffer with the newest events in the database."""
+        try:
+            async with UnitOfWork() as uow:
+                events = await AsyncEventsRepository(uow).get_recent_events(self.capacity)
+        except Exception as e:
+            # Listings keep going to the database until a later reload succeeds
+            logger.error(f"Error loading recent events: {e}", exc_info=True)
+            return
+        self.load(events)
+        logger.info(f"Recent events buffer loaded with {len(self)} events")
+
+    def schedule_reload(self) -> None:
+        """Drop the buffer and refill it in the background, e.g. after missed notifications."""
+        if self._reload is not None and not self._reload.done():
+            # It may have read the database before whatever prompted this reload
+            self._reload.cancel()
+        self.invalidate()
+        self._reload = asyncio.get_running_loop().create_task(self.reload())
+
+
+def apply_events_notification(payload: str) -> None:
+    """
+    Buffer an event announced over NOTIFY, so events written by other
+    workers are served too. This process's own events are already buffered.
+    """
+    recent_events.add([Event.model_validate_json(payload)])
+
+
+def apply_events_reload_notification(payload: str) -> None:
+    """
+    Reload the buffer after events were bulk loaded or dropped outside the
+    API, by scripts that send no per-event notifications.
+    """
+    recent_events.schedule_reload()
+
+
+recent_events = RecentEventsBuffer()
@@ -1,20 +1,54 @@
-from typing import Optional, List
+import base64
+from typing import Optional, List, Tuple, AsyncIterator
 from datetime import datetime
 from sqlmodel import SQLModel, Field, Session, select
+from sqlalchemy import Index, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.engine import Engine
-from app.api.v1.events.events_model import Event, BridgeState
-from app.db import get_engine
+from sqlalchemy.engine import Row
+from app.api.v1.events.events_model import Event, BridgeState, EventsFilter, EventsQuery, EventPage, to_naive_utc
+from app.api.v1.events.events_json import EVENT_COLUMNS
+from app.db import get_engine, UnitOfWork
+from app.notify import notify, notify_async, EVENTS_CHANNEL
 
 
 class EventSQLModel(SQLModel, table=True):
     __tablename__ = "events"
+    __table_args__ = (
+        # Storage is split into monthly range partitions on timestamp (see
+        # events_partition_repository), so old months can be archived and
+        # dropped whole. Postgres requires the partition key in every unique
+        # constraint, hence (id, timestamp) and (event_id, timestamp).
+        Index("ix_events_event_id_timestamp", "event_id", "timestamp", unique=True),
+        # Listings walk (timestamp, id) newest first. Every filter gets an index
+        # led by its equality column and ending in the keyset columns, so a page
+        # is a bounded index range scan no matter how large the table grows.
+        # bridge_confidence is carried as a payload column for the min filter.
+        Index(
+            "ix_events_timestamp_id",
+            "timestamp", "id",
+            postgresql_include=["bridge_confidence"],
+        ),
+        Index(
+            "ix_events_source_device_id_timestamp_id",
+            "source_device_id", "timestamp", "id",
+            postgresql_include=["bridge_confidence"],
+        ),
+        Index(
+            "ix_events_bridge_state_timestamp_id",
+            "bridge_state", "timestamp", "id",
+            postgresql_include=["bridge_confidence"],
+        ),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
     
-    id: Optional[int] = Field(default=None, primary_key=True)
-    event_id: str = Field(unique=True, index=True)
-    source_device_id: str = Field(index=True)
-    bridge_state: BridgeState = Field(index=True)
-    bridge_confidence: float = Field(index=True)
-    timestamp: datetime = Field(index=True)
+    # Part of a composite key, so autoincrement must be asked for explicitly
+    id: Optional[int] = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
+    event_id: str
+    source_device_id: str
+    bridge_state: BridgeState
+    bridge_confidence: float
+    timestamp: datetime = Field(primary_key=True)
     
     def to_domain(self) -> Event:
         return Event(
@@ -36,6 +70,118 @@ class EventSQLModel(SQLModel, table=True):
         )
 
 
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode the (timestamp, id) position of the last row on a page."""
+    raw = f"{timestamp.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("utf-8")).decode("utf-8")
+        timestamp_str, row_id = raw.rsplit("|", 1)
+        return to_naive_utc(datetime.fromisoformat(timestamp_str)), int(row_id)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def _insert_events_statement(events: List[Event]):
+    return (
+        insert(EventSQLModel)
+        .values([event.model_dump() for event in events])
+        .on_conflict_do_nothing(index_elements=[EventSQLModel.event_id, EventSQLModel.timestamp])
+        .returning(EventSQLModel.event_id, EventSQLModel.timestamp)
+    )
+
+
+def _unique_events(events: List[Event]) -> List[Event]:
+    """Drop repeats within a batch of the (event_id, timestamp) key inserts are deduplicated on."""
+    seen = set()
+    unique = []
+    for event in events:
+        key = (event.event_id, event.timestamp)
+        if key not in seen:
+            seen.add(key)
+            unique.append(event)
+    return unique
+
+
+def _inserted_events(events: List[Event], inserted_rows: List[Row]) -> List[Event]:
+    inserted = {(row.event_id, row.timestamp) for row in inserted_rows}
+    return [event for event in events if (event.event_id, event.timestamp) in inserted]
+
+
+def _payloads(events: List[Event]) -> List[str]:
+    return [event.model_dump_json() for event in events]
+
+
+def _filter_events(statement, query: EventsFilter):
+    if query.source_device_id is not None:
+        statement = statement.where(EventSQLModel.source_device_id == query.source_device_id)
+    if query.bridge_state is not None:
+        statement = statement.where(EventSQLModel.bridge_state == query.bridge_state)
+    if query.min_confidence is not None:
+        statement = statement.where(EventSQLModel.bridge_confidence >= query.min_confidence)
+    if query.since is not None:
+        statement = statement.where(EventSQLModel.timestamp >= query.since)
+    if query.until is not None:
+        statement = statement.where(EventSQLModel.timestamp < query.until)
+    return statement
+
+
+def _events_page_statement(query: EventsQuery, columns: Tuple = None):
+    statement = _filter_events(select(*columns) if columns else select(EventSQLModel), query)
+    if query.cursor:
+        cursor_timestamp, cursor_id = decode_cursor(query.cursor)
+        statement = statement.where(
+            tuple_(EventSQLModel.timestamp, EventSQLModel.id) < tuple_(cursor_timestamp, cursor_id)
+        )
+
+    # Fetch one extra row to learn whether another page exists
+    return statement.order_by(
+        EventSQLModel.timestamp.desc(), EventSQLModel.id.desc()
+    ).limit(query.limit + 1)
+
+
+# Rows fetched per round trip when streaming an export
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS = EVENT_COLUMNS
+
+# Event fields plus the row id, which the page cursor needs
+PAGE_COLUMNS = tuple(getattr(EventSQLModel, column) for column in EVENT_COLUMNS) + (EventSQLModel.id,)
+
+
+def _export_events_statement(query: EventsFilter):
+    statement = select(*(getattr(EventSQLModel, column) for column in EXPORT_COLUMNS))
+    return _filter_events(statement, query).order_by(
+        EventSQLModel.timestamp, EventSQLModel.id
+    ).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+
+
+def _events_page(results: List[EventSQLModel], limit: int) -> EventPage:
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+
+    return EventPage(
+        items=[event.to_domain() for event in results],
+        next_cursor=next_cursor
+    )
+
+
+def _page_rows(rows: List[Row], limit: int) -> Tuple[List[Row], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+    return rows, next_cursor
+
+
 class EventsRepository:
     def __init__(self, engine: Engine = None):
         self.engine = engine or get_engine()
@@ -48,12 +194,87 @@ class EventsRepository:
         with self._get_session() as session:
             event_sql_model = EventSQLModel.from_domain(event)
             session.add(event_sql_model)
+            notify(session, EVENTS_CHANNEL, [event.model_dump_json()])
             session.commit()
             session.refresh(event_sql_model)
             return event_sql_model.to_domain()
     
-    def get_events(self) -> List[Event]:
+    def create_events(self, events: List[Event]) -> List[Event]:
+        """
+        Insert events with a single multi-row statement, skipping any whose
+        (event_id, timestamp) already exists or repeats within the batch.
+        Returns the events that were inserted.
+        """
+        events = _unique_events(events)
+        if not events:
+            return []
+        with self._get_session() as session:
+            inserted = _inserted_events(events, session.exec(_insert_events_statement(events)).all())
+            notify(session, EVENTS_CHANNEL, _payloads(inserted))
+            session.commit()
+            return inserted
+    
+    def get_events(self, query: EventsQuery = None) -> EventPage:
+        query = query or EventsQuery()
+        statement = _events_page_statement(query)
         with self._get_session() as session:
-            statement = select(EventSQLModel).order_by(EventSQLModel.timestamp.desc())
             results = session.exec(statement).all()
-            return [event.to_domain() for event in results]
\ No newline at end of file
+        return _events_page(results, query.limit)
+
+
+class AsyncEventsRepository:
+    """EventsRepository on a UnitOfWork, for request handlers."""
+
+    def __init__(self, uow: UnitOfWork):
+        self.session = uow.session
+
+    async def create_event(self, event: Event) -> Event:
+        event_sql_model = EventSQLModel.from_domain(event)
+        self.session.add(event_sql_model)
+        await self.session.flush()
+        await notify_async(self.session, EVENTS_CHANNEL, [event.model_dump_json()])
+        return event_sql_model.to_domain()
+    
+    async def create_events(self, events: List[Event]) -> List[Event]:
+        """
+        Insert events with a single multi-row statement, skipping any whose
+        (event_id, timestamp) already exists or repeats within the batch.
+        Returns the events that were inserted.
+        """
+        events = _unique_events(events)
+        if not events:
+            return []
+        result = await self.session.exec(_insert_events_statement(events))
+        inserted = _inserted_events(events, result.all())
+        await notify_async(self.session, EVENTS_CHANNEL, _payloads(inserted))
+        return inserted
+    
+    async def get_events(self, query: EventsQuery = None) -> EventPage:
+        query = query or EventsQuery()
+        results = (await self.session.exec(_events_page_statement(query))).all()
+        return _events_page(results, query.limit)
+
+    async def get_recent_events(self, limit: int) -> List[Event]:
+        """The newest `limit` events, newest first."""
+        statement = select(EventSQLModel).order_by(
+            EventSQLModel.timestamp.desc(), EventSQLModel.id.desc()
+        ).limit(limit)
+        return [event.to_domain() for event in (await self.session.exec(statement)).all()]
+
+    async def get_event_rows(self, query: EventsQuery = None) -> Tuple[List[Row], Optional[str]]:
+        """
+        Same page as get_events, as plain column tuples in PAGE_COLUMNS order
+        plus the next cursor, for encoding without building models.
+        """
+        query = query or EventsQuery()
+        rows = (await self.session.exec(_events_page_statement(query, PAGE_COLUMNS))).all()
+        return _page_rows(rows, query.limit)
+
+    async def stream_events(self, query: EventsFilter) -> AsyncIterator[List[Row]]:
+        """
+        Yield matching events oldest first, EXPORT_CHUNK_SIZE rows at a time,
+        from a server-side cursor. Rows are plain column tuples in EXPORT_COLUMNS order.
+        """
+        result = await self.session.stream(_export_events_statement(query))
+        async for rows in result.partitions():
+            yield rows
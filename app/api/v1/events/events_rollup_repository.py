@@ -0,0 +1,276 @@
+from typing import Optional, List, Dict, Tuple
+from datetime import datetime
+from sqlmodel import SQLModel, Field, Session, select
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+from app.api.v1.events.events_model import Event, BridgeState, StatsBucket, EventStatsQuery
+from app.db import get_engine, UnitOfWork
+
+
+class EventRollupBase(SQLModel):
+    bucket_start: datetime = Field(primary_key=True)
+    source_device_id: str = Field(primary_key=True)
+    event_count: int = 0
+    openings: int = 0
+    open_periods: int = 0
+    open_seconds: float = 0
+    max_open_seconds: float = 0
+
+
+class HourlyEventRollupSQLModel(EventRollupBase, table=True):
+    __tablename__ = "event_rollups_hourly"
+
+
+class DailyEventRollupSQLModel(EventRollupBase, table=True):
+    __tablename__ = "event_rollups_daily"
+
+
+class EventRollupDeviceSQLModel(SQLModel, table=True):
+    """
+    Where each device's open/closed state machine stands, so rollups can be
+    advanced from new events alone. The row lock also serializes concurrent
+    ingests for the same device.
+    """
+    __tablename__ = "event_rollup_devices"
+
+    source_device_id: str = Field(primary_key=True)
+    bridge_state: Optional[BridgeState] = None
+    timestamp: Optional[datetime] = None
+    open_since: Optional[datetime] = None
+
+
+ROLLUP_MODELS = {
+    StatsBucket.HOUR: HourlyEventRollupSQLModel,
+    StatsBucket.DAY: DailyEventRollupSQLModel,
+}
+
+_ROLLUP_COUNTERS = ("event_count", "openings", "open_periods", "open_seconds")
+
+RollupKey = Tuple[StatsBucket, datetime, str]
+
+
+def truncate_timestamp(timestamp: datetime, bucket: StatsBucket) -> datetime:
+    """Start of the bucket containing timestamp, matching Postgres date_trunc."""
+    timestamp = timestamp.replace(minute=0, second=0, microsecond=0)
+    if bucket == StatsBucket.DAY:
+        timestamp = timestamp.replace(hour=0)
+    return timestamp
+
+
+def _accumulate(rows: Dict[RollupKey, Dict[str, float]], timestamp: datetime, device: str, **deltas) -> None:
+    for bucket in StatsBucket:
+        key = (bucket, truncate_timestamp(timestamp, bucket), device)
+        row = rows.setdefault(key, {"max_open_seconds": 0, **{name: 0 for name in _ROLLUP_COUNTERS}})
+        for name, value in deltas.items():
+            row[name] = max(row[name], value) if name == "max_open_seconds" else row[name] + value
+
+
+def rollup_deltas(
+    events: List[Event], devices: Dict[str, EventRollupDeviceSQLModel]
+) -> Dict[RollupKey, Dict[str, float]]:
+    """
+    Fold newly inserted events into per-bucket rollup increments, advancing
+    each device's state machine in place. An opening is a change into OPEN;
+    the open period ends at the next event in any other state and is credited
+    to the bucket where it began.
+
+    Late events (older than the device's last seen event) are counted but do
+    not move the state machine; rebuild() recomputes transitions from history.
+    """
+    rows: Dict[RollupKey, Dict[str, float]] = {}
+    for event in sorted(events, key=lambda event: event.timestamp):
+        device = devices[event.source_device_id]
+        _accumulate(rows, event.timestamp, event.source_device_id, event_count=1)
+
+        if device.timestamp is not None and event.timestamp < device.timestamp:
+            continue
+        if event.bridge_state == BridgeState.OPEN and device.bridge_state != BridgeState.OPEN:
+            _accumulate(rows, event.timestamp, event.source_device_id, openings=1)
+            device.open_since = event.timestamp
+        elif event.bridge_state != BridgeState.OPEN and device.bridge_state == BridgeState.OPEN:
+            if device.open_since is not None:
+                open_seconds = (event.timestamp - device.open_since).total_seconds()
+                _accumulate(
+                    rows, device.open_since, event.source_device_id,
+                    open_periods=1, open_seconds=open_seconds, max_open_seconds=open_seconds
+                )
+            device.open_since = None
+        device.bridge_state = event.bridge_state
+        device.timestamp = event.timestamp
+    return rows
+
+
+def _upsert_rollups_statement(model, rows: List[Dict]):
+    """Add the increments onto existing rollup rows, creating missing ones."""
+    statement = insert(model).values(rows)
+    table = model.__table__
+    return statement.on_conflict_do_update(
+        index_elements=[model.bucket_start, model.source_device_id],
+        set_={
+            **{name: table.c[name] + statement.excluded[name] for name in _ROLLUP_COUNTERS},
+            "max_open_seconds": func.greatest(table.c.max_open_seconds, statement.excluded.max_open_seconds),
+        },
+    )
+
+
+def _upsert_rollups_statements(rows: Dict[RollupKey, Dict[str, float]]):
+    # Rows are written in key order so concurrent batches lock them in the same order
+    for bucket, model in ROLLUP_MODELS.items():
+        values = [
+            {"bucket_start": bucket_start, "source_device_id": device, **row}
+            for (row_bucket, bucket_start, device), row in sorted(rows.items(), key=lambda item: item[0][1:])
+            if row_bucket == bucket
+        ]
+        if values:
+            yield _upsert_rollups_statement(model, values)
+
+
+def _rollups_statement(query: EventStatsQuery):
+    model = ROLLUP_MODELS[query.bucket]
+    statement = select(model).where(
+        model.bucket_start >= truncate_timestamp(query.from_, query.bucket),
+        model.bucket_start < query.to,
+    )
+    if query.source_device_id is not None:
+        statement = statement.where(model.source_device_id == query.source_device_id)
+    return statement.order_by(model.bucket_start, model.source_device_id)
+
+
+# Recomputes a rollup table from the full event history. Runs of identical
+# states are collapsed to their first event; an OPEN run lasts until the next run.
+_REBUILD_ROLLUPS_SQL = """
+WITH ordered AS (
+    SELECT id, source_device_id, bridge_state, timestamp,
+           LAG(bridge_state) OVER (PARTITION BY source_device_id ORDER BY timestamp, id) AS previous_state
+    FROM events
+),
+changes AS (
+    SELECT source_device_id, bridge_state, timestamp,
+           LEAD(timestamp) OVER (PARTITION BY source_device_id ORDER BY timestamp, id) AS changed_at
+    FROM ordered
+    WHERE previous_state IS DISTINCT FROM bridge_state
+),
+opens AS (
+    SELECT source_device_id, date_trunc(:unit, timestamp) AS bucket_start,
+           count(*) AS openings,
+           count(changed_at) AS open_periods,
+           coalesce(sum(extract(epoch FROM changed_at - timestamp)), 0) AS open_seconds,
+           coalesce(max(extract(epoch FROM changed_at - timestamp)), 0) AS max_open_seconds
+    FROM changes
+    WHERE bridge_state = 'OPEN'
+    GROUP BY source_device_id, date_trunc(:unit, timestamp)
+),
+counts AS (
+    SELECT source_device_id, date_trunc(:unit, timestamp) AS bucket_start, count(*) AS event_count
+    FROM events
+    GROUP BY source_device_id, date_trunc(:unit, timestamp)
+)
+INSERT INTO {table} (bucket_start, source_device_id, event_count, openings, open_periods, open_seconds, max_open_seconds)
+SELECT c.bucket_start, c.source_device_id, c.event_count,
+       coalesce(o.openings, 0), coalesce(o.open_periods, 0),
+       coalesce(o.open_seconds, 0), coalesce(o.max_open_seconds, 0)
+FROM counts c
+LEFT JOIN opens o USING (source_device_id, bucket_start)
+"""
+
+_REBUILD_DEVICES_SQL = """
+WITH ordered AS (
+    SELECT id, source_device_id, bridge_state, timestamp,
+           LAG(bridge_state) OVER (PARTITION BY source_device_id ORDER BY timestamp, id) AS previous_state
+    FROM events
+),
+latest AS (
+    SELECT DISTINCT ON (source_device_id) source_device_id, bridge_state, timestamp
+    FROM ordered
+    ORDER BY source_device_id, timestamp DESC, id DESC
+),
+latest_change AS (
+    SELECT DISTINCT ON (source_device_id) source_device_id, timestamp
+    FROM ordered
+    WHERE previous_state IS DISTINCT FROM bridge_state
+    ORDER BY source_device_id, timestamp DESC, id DESC
+)
+INSERT INTO event_rollup_devices (source_device_id, bridge_state, timestamp, open_since)
+SELECT l.source_device_id, l.bridge_state, l.timestamp,
+       CASE WHEN l.bridge_state = 'OPEN' THEN c.timestamp END
+FROM latest l
+JOIN latest_change c USING (source_device_id)
+"""
+
+
+class EventRollupRepository:
+    def __init__(self, engine: Engine = None):
+        self.engine = engine or get_engine()
+
+    def _get_session(self) -> Session:
+        """Create and return a database session."""
+        return Session(self.engine)
+
+    def rebuild(self) -> Dict[StatsBucket, int]:
+        """
+        Recompute the rollups from the events table. Ingest blocks on the
+        device lock until this commits, and its increments then apply on top.
+
+        Rollups are replaced from the month of the oldest event onwards.
+        Earlier ones are kept as they are, since their events were archived
+        and dropped, so stats stay available for the full history. With no
+        events at all every rollup is deleted.
+        Returns the number of rollup rows written per bucket.
+        """
+        written = {}
+        with self._get_session() as session:
+            session.execute(text("LOCK TABLE event_rollup_devices IN EXCLUSIVE MODE"))
+            session.execute(text("DELETE FROM event_rollup_devices"))
+            session.execute(text(_REBUILD_DEVICES_SQL))
+            for bucket, model in ROLLUP_MODELS.items():
+                # min() over no events is NULL, which would match nothing
+                session.execute(text(
+                    f"DELETE FROM {model.__tablename__} WHERE bucket_start >= COALESCE("
+                    f"(SELECT date_trunc('month', min(timestamp)) FROM events), '-infinity')"
+                ))
+                result = session.execute(
+                    text(_REBUILD_ROLLUPS_SQL.format(table=model.__tablename__)),
+                    {"unit": bucket.value}
+                )
+                written[bucket] = result.rowcount
+            session.commit()
+        return written
+
+
+class AsyncEventRollupRepository:
+    """
+    Maintains the rollups inside the request's unit of work, so they commit
+    together with the events they count.
+    """
+
+    def __init__(self, uow: UnitOfWork):
+        self.session = uow.session
+
+    async def _lock_devices(self, device_ids: List[str]) -> Dict[str, EventRollupDeviceSQLModel]:
+        await self.session.exec(
+            insert(EventRollupDeviceSQLModel)
+            .values([{"source_device_id": device_id} for device_id in device_ids])
+            .on_conflict_do_nothing(index_elements=[EventRollupDeviceSQLModel.source_device_id])
+        )
+        result = await self.session.exec(
+            select(EventRollupDeviceSQLModel)
+            .where(EventRollupDeviceSQLModel.source_device_id.in_(device_ids))
+            .order_by(EventRollupDeviceSQLModel.source_device_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return {device.source_device_id: device for device in result.all()}
+
+    async def apply_events(self, events: List[Event]) -> None:
+        """Add newly inserted events to the hourly and daily rollups."""
+        if not events:
+            return
+        device_ids = sorted({event.source_device_id for event in events})
+        devices = await self._lock_devices(device_ids)
+        for statement in _upsert_rollups_statements(rollup_deltas(events, devices)):
+            await self.session.exec(statement)
+        await self.session.flush()
+
+    async def get_rollups(self, query: EventStatsQuery) -> List[EventRollupBase]:
+        return list((await self.session.exec(_rollups_statement(query))).all())
@@ -1,31 +1,110 @@
 import logging
-from typing import List
-from app.api.v1.events.events_model import Event
-from app.api.v1.events.events_repository import EventsRepository
+from typing import AsyncIterator, Dict, List
+from sqlalchemy.engine import Row
+from app.api.v1.events.events_model import (
+    Event, EventsFilter, EventsQuery, EventPage, EventBatchResult, EventStatsQuery, EventStats, EventStatsBucket
+)
+from app.api.v1.events.events_repository import AsyncEventsRepository
+from app.api.v1.events.events_json import encode_event_page
+from app.api.v1.events.events_recent import RecentEventsBuffer, recent_events
+from app.api.v1.events.events_rollup_repository import AsyncEventRollupRepository
 from app.api.v1.state.state_service import StateService
+from app.db import UnitOfWork
 
 logger = logging.getLogger(__name__)
 
 class EventsService:
-    def __init__(self, repository: EventsRepository = None, state_service: StateService = None):
-        self.repository = repository or EventsRepository()
-        self.state_service = state_service or StateService()
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        repository: AsyncEventsRepository = None,
+        state_service: StateService = None,
+        rollup_repository: AsyncEventRollupRepository = None,
+        recent: RecentEventsBuffer = None
+    ):
+        self.uow = uow
+        self.repository = repository or AsyncEventsRepository(uow)
+        self.state_service = state_service or StateService(uow)
+        self.rollup_repository = rollup_repository or AsyncEventRollupRepository(uow)
+        self.recent = recent or recent_events
 
-    def create_event(self, event: Event) -> Event:
-        created_event = self.repository.create_event(event)
+    async def create_event(self, event: Event) -> Event:
+        # The event, the state it produces and its rollups commit together or not at all
+        created_event = await self.repository.create_event(event)
+        await self.state_service.update_current_state(created_event)
+        await self.rollup_repository.apply_events([created_event])
+        self.uow.after_commit(lambda: self.recent.add([created_event]))
+        await self.uow.commit()
+        return created_event
+
+    async def create_events(self, events: List[Event]) -> EventBatchResult:
+        # Repeats within the batch and events already stored are skipped, so
+        # only the events actually inserted reach the rollups and the buffer
+        inserted_events = await self.repository.create_events(events)
         
-        try:
-            self.state_service.update_current_state(created_event)
-        except Exception as e:
-            # Log error but don't fail the request - event is already persisted
-            logger.error(
-                f"Failed to update state after creating event {created_event.event_id}: {e}",
-                exc_info=True
-            )
-            # Consider whether to raise here or continue - depends on your requirements
-            # For now, we log and continue to ensure event persistence
+        # Advance state once, from the newest event inserted. A batch that only
+        # replays stored events leaves state, its cache and subscribers alone.
+        if inserted_events:
+            newest_event = max(inserted_events, key=lambda event: event.timestamp)
+            await self.state_service.update_current_state(newest_event)
+
+        await self.rollup_repository.apply_events(inserted_events)
+        self.uow.after_commit(lambda: self.recent.add(inserted_events))
+        await self.uow.commit()
         
-        return created_event
+        unique = len({(event.event_id, event.timestamp) for event in events})
+        return EventBatchResult(
+            inserted=len(inserted_events),
+            duplicates=unique - len(inserted_events),
+            repeated=len(events) - unique
+        )
+
+    async def get_events(self, query: EventsQuery = None) -> EventPage:
+        return await self.repository.get_events(query)
+
+    async def get_events_json(self, query: EventsQuery = None) -> bytes:
+        """A page of events already encoded as EventPage JSON."""
+        rows, next_cursor = await self.repository.get_event_rows(query)
+        return encode_event_page(rows, next_cursor)
+
+    async def get_recent_events_json(self, query: EventsQuery) -> bytes:
+        """
+        The newest query.recent matching events, encoded as EventPage JSON
+        without a cursor. Answered from the recent events buffer when it holds
+        them all, without touching the database; otherwise read from there.
+        """
+        rows = self.recent.newest(query.recent, query)
+        if rows is None:
+            rows, _ = await self.repository.get_event_rows(query.model_copy(update={"limit": query.recent}))
+        return encode_event_page(rows, None)
+
+    def export_events(self, query: EventsFilter) -> AsyncIterator[List[Row]]:
+        """Chunks of matching event rows, oldest first, streamed from the database."""
+        return self.repository.stream_events(query)
+
+    async def get_stats(self, query: EventStatsQuery) -> EventStats:
+        """Sum the per-device rollup rows into one entry per bucket."""
+        buckets: Dict = {}
+        for row in await self.rollup_repository.get_rollups(query):
+            item = buckets.get(row.bucket_start)
+            if item is None:
+                item = buckets[row.bucket_start] = EventStatsBucket(
+                    bucket_start=row.bucket_start,
+                    event_count=0,
+                    openings=0,
+                    open_periods=0,
+                    open_seconds=0,
+                    max_open_seconds=0,
+                    device_event_counts={}
+                )
+            item.event_count += row.event_count
+            item.openings += row.openings
+            item.open_periods += row.open_periods
+            item.open_seconds += row.open_seconds
+            item.max_open_seconds = max(item.max_open_seconds, row.max_open_seconds)
+            item.device_event_counts[row.source_device_id] = row.event_count
 
-    def get_events(self) -> List[Event]:
-        return self.repository.get_events()
\ No newline at end of file
+        for item in buckets.values():
+            if item.open_periods:
+                item.average_open_seconds = item.open_seconds / item.open_periods
+        return EventStats(bucket=query.bucket, items=list(buckets.values()))
@@ -0,0 +1,15 @@
+from typing import Any, Dict, List
+from fastapi import APIRouter, Depends
+from app.api.v1.admin.admin_model import AdminUser
+from app.api.v1.admin.dependencies import get_current_admin
+from app.metrics import registry
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics(current_admin: AdminUser = Depends(get_current_admin)) -> List[Dict[str, Any]]:
+    """
+    Snapshot of the in-process counters, gauges and latency histograms.
+    Values are per worker process.
+    """
+    return registry.snapshot()
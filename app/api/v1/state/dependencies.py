@@ -1,11 +1,19 @@
 """Dependency injection for events module."""
 from fastapi import Depends
-from app.api.v1.state.state_repository import StateRepository
+from app.api.v1.state.state_repository import AsyncStateRepository
 from app.api.v1.state.state_service import StateService
+from app.db import UnitOfWork, get_unit_of_work
 
 
-def get_repository() -> StateRepository:
-    return StateRepository()
+# The unit of work is function-scoped so its connection is released as soon
+# as the endpoint returns, before the response or a long-lived stream is sent
+async def get_repository(
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function")
+) -> AsyncStateRepository:
+    return AsyncStateRepository(uow)
 
-def get_service(repository: StateRepository = Depends(get_repository)) -> StateService:
-    return StateService(repository)
+async def get_service(
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function"),
+    repository: AsyncStateRepository = Depends(get_repository)
+) -> StateService:
+    return StateService(uow, repository)
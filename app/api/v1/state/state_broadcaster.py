@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, Optional, Set
+from app.api.v1.state.state_model import State
+from app.metrics import MetricsRegistry, registry
+
+logger = logging.getLogger(__name__)
+
+STATE_STREAM_BUFFER_SIZE = int(os.getenv("STATE_STREAM_BUFFER_SIZE", "8"))
+STATE_STREAM_HEARTBEAT_SECONDS = float(os.getenv("STATE_STREAM_HEARTBEAT_SECONDS", "15"))
+
+HEARTBEAT_MESSAGE = b": heartbeat\n\n"
+RETRY_MESSAGE = b"retry: 5000\n\n"
+
+
+def format_state_message(state: State) -> bytes:
+    """Encode a state as a Server-Sent Events message."""
+    return (
+        f"event: state\n"
+        f"id: {state.last_event_id}\n"
+        f"data: {state.model_dump_json()}\n\n"
+    ).encode("utf-8")
+
+
+class StateBroadcaster:
+    """
+    Fans state changes out to Server-Sent Events subscribers. Each message is
+    encoded once and placed on every subscriber's bounded buffer; a slow client
+    loses its oldest buffered messages rather than holding up the others.
+    A single shared task sends heartbeats to all subscribers.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = STATE_STREAM_BUFFER_SIZE,
+        heartbeat_interval: float = STATE_STREAM_HEARTBEAT_SECONDS,
+        metrics: MetricsRegistry = registry,
+    ):
+        self.buffer_size = buffer_size
+        self.heartbeat_interval = heartbeat_interval
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+        metrics.gauge("state_stream_subscribers", fn=lambda: len(self._subscribers))
+        self._dropped = metrics.counter("state_stream_dropped_messages_total")
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+
+        # Close every open stream
+        for queue in list(self._subscribers):
+            self._put(queue, None)
+
+    def publish(self, state: State) -> None:
+        """Publish a state change. Safe to call from any thread."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        message = format_state_message(state)
+        self._loop.call_soon_threadsafe(self._fan_out, message)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.buffer_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    async def stream(self, queue: asyncio.Queue, initial: Optional[State] = None) -> AsyncIterator[bytes]:
+        """Yield SSE messages for a subscriber queue until it is closed or the client leaves."""
+        try:
+            yield RETRY_MESSAGE
+            if initial is not None:
+                yield format_state_message(initial)
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+                yield message
+        finally:
+            self.unsubscribe(queue)
+
+    def _fan_out(self, message: bytes) -> None:
+        for queue in self._subscribers:
+            self._put(queue, message)
+
+    def _put(self, queue: asyncio.Queue, message: Optional[bytes]) -> None:
+        if queue.full():
+            queue.get_nowait()
+            self._dropped.inc()
+        queue.put_nowait(message)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            for queue in self._subscribers:
+                # Heartbeats only matter to idle clients; never displace a state message
+                if not queue.full():
+                    queue.put_nowait(HEARTBEAT_MESSAGE)
+
+
+state_broadcaster = StateBroadcaster()
@@ -0,0 +1,55 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Optional, Tuple
+from app.api.v1.state.state_model import State
+
+STATE_CACHE_TTL_SECONDS = float(os.getenv("STATE_CACHE_TTL_SECONDS", "30"))
+
+
+class CurrentStateCache:
+    """
+    Process-wide cache of the current state. Writes through StateService keep it
+    up to date; the TTL bounds staleness against writes made by other processes.
+    """
+
+    def __init__(self, ttl: float = STATE_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._state: Optional[State] = None
+        self._loaded_at: Optional[float] = None
+
+    def get(self) -> Tuple[bool, Optional[State]]:
+        """Return (hit, state). A hit may carry None when no state exists yet."""
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+                return False, None
+            return True, self._state
+
+    def set(self, state: Optional[State]) -> bool:
+        """
+        Store a state unless the cached one is newer. Returns True if the
+        cached value changed.
+        """
+        with self._lock:
+            current = self._state
+            if current and state and state.timestamp < current.timestamp:
+                return False
+            self._state = state
+            self._loaded_at = time.monotonic()
+            return current != state
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._state = None
+            self._loaded_at = None
+
+
+def state_etag(state: State) -> str:
+    """Strong ETag for a state, derived from the event that produced it."""
+    digest = hashlib.sha256(state.last_event_id.encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+state_cache = CurrentStateCache()
@@ -1,26 +1,71 @@
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
 from app.api.v1.state.state_service import StateService
 from app.api.v1.state.state_model import State
+from app.api.v1.state.state_cache import state_etag
+from app.api.v1.state.state_broadcaster import state_broadcaster
 from app.api.v1.state.dependencies import get_service
+from app.http_cache import etag_matches
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/state")
-def get_current_state(service: StateService = Depends(get_service)) -> Optional[State]:
+async def get_current_state(
+    request: Request,
+    response: Response,
+    service: StateService = Depends(get_service)
+) -> Optional[State]:
+    """
+    Get the current bridge state. Responses carry an ETag so pollers can
+    revalidate with If-None-Match and receive 304 while nothing has changed.
+    """
     try:
-        return service.get_current_state()
+        current_state = await service.get_current_state()
     except Exception as e:
         logger.error(f"Error getting current state: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error getting current state: {str(e)}")
+    
+    if current_state is None:
+        return None
+    
+    etag = state_etag(current_state)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return current_state
+
+
+@router.get("/state/stream")
+async def stream_state(service: StateService = Depends(get_service)) -> StreamingResponse:
+    """
+    Server-Sent Events stream of bridge state. Sends the current state on
+    connect and then every change as a "state" event.
+    """
+    # Subscribe before reading so a change in between is not missed
+    queue = state_broadcaster.subscribe()
+    try:
+        current_state = await service.get_current_state()
+    except Exception as e:
+        state_broadcaster.unsubscribe(queue)
+        logger.error(f"Error getting current state: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error getting current state: {str(e)}")
+    
+    return StreamingResponse(
+        state_broadcaster.stream(queue, current_state),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/state")
-def create_state(state: State, service: StateService = Depends(get_service)) -> State:
+async def create_state(state: State, service: StateService = Depends(get_service)) -> State:
     try:
-        return service.create_state(state)
+        return await service.create_state(state)
     except Exception as e:
         logger.error(f"Error creating state: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error creating current state: {str(e)}")
@@ -1,13 +1,12 @@
 from enum import Enum
-from datetime import datetime
 from pydantic import BaseModel
-from app.api.v1.events.events_model import BridgeState
+from app.api.v1.events.events_model import BridgeState, UtcDatetime
 
 
 class State(BaseModel):
     state_id: str
     bridge_state: BridgeState
-    timestamp: datetime
+    timestamp: UtcDatetime
     last_event_id: str
 
     class Config:
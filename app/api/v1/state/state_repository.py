@@ -1,11 +1,13 @@
-from typing import Optional, List
+from typing import Optional
 from datetime import datetime
 from sqlmodel import SQLModel, Field, Session, select
-from sqlalchemy import ForeignKey, Column, String
+from sqlalchemy import Column, String, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.engine import Engine
 from app.api.v1.state.state_model import State
 from app.api.v1.events.events_model import BridgeState
-from app.db import get_engine
+from app.db import get_engine, UnitOfWork
+from app.notify import notify, notify_async, STATE_CHANNEL
 
 
 class StateSQLModel(SQLModel, table=True):
@@ -15,9 +17,8 @@ class StateSQLModel(SQLModel, table=True):
     state_id: str = Field(index=True)
     bridge_state: BridgeState = Field(index=True)
     timestamp: datetime = Field(index=True)
-    last_event_id: str = Field(
-        sa_column=Column(String, ForeignKey("events.event_id"), index=True)
-    )
+    # Not a foreign key: events is partitioned and old partitions are dropped
+    last_event_id: str = Field(sa_column=Column(String, index=True))
     
     def to_domain(self) -> State:
         return State(
@@ -37,7 +38,55 @@ class StateSQLModel(SQLModel, table=True):
         )
 
 
+# Current state lives in a single row with a fixed primary key
+CURRENT_STATE_ID = 1
+
+
+def _upsert_current_state_statement(state: State):
+    """
+    Upsert the current state row, overwriting it only when the incoming
+    timestamp is newer. Returns the row only if it was written.
+    """
+    statement = insert(StateSQLModel).values(id=CURRENT_STATE_ID, **state.model_dump())
+    return statement.on_conflict_do_update(
+        index_elements=[StateSQLModel.id],
+        set_={
+            "state_id": statement.excluded.state_id,
+            "bridge_state": statement.excluded.bridge_state,
+            "timestamp": statement.excluded.timestamp,
+            "last_event_id": statement.excluded.last_event_id,
+        },
+        where=StateSQLModel.timestamp < statement.excluded.timestamp,
+    ).returning(*StateSQLModel.__table__.columns)
+
+
+def collapse_state_history(session: Session) -> int:
+    """
+    Fold the history older versions left behind, one row per state change,
+    into the current state row: the newest row is upserted into
+    CURRENT_STATE_ID and every other row is deleted. Safe to run repeatedly.
+    Returns the number of rows deleted. Does not commit.
+    """
+    newest = session.exec(
+        select(StateSQLModel)
+        .where(StateSQLModel.id != CURRENT_STATE_ID)
+        .order_by(StateSQLModel.timestamp.desc(), StateSQLModel.id.desc())
+        .limit(1)
+    ).first()
+    if newest is None:
+        return 0
+    
+    row = session.exec(_upsert_current_state_statement(newest.to_domain())).first()
+    if row:
+        notify(session, STATE_CHANNEL, [State.model_validate(row).model_dump_json()])
+    return session.execute(
+        delete(StateSQLModel).where(StateSQLModel.id != CURRENT_STATE_ID)
+    ).rowcount
+
+
 class StateRepository:
+    CURRENT_STATE_ID = CURRENT_STATE_ID
+
     def __init__(self, engine: Engine = None):
         self.engine = engine or get_engine()
 
@@ -46,46 +95,72 @@ class StateRepository:
         return Session(self.engine)
 
     def create_state(self, state: State) -> State:
+        return self.update_current_state(state)
+    
+    def collapse_history(self) -> int:
+        """Collapse old state rows into the current state row, in one transaction."""
         with self._get_session() as session:
-            state_sql_model = StateSQLModel.from_domain(state)
-            session.add(state_sql_model)
+            deleted = collapse_state_history(session)
             session.commit()
-            session.refresh(state_sql_model)
-            
-            return state_sql_model.to_domain()
+            return deleted
     
     def get_current_state(self) -> Optional[State]:
         with self._get_session() as session:
-            statement = select(StateSQLModel).order_by(StateSQLModel.timestamp.desc())
-            results = session.exec(statement).all()
+            result = session.get(StateSQLModel, CURRENT_STATE_ID)
             
-            if not results:
+            if not result:
                 return None
             
-            return results[0].to_domain()
+            return result.to_domain()
     
     def update_current_state(self, state: State) -> State:
+        """
+        Atomically advance the current state row. The row is only overwritten when
+        the incoming timestamp is newer, so late or replayed events are no-ops.
+        Returns the current state after the upsert.
+        """
         with self._get_session() as session:
-            statement = select(StateSQLModel).order_by(StateSQLModel.timestamp.desc())
-            results = session.exec(statement).all()
-            
-            if results:
-                # Update existing state
-                existing_state = results[0]
-                existing_state.state_id = state.state_id
-                existing_state.bridge_state = state.bridge_state
-                existing_state.timestamp = state.timestamp
-                existing_state.last_event_id = state.last_event_id
-                session.add(existing_state)
+            row = session.exec(_upsert_current_state_statement(state)).first()
+            if row:
+                current_state = State.model_validate(row)
+                notify(session, STATE_CHANNEL, [current_state.model_dump_json()])
                 session.commit()
-                session.refresh(existing_state)
+                return current_state
+            session.commit()
+            
+            # The stored state is already newer than the incoming one
+            return session.get(StateSQLModel, CURRENT_STATE_ID).to_domain()
 
-                return existing_state.to_domain()
-            else:
-                # Create new state if none exists
-                state_sql_model = StateSQLModel.from_domain(state)
-                session.add(state_sql_model)
-                session.commit()
-                session.refresh(state_sql_model)
-                
-                return state_sql_model.to_domain()
\ No newline at end of file
+
+class AsyncStateRepository:
+    """StateRepository on a UnitOfWork, for request handlers."""
+
+    def __init__(self, uow: UnitOfWork):
+        self.session = uow.session
+
+    async def create_state(self, state: State) -> State:
+        return await self.update_current_state(state)
+    
+    async def get_current_state(self) -> Optional[State]:
+        result = await self.session.get(StateSQLModel, CURRENT_STATE_ID)
+        
+        if not result:
+            return None
+        
+        return result.to_domain()
+    
+    async def update_current_state(self, state: State) -> State:
+        """
+        Atomically advance the current state row. The row is only overwritten when
+        the incoming timestamp is newer, so late or replayed events are no-ops.
+        Returns the current state after the upsert.
+        """
+        row = (await self.session.exec(_upsert_current_state_statement(state))).first()
+        if row:
+            current_state = State.model_validate(row)
+            await notify_async(self.session, STATE_CHANNEL, [current_state.model_dump_json()])
+            return current_state
+        
+        # The stored state is already newer than the incoming one
+        result = await self.session.get(StateSQLModel, CURRENT_STATE_ID, populate_existing=True)
+        return result.to_domain()
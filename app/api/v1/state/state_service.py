@@ -1,30 +1,72 @@
 import uuid
 from typing import Optional
 from app.api.v1.state.state_model import State
-from app.api.v1.state.state_repository import StateRepository
+from app.api.v1.state.state_repository import AsyncStateRepository
+from app.api.v1.state.state_cache import CurrentStateCache, state_cache
+from app.api.v1.state.state_broadcaster import StateBroadcaster, state_broadcaster
 from app.api.v1.events.events_model import Event
+from app.db import UnitOfWork
+
+
+def state_from_event(event: Event) -> State:
+    """Build the state an event would advance the bridge to."""
+    return State(
+        state_id=str(uuid.uuid4()),
+        bridge_state=event.bridge_state,
+        timestamp=event.timestamp,
+        last_event_id=event.event_id
+    )
+
 
 class StateService:
-    def __init__(self, repository: StateRepository = None):
-        self.repository = repository or StateRepository()
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        repository: AsyncStateRepository = None,
+        cache: CurrentStateCache = None,
+        broadcaster: StateBroadcaster = None
+    ):
+        self.uow = uow
+        self.repository = repository or AsyncStateRepository(uow)
+        self.cache = cache or state_cache
+        self.broadcaster = broadcaster or state_broadcaster
 
-    def create_state(self, state: State) -> State:
-        return self.repository.create_state(state)
+    def _publish(self, current_state: State) -> None:
+        """Refresh the cache and push the state to stream subscribers if it changed."""
+        if self.cache.set(current_state):
+            self.broadcaster.publish(current_state)
 
-    def get_current_state(self) -> Optional[State]:
-        return self.repository.get_current_state()
+    async def create_state(self, state: State) -> State:
+        current_state = await self.repository.create_state(state)
+        self.uow.after_commit(lambda: self._publish(current_state))
+        await self.uow.commit()
+        return current_state
 
-    def update_current_state(self, event: Event) -> State:
-        current_state = self.get_current_state()
-        
-        # Idempotency check: if this event was already processed, return current state
-        if current_state and current_state.last_event_id == event.event_id:
+    async def get_current_state(self) -> Optional[State]:
+        hit, current_state = self.cache.get()
+        if hit:
             return current_state
         
-        new_state = State(
-            state_id=str(uuid.uuid4()),
-            bridge_state=event.bridge_state,
-            timestamp=event.timestamp,
-            last_event_id=event.event_id
-        )
-        return self.repository.update_current_state(new_state)
+        current_state = await self.repository.get_current_state()
+        self.cache.set(current_state)
+        return current_state
+
+    async def update_current_state(self, event: Event) -> State:
+        """
+        Advance current state from an event. Events older than the current state,
+        including replays of the event that produced it, leave it unchanged.
+        Runs in the caller's transaction; the cache is updated once it commits.
+        """
+        current_state = await self.repository.update_current_state(state_from_event(event))
+        self.uow.after_commit(lambda: self._publish(current_state))
+        return current_state
+
+
+def apply_state_notification(payload: str) -> None:
+    """
+    Apply a current-state change announced over NOTIFY. Changes made by this
+    process are already cached, so only other workers' writes get published.
+    """
+    current_state = State.model_validate_json(payload)
+    if state_cache.set(current_state):
+        state_broadcaster.publish(current_state)
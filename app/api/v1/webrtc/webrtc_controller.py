@@ -1,42 +1,132 @@
-import os
+import logging
+from typing import Dict, Optional
 import httpx
-from fastapi import APIRouter, Request, Response, HTTPException
+from fastapi import APIRouter, Depends, Request, Response, HTTPException
+from app.api.v1.admin.admin_model import AdminUser
+from app.api.v1.admin.dependencies import get_optional_admin
+from app.api.v1.webrtc.webrtc_sessions import whep_sessions, upstream_path_from_location, ViewerLimitReached
+from app.api.v1.webrtc.webrtc_upstream import (
+    mediamtx_client, UpstreamNotConfigured, UpstreamUnavailable
+)
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
-MEDIAMTX_WEBRTC_URL = os.getenv("MEDIAMTX_WEBRTC_URL")
 
-def normalize_upstream_url(raw_url: str | None) -> str:
-    if not raw_url:
+# Upstream response headers a WHEP client needs to see
+FORWARDED_RESPONSE_HEADERS = ("content-type", "etag", "accept-patch", "link")
+
+# Suggested wait before a viewer turned away at the cap tries again
+VIEWER_RETRY_AFTER_SECONDS = 30
+
+
+async def _request_upstream(method: str, path: str, **kwargs) -> httpx.Response:
+    """Call MediaMTX, mapping its failure modes onto proxy error responses."""
+    try:
+        return await mediamtx_client.request(method, path, **kwargs)
+    except UpstreamNotConfigured as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except UpstreamUnavailable as e:
         raise HTTPException(
-            status_code=500,
-            detail="MEDIAMTX_WEBRTC_URL is not set",
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": f"{e.retry_after:.0f}"},
         )
-    if raw_url.startswith("http://") or raw_url.startswith("https://"):
-        return raw_url
-    return f"http://{raw_url}"
-
+    except httpx.TimeoutException as e:
+        logger.warning(f"MediaMTX timed out: {e!r}")
+        raise HTTPException(status_code=504, detail="MediaMTX timed out")
+    except httpx.TransportError as e:
+        logger.warning(f"MediaMTX unreachable: {e!r}")
+        raise HTTPException(status_code=502, detail="MediaMTX unreachable")
 
-@router.post("/camera/whep")
-async def proxy_webrtc_whep(request: Request):
-    upstream_base = normalize_upstream_url(MEDIAMTX_WEBRTC_URL).rstrip("/")
-    upstream_url = f"{upstream_base}/camera/whep"
-    body = await request.body()
-    headers = {}
-    content_type = request.headers.get("content-type")
-    if content_type:
-        headers["content-type"] = content_type
 
-    async with httpx.AsyncClient() as client:
-        upstream_resp = await client.post(upstream_url, content=body, headers=headers)
+def _forward_headers(request: Request, *names: str) -> Dict[str, str]:
+    return {name: request.headers[name] for name in names if name in request.headers}
 
-    response_headers = {}
-    if "content-type" in upstream_resp.headers:
-        response_headers["content-type"] = upstream_resp.headers["content-type"]
-    if "location" in upstream_resp.headers:
-        response_headers["location"] = "/camera/whep"
 
+def _proxy_response(upstream_resp: httpx.Response, headers: Dict[str, str] = None) -> Response:
+    response_headers = {
+        name: upstream_resp.headers[name]
+        for name in FORWARDED_RESPONSE_HEADERS
+        if name in upstream_resp.headers
+    }
+    response_headers.update(headers or {})
     return Response(
         content=upstream_resp.content,
         status_code=upstream_resp.status_code,
         headers=response_headers,
     )
+
+
+@router.post("/camera/whep")
+async def proxy_webrtc_whep(
+    request: Request,
+    admin: Optional[AdminUser] = Depends(get_optional_admin)
+):
+    """
+    Start a WHEP session, if the viewer cap allows. The session resource
+    MediaMTX creates is handed back as /camera/whep/{session_id} for trickle
+    ICE, heartbeats and teardown.
+    """
+    try:
+        session = whep_sessions.admit(is_admin=admin is not None)
+    except ViewerLimitReached as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(VIEWER_RETRY_AFTER_SECONDS)},
+        )
+
+    try:
+        body = await request.body()
+        upstream_resp = await _request_upstream(
+            "POST", "/camera/whep", content=body, headers=_forward_headers(request, "content-type")
+        )
+    except BaseException:
+        whep_sessions.remove(session.session_id)
+        raise
+
+    headers = {}
+    location = upstream_resp.headers.get("location")
+    if upstream_resp.status_code == 201 and location:
+        session.upstream_path = upstream_path_from_location(location)
+        whep_sessions.touch(session.session_id)
+        headers["location"] = f"/camera/whep/{session.session_id}"
+    else:
+        whep_sessions.remove(session.session_id)
+    return _proxy_response(upstream_resp, headers)
+
+
+@router.patch("/camera/whep/{session_id}")
+async def proxy_webrtc_whep_patch(session_id: str, request: Request):
+    """Forward trickled ICE candidates to the session on MediaMTX."""
+    session = whep_sessions.touch(session_id)
+    if session is None or session.upstream_path is None:
+        raise HTTPException(status_code=404, detail="WHEP session not found")
+
+    body = await request.body()
+    upstream_resp = await _request_upstream(
+        "PATCH", session.upstream_path, content=body,
+        headers=_forward_headers(request, "content-type", "if-match"),
+    )
+    if upstream_resp.status_code == 404:
+        whep_sessions.remove(session_id)
+    return _proxy_response(upstream_resp)
+
+
+@router.post("/camera/whep/{session_id}/heartbeat", status_code=204)
+async def webrtc_whep_heartbeat(session_id: str) -> Response:
+    """Mark a session as still watched, so it is not reaped as idle."""
+    if whep_sessions.touch(session_id, heartbeat=True) is None:
+        raise HTTPException(status_code=404, detail="WHEP session not found")
+    return Response(status_code=204)
+
+
+@router.delete("/camera/whep/{session_id}")
+async def proxy_webrtc_whep_delete(session_id: str):
+    """Tear the session down on MediaMTX."""
+    session = whep_sessions.remove(session_id)
+    if session is None or session.upstream_path is None:
+        raise HTTPException(status_code=404, detail="WHEP session not found")
+
+    upstream_resp = await _request_upstream("DELETE", session.upstream_path)
+    return _proxy_response(upstream_resp)
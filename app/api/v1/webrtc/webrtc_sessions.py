@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from app.api.v1.webrtc.webrtc_upstream import MediaMTXClient, mediamtx_client
+from app.metrics import MetricsRegistry, registry
+
+logger = logging.getLogger(__name__)
+
+# Counted by each worker process on its own: with N uvicorn workers, up to
+# N times this many viewers are admitted in total
+WHEP_MAX_VIEWERS = int(os.getenv("WHEP_MAX_VIEWERS", "20"))
+WHEP_ADMIN_RESERVED_VIEWERS = int(os.getenv("WHEP_ADMIN_RESERVED_VIEWERS", "2"))
+WHEP_SESSION_IDLE_SECONDS = float(os.getenv("WHEP_SESSION_IDLE_SECONDS", "45"))
+
+# How often idle sessions are looked for
+REAP_INTERVAL_SECONDS = 5.0
+
+# An empty trickle-ICE PATCH changes nothing on a live session; MediaMTX
+# answers 404 once the session has closed
+TRICKLE_ICE_CONTENT_TYPE = "application/trickle-ice-sdpfrag"
+
+
+@dataclass
+class WhepSession:
+    session_id: str
+    is_admin: bool
+    created_at: float
+    last_activity: float
+    # Path of the session resource on MediaMTX, as given in its Location header;
+    # None while the offer is still being answered
+    upstream_path: Optional[str] = None
+    # Whether the viewer sends heartbeats; standard WHEP players do not
+    sends_heartbeats: bool = False
+
+
+class ViewerLimitReached(Exception):
+    """Raised when admitting another viewer would exceed the cap."""
+
+
+def upstream_path_from_location(location: str) -> str:
+    """Reduce a Location header, absolute or relative, to a path on MediaMTX."""
+    parts = urlsplit(location)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def _kind(is_admin: bool) -> str:
+    return "admin" if is_admin else "viewer"
+
+
+class WhepSessionRegistry:
+    """
+    Tracks the WHEP sessions created through this proxy and admits new ones
+    against a cap. Anonymous viewers may take max_viewers minus the slots
+    reserved for admins; admins may take any free slot. A slot is held from
+    the moment the offer arrives, so concurrent offers cannot overshoot.
+
+    Activity (ICE PATCHes, and heartbeats from viewers that send them) keeps
+    a session fresh. Sessions idle for idle_timeout are checked on MediaMTX:
+    live ones are refreshed, closed ones have their slots freed. This catches
+    viewers that vanished without a DELETE while leaving standard players,
+    which send nothing once connected, streaming. If MediaMTX cannot say,
+    only sessions whose heartbeats stopped are deleted there and freed.
+    """
+
+    def __init__(
+        self,
+        max_viewers: int = WHEP_MAX_VIEWERS,
+        admin_reserved: int = WHEP_ADMIN_RESERVED_VIEWERS,
+        idle_timeout: float = WHEP_SESSION_IDLE_SECONDS,
+        upstream: MediaMTXClient = None,
+        metrics: MetricsRegistry = registry,
+    ):
+        self.max_viewers = max_viewers
+        self.admin_reserved = min(admin_reserved, max_viewers)
+        self.idle_timeout = idle_timeout
+        self.upstream = upstream or mediamtx_client
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, WhepSession] = {}
+        self._reaper: Optional[asyncio.Task] = None
+        self.metrics = metrics
+
+        for is_admin in (False, True):
+            metrics.gauge(
+                "whep_sessions_active", fn=lambda is_admin=is_admin: self.count(is_admin), kind=_kind(is_admin)
+            )
+        self._reaped = metrics.counter("whep_sessions_reaped_total")
+
+    def count(self, is_admin: Optional[bool] = None) -> int:
+        with self._lock:
+            return sum(1 for session in self._sessions.values() if is_admin in (None, session.is_admin))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def admit(self, is_admin: bool) -> WhepSession:
+        """Take a slot for a new viewer, or raise ViewerLimitReached."""
+        limit = self.max_viewers if is_admin else self.max_viewers - self.admin_reserved
+        now = time.monotonic()
+        with self._lock:
+            if len(self._sessions) >= limit:
+                self.metrics.counter("whep_admission_rejected_total", kind=_kind(is_admin)).inc()
+                raise ViewerLimitReached(f"Viewer limit of {limit} reached")
+            session = WhepSession(
+                session_id=uuid.uuid4().hex,
+                is_admin=is_admin,
+                created_at=now,
+                last_activity=now,
+            )
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[WhepSession]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def touch(self, session_id: str, heartbeat: bool = False) -> Optional[WhepSession]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_activity = time.monotonic()
+                session.sends_heartbeats = session.sends_heartbeats or heartbeat
+            return session
+
+    def remove(self, session_id: str) -> Optional[WhepSession]:
+        with self._lock:
+            return self._sessions.pop(session_id, None)
+
+    async def start(self) -> None:
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_forever())
+
+    async def stop(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+
+    def _idle_sessions(self) -> List[WhepSession]:
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            return [
+                session for session in self._sessions.values()
+                # Sessions still being set up are left to their request
+                if session.upstream_path and session.last_activity < cutoff
+            ]
+
+    async def _is_alive(self, session: WhepSession) -> Optional[bool]:
+        """Ask MediaMTX whether a session is still open; None if it cannot tell."""
+        try:
+            response = await self.upstream.request(
+                "PATCH", session.upstream_path, content=b"",
+                headers={"Content-Type": TRICKLE_ICE_CONTENT_TYPE},
+            )
+        except Exception as e:
+            logger.warning(f"Could not check WHEP session {session.session_id}: {e!r}")
+            return None
+        if response.status_code == 404:
+            return False
+        return True if response.is_success else None
+
+    async def reap(self) -> int:
+        """Check idle sessions on MediaMTX, refreshing live ones and freeing the slots of the rest."""
+        reaped = 0
+        for session in self._idle_sessions():
+            alive = await self._is_alive(session)
+            if alive:
+                self.touch(session.session_id)
+                continue
+            if alive is None and not session.sends_heartbeats:
+                # A standard player may well be watching; keep it until it is known to be gone
+                continue
+            if self.remove(session.session_id) is None:
+                continue
+            reaped += 1
+            self._reaped.inc()
+            if alive is None:
+                try:
+                    await self.upstream.request("DELETE", session.upstream_path)
+                except Exception as e:
+                    logger.warning(f"Could not delete idle WHEP session {session.session_id}: {e!r}")
+        if reaped:
+            logger.info(f"Reaped {reaped} idle WHEP sessions")
+        return reaped
+
+    async def _reap_forever(self) -> None:
+        while True:
+            await asyncio.sleep(REAP_INTERVAL_SECONDS)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.error(f"Error reaping WHEP sessions: {e}", exc_info=True)
+
+
+whep_sessions = WhepSessionRegistry()
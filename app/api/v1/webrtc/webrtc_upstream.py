@@ -0,0 +1,179 @@
+import logging
+import os
+import threading
+import time
+from typing import Optional
+import httpx
+from app.metrics import MetricsRegistry, registry
+
+logger = logging.getLogger(__name__)
+
+MEDIAMTX_WEBRTC_URL = os.getenv("MEDIAMTX_WEBRTC_URL")
+MEDIAMTX_CONNECT_TIMEOUT_MS = int(os.getenv("MEDIAMTX_CONNECT_TIMEOUT_MS", "2000"))
+MEDIAMTX_READ_TIMEOUT_MS = int(os.getenv("MEDIAMTX_READ_TIMEOUT_MS", "10000"))
+MEDIAMTX_MAX_CONNECTIONS = int(os.getenv("MEDIAMTX_MAX_CONNECTIONS", "50"))
+MEDIAMTX_CIRCUIT_FAILURES = int(os.getenv("MEDIAMTX_CIRCUIT_FAILURES", "5"))
+MEDIAMTX_CIRCUIT_RESET_SECONDS = float(os.getenv("MEDIAMTX_CIRCUIT_RESET_SECONDS", "10"))
+
+# Idle keep-alive connections are closed after this long
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+
+def normalize_upstream_url(raw_url: Optional[str]) -> Optional[str]:
+    if not raw_url:
+        return None
+    if raw_url.startswith("http://") or raw_url.startswith("https://"):
+        return raw_url.rstrip("/")
+    return f"http://{raw_url}".rstrip("/")
+
+
+class UpstreamNotConfigured(Exception):
+    """Raised when MEDIAMTX_WEBRTC_URL is not set."""
+
+
+class UpstreamUnavailable(Exception):
+    """Raised without contacting MediaMTX while the circuit is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"MediaMTX unavailable, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds. Then one trial call is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_call(self) -> None:
+        """Raise UpstreamUnavailable unless a call may go ahead."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0 or self._trial_in_flight:
+                raise UpstreamUnavailable(max(remaining, 1))
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("MediaMTX reachable again, closing circuit")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"MediaMTX failed {self._failures} times in a row, opening circuit")
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def record_aborted(self) -> None:
+        """A call ended without an answer either way; let another trial through."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class MediaMTXClient:
+    """
+    One HTTP client to MediaMTX for the life of the app, so viewers reuse
+    pooled keep-alive connections. Transport errors, timeouts and 5xx
+    responses count against the circuit breaker.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = MEDIAMTX_WEBRTC_URL,
+        connect_timeout: float = MEDIAMTX_CONNECT_TIMEOUT_MS / 1000,
+        read_timeout: float = MEDIAMTX_READ_TIMEOUT_MS / 1000,
+        max_connections: int = MEDIAMTX_MAX_CONNECTIONS,
+        breaker: CircuitBreaker = None,
+        metrics: MetricsRegistry = registry,
+    ):
+        self.base_url = normalize_upstream_url(base_url)
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout, pool=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        )
+        self.breaker = breaker or CircuitBreaker(MEDIAMTX_CIRCUIT_FAILURES, MEDIAMTX_CIRCUIT_RESET_SECONDS)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.metrics = metrics
+
+        metrics.gauge("webrtc_upstream_circuit_open", fn=lambda: int(self.breaker.is_open))
+        self._rejected = metrics.counter("webrtc_upstream_rejected_total")
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self.base_url is None:
+            raise UpstreamNotConfigured("MEDIAMTX_WEBRTC_URL is not set")
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=self.limits)
+        return self._client
+
+    async def start(self) -> None:
+        if self.base_url is None:
+            logger.warning("MEDIAMTX_WEBRTC_URL is not set, camera streaming is disabled")
+            return
+        self._ensure_client()
+        logger.info(f"MediaMTX client ready for {self.base_url}")
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        client = self._ensure_client()
+        try:
+            self.breaker.before_call()
+        except UpstreamUnavailable:
+            self._rejected.inc()
+            raise
+
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await client.request(method, path, **kwargs)
+            outcome = f"{response.status_code // 100}xx"
+        except httpx.TimeoutException:
+            outcome = "timeout"
+            self.breaker.record_failure()
+            raise
+        except httpx.TransportError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or failed on our side, which says nothing about MediaMTX
+            self.breaker.record_aborted()
+            raise
+        finally:
+            self.metrics.histogram("webrtc_upstream_seconds", method=method, outcome=outcome).observe(
+                time.perf_counter() - started
+            )
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+
+mediamtx_client = MediaMTXClient()
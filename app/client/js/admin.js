@@ -156,16 +156,89 @@ function createInboundStream(videoEl, pc) {
   return inbound;
 }
 
-async function waitForIceGatheringComplete(pc) {
-  if (pc.iceGatheringState === "complete") return;
-  await new Promise((resolve) => {
-    const checkState = () => {
-      if (pc.iceGatheringState === "complete") {
-        pc.removeEventListener("icegatheringstatechange", checkState);
-        resolve();
-      }
-    };
-    pc.addEventListener("icegatheringstatechange", checkState);
+// Candidates gathered after the offer went out, as an SDP fragment (RFC 8840)
+function buildSdpFragment(offerSdp, candidates) {
+  const lines = offerSdp.split("\r\n");
+  const ufrag = lines.find((line) => line.startsWith("a=ice-ufrag:"));
+  const pwd = lines.find((line) => line.startsWith("a=ice-pwd:"));
+  const medias = [];
+  for (const line of lines) {
+    if (line.startsWith("m=")) {
+      medias.push({ mLine: line, mid: null });
+    } else if (line.startsWith("a=mid:") && medias.length) {
+      medias[medias.length - 1].mid = line.slice("a=mid:".length);
+    }
+  }
+
+  let frag = `${ufrag}\r\n${pwd}\r\n`;
+  medias.forEach((media, index) => {
+    const mediaCandidates = candidates.filter(
+      (candidate) => candidate.sdpMLineIndex === index || candidate.sdpMid === media.mid
+    );
+    if (!mediaCandidates.length) return;
+    frag += `${media.mLine}\r\na=mid:${media.mid}\r\n`;
+    for (const candidate of mediaCandidates) {
+      frag += `a=${candidate.candidate}\r\n`;
+    }
+  });
+  return frag;
+}
+
+function trickleIce(pc, offerSdp) {
+  let sessionUrl = null;
+  let etag = null;
+  let pending = [];
+
+  const flush = async () => {
+    if (!sessionUrl || !pending.length) return;
+    const candidates = pending;
+    pending = [];
+    const headers = { "Content-Type": "application/trickle-ice-sdpfrag" };
+    if (etag) headers["If-Match"] = etag;
+    const res = await fetch(sessionUrl, {
+      method: "PATCH",
+      headers,
+      body: buildSdpFragment(offerSdp, candidates),
+    });
+    if (!res.ok) {
+      console.warn(`Sending ICE candidates failed: ${res.status} ${res.statusText}`);
+    }
+  };
+
+  pc.onicecandidate = (ev) => {
+    if (!ev.candidate || !ev.candidate.candidate) return;
+    pending.push(ev.candidate);
+    flush().catch(console.error);
+  };
+
+  // Candidates gathered before the session exists are sent once it does
+  return (url, sessionEtag) => {
+    sessionUrl = url;
+    etag = sessionEtag;
+    flush().catch(console.error);
+  };
+}
+
+// Tells the server the session is still watched, so it is not reaped as idle
+const HEARTBEAT_INTERVAL_MS = 15000;
+
+function keepSessionAlive(sessionUrl, pc) {
+  const timer = setInterval(() => {
+    if (pc.connectionState === "closed" || pc.connectionState === "failed") {
+      clearInterval(timer);
+      return;
+    }
+    fetch(`${sessionUrl}/heartbeat`, { method: "POST" }).catch(console.error);
+  }, HEARTBEAT_INTERVAL_MS);
+  return timer;
+}
+
+function closeSessionOnExit(sessionUrl, pc, heartbeat) {
+  window.addEventListener("pagehide", () => {
+    clearInterval(heartbeat);
+    pc.close();
+    // keepalive lets the request outlive the page
+    fetch(sessionUrl, { method: "DELETE", keepalive: true }).catch(() => {});
   });
 }
 
@@ -179,19 +252,26 @@ async function startWebRtc() {
   createInboundStream(videoEl, pc);
 
   const offer = await pc.createOffer();
+  const startTrickle = trickleIce(pc, offer.sdp);
   await pc.setLocalDescription(offer);
-  await waitForIceGatheringComplete(pc);
 
+  // Send the offer straight away; candidates follow as they are gathered
   const res = await fetch(webrtcUrl, {
     method: "POST",
     headers: { "Content-Type": "application/sdp" },
-    body: pc.localDescription.sdp,
+    body: offer.sdp,
   });
 
   if (!res.ok) {
     throw new Error(`WebRTC signaling failed: ${res.status} ${res.statusText}`);
   }
 
+  const sessionUrl = res.headers.get("Location");
+  if (sessionUrl) {
+    startTrickle(sessionUrl, res.headers.get("ETag"));
+    closeSessionOnExit(sessionUrl, pc, keepSessionAlive(sessionUrl, pc));
+  }
+
   const answerSdp = await res.text();
   await pc.setRemoteDescription({ type: "answer", sdp: answerSdp });
 }
@@ -2,6 +2,7 @@ console.log("Hello World!");
 
 const API = {
   state: "/api/v1/state",
+  stateStream: "/api/v1/state/stream",
 };
 
 const dom = {
@@ -41,7 +42,25 @@ function formatTimestamp(timestamp) {
   });
 }
 
+function subscribeToState() {
+  // The server sends the current state on connect and then every change.
+  // EventSource reconnects on its own after network errors.
+  const source = new EventSource(API.stateStream);
+  source.addEventListener("state", (event) => {
+    state = JSON.parse(event.data);
+    updateState();
+  });
+  source.onerror = () => {
+    console.warn("State stream interrupted, reconnecting...");
+  };
+}
+
 function init() {
+  if (window.EventSource) {
+    subscribeToState();
+    return;
+  }
+
   setInterval(fetchCurrentState, 10000);
   fetchCurrentState();
 }
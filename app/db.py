@@ -1,25 +1,126 @@
+import logging
 import os
+from typing import AsyncIterator, Callable, List
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db_metrics import instrument_engine, InstrumentedQueuePool, InstrumentedAsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
     f"postgresql://{os.getenv('POSTGRES_USER', 'postgres')}:{os.getenv('POSTGRES_PASSWORD', 'postgres')}@{os.getenv('POSTGRES_HOST', 'localhost')}:{os.getenv('POSTGRES_PORT', '5432')}/{os.getenv('POSTGRES_DB', 'watchthehutch')}"
 )
 
-engine = create_engine(DATABASE_URL, echo=True)
+# Same database through asyncpg, for request handling on the event loop
+ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+# Full SQL echo is for local debugging only; use the metrics endpoint in production
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+
+# The sync engine serves startup, the notification listener and the scripts/ tools
+engine = create_engine(DATABASE_URL, echo=DB_ECHO, poolclass=InstrumentedQueuePool)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, echo=DB_ECHO, poolclass=InstrumentedAsyncAdaptedQueuePool
+)
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
 
 def init_db():
     # Import models here to avoid circular imports
     # This ensures models are registered with SQLModel.metadata
     from app.api.v1.events.events_repository import EventSQLModel
+    from app.api.v1.events.events_rollup_repository import HourlyEventRollupSQLModel
     from app.api.v1.state.state_repository import StateSQLModel
     from app.api.v1.admin.admin_repository import AdminUserSQLModel
     
     # Create all tables if they don't exist
     # This is safe for development; for production, use proper migrations
     SQLModel.metadata.create_all(engine)
+    ensure_indexes()
+    ensure_event_partitions()
+    ensure_single_state_row()
+
+
+def ensure_indexes():
+    """
+    Create any indexes declared on the models that are missing from existing tables.
+    create_all only builds indexes together with a new table.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def ensure_event_partitions():
+    """Make sure the events table has partitions for the coming months."""
+    from app.api.v1.events.events_partition_repository import EventsPartitionRepository
+
+    repository = EventsPartitionRepository(engine)
+    if not repository.is_partitioned():
+        logger.warning(
+            "events table is not partitioned; run scripts/migrate_events_partitions.py"
+        )
+        return
+    repository.ensure_upcoming_partitions()
+
+
+def ensure_single_state_row():
+    """Move databases that kept a row per state change to the single current state row."""
+    from app.api.v1.state.state_repository import StateRepository
+
+    deleted = StateRepository(engine).collapse_history()
+    if deleted:
+        logger.info("Collapsed %d old state rows into the current state", deleted)
 
 
 def get_engine():
     return engine
 
+
+def get_async_engine() -> AsyncEngine:
+    return async_engine
+
+
+class UnitOfWork:
+    """
+    One async session shared by every repository taking part in a request, so
+    their statements run on one connection and commit in one transaction.
+    Repositories built on it never commit themselves; whoever opened it does.
+    Nothing is committed unless commit() is called; close() rolls back.
+    """
+
+    def __init__(self, engine: AsyncEngine = None):
+        self.session = AsyncSession(engine or get_async_engine(), expire_on_commit=False)
+        self._after_commit: List[Callable[[], None]] = []
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run a callback once the current transaction has committed."""
+        self._after_commit.append(callback)
+
+    async def commit(self) -> None:
+        await self.session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    async def rollback(self) -> None:
+        self._after_commit = []
+        await self.session.rollback()
+
+    async def close(self) -> None:
+        self._after_commit = []
+        await self.session.close()
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+async def get_unit_of_work() -> AsyncIterator[UnitOfWork]:
+    async with UnitOfWork() as uow:
+        yield uow
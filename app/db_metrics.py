@@ -0,0 +1,124 @@
+"""Engine instrumentation: per-statement latency, slow-query logging and pool statistics."""
+import logging
+import os
+import re
+import time
+from typing import Any
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from app.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+# Bound the number of distinct statement labels so ad-hoc SQL cannot grow memory
+MAX_STATEMENT_LABELS = 500
+MAX_STATEMENT_LENGTH = 240
+
+_PARAM_PATTERN = re.compile(r"%\(\w+\)s|\$\d+|%s|\?")
+_STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_REPEATED_GROUPS_PATTERN = re.compile(r"\((\?[^()]*)\)(?:, \(\1\))+")
+_REPEATED_PARAMS_PATTERN = re.compile(r"\?(?:, \?)+")
+
+_statement_labels = set()
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape: literals and bind parameters become ?,
+    and multi-row VALUES lists or IN lists collapse to a single group, so every
+    execution of the same repository query shares one label.
+    """
+    normalized = _STRING_PATTERN.sub("?", statement)
+    normalized = _PARAM_PATTERN.sub("?", normalized)
+    normalized = _NUMBER_PATTERN.sub("?", normalized)
+    normalized = _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+    normalized = _REPEATED_GROUPS_PATTERN.sub(r"(\1)", normalized)
+    normalized = _REPEATED_PARAMS_PATTERN.sub("?, ...", normalized)
+    return normalized[:MAX_STATEMENT_LENGTH]
+
+
+def bind_shape(parameters: Any) -> Any:
+    """Describe bind parameters by type and size only, never by value."""
+    if isinstance(parameters, dict):
+        return {name: bind_shape(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: describe the first row
+            return f"{len(parameters)} x {bind_shape(parameters[0])}"
+        if len(parameters) > 10:
+            return f"{type(parameters).__name__}[{len(parameters)}]"
+        return [bind_shape(value) for value in parameters]
+    if isinstance(parameters, (str, bytes)):
+        return f"{type(parameters).__name__}[{len(parameters)}]"
+    return type(parameters).__name__
+
+
+def _statement_label(statement: str) -> str:
+    label = normalize_statement(statement)
+    if label not in _statement_labels:
+        if len(_statement_labels) >= MAX_STATEMENT_LABELS:
+            return "other"
+        _statement_labels.add(label)
+    return label
+
+
+class _TimedCheckoutMixin:
+    """Records how long each pool checkout waits, including connecting if needed."""
+    metrics_label = "db"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            registry.histogram(
+                "db_pool_checkout_wait_seconds", engine=self.metrics_label
+            ).observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def instrument_engine(engine: Engine, label: str, slow_query_ms: float = DB_SLOW_QUERY_MS) -> None:
+    """Attach statement timing and pool gauges to a (sync) engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        statement_label = _statement_label(statement)
+        registry.histogram(
+            "db_statement_seconds", engine=label, statement=statement_label
+        ).observe(elapsed)
+
+        if elapsed * 1000 >= slow_query_ms:
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms) on {label} engine: "
+                f"{statement_label} binds={bind_shape(parameters)}"
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+        registry.counter("db_statement_errors_total", engine=label).inc()
+
+    # Read through engine.pool so the gauges follow a pool recreated by dispose()
+    registry.gauge("db_pool_size", fn=lambda: engine.pool.size(), engine=label)
+    registry.gauge("db_pool_checked_out", fn=lambda: engine.pool.checkedout(), engine=label)
+    registry.gauge("db_pool_checked_in", fn=lambda: engine.pool.checkedin(), engine=label)
+    registry.gauge("db_pool_overflow", fn=lambda: max(engine.pool.overflow(), 0), engine=label)
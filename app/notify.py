@@ -0,0 +1,168 @@
+"""Cross-process change propagation over Postgres LISTEN/NOTIFY."""
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db import get_engine
+
+logger = logging.getLogger(__name__)
+
+STATE_CHANNEL = "wth_state"
+EVENTS_CHANNEL = "wth_events"
+ADMIN_CHANNEL = "wth_admins"
+# Events were written or removed in bulk, outside the API, so buffered copies are stale
+EVENTS_RELOAD_CHANNEL = "wth_events_reload"
+
+RECONNECT_DELAY_SECONDS = 1.0
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+_NOTIFY_STATEMENT = text(
+    "SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"
+)
+
+
+def notify(session: Session, channel: str, payloads: List[str]) -> None:
+    """
+    Queue notifications on the session's transaction. Postgres delivers them to
+    listeners only when the transaction commits, and drops them on rollback.
+    """
+    if payloads:
+        session.execute(_NOTIFY_STATEMENT, {"channel": channel, "payloads": payloads})
+
+
+def notify_committed(channel: str, payloads: List[str], engine: Engine = None) -> None:
+    """
+    Send notifications in a transaction of their own, for scripts announcing
+    work they have already committed.
+    """
+    with Session(engine or get_engine()) as session:
+        notify(session, channel, payloads)
+        session.commit()
+
+
+async def notify_async(session: AsyncSession, channel: str, payloads: List[str]) -> None:
+    """Async counterpart of notify for sessions on the async engine."""
+    if payloads:
+        await session.execute(_NOTIFY_STATEMENT, {"channel": channel, "payloads": payloads})
+
+
+class NotificationListener:
+    """
+    Holds one LISTEN connection per process and dispatches notifications to
+    handlers on the event loop. The connection's socket is watched by the loop
+    itself, so no thread or polling is involved. After a lost connection it
+    reconnects with backoff and runs the reconnect handlers, since anything
+    sent in between was missed.
+    """
+
+    def __init__(self, engine: Engine = None):
+        self.engine = engine or get_engine()
+        self._handlers: Dict[str, List[Callable[[str], None]]] = {}
+        self._reconnect_handlers: List[Callable[[], None]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connection = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    def add_handler(self, channel: str, handler: Callable[[str], None]) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def add_reconnect_handler(self, handler: Callable[[], None]) -> None:
+        self._reconnect_handlers.append(handler)
+
+    async def start(self) -> None:
+        if not self._handlers:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stopped = False
+        try:
+            await self._connect()
+        except Exception as e:
+            logger.error(f"Could not start notification listener: {e}", exc_info=True)
+            self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._close()
+
+    def _open_connection(self):
+        # A dedicated connection taken out of the pool for the life of the listener
+        pooled = self.engine.raw_connection()
+        pooled.detach()
+        connection = pooled.dbapi_connection
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            for channel in self._handlers:
+                cursor.execute(f'LISTEN "{channel}"')
+        return connection
+
+    async def _connect(self) -> None:
+        self._connection = await self._loop.run_in_executor(None, self._open_connection)
+        self._loop.add_reader(self._connection.fileno(), self._on_readable)
+        logger.info(f"Listening for notifications on {', '.join(self._handlers)}")
+
+    def _close(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            self._loop.remove_reader(self._connection.fileno())
+        except Exception:
+            pass
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+    def _on_readable(self) -> None:
+        try:
+            self._connection.poll()
+        except Exception as e:
+            logger.error(f"Notification listener connection lost: {e}")
+            self._close()
+            self._schedule_reconnect()
+            return
+
+        while self._connection.notifies:
+            notification = self._connection.notifies.pop(0)
+            for handler in self._handlers.get(notification.channel, []):
+                try:
+                    handler(notification.payload)
+                except Exception as e:
+                    logger.error(
+                        f"Error handling notification on {notification.channel}: {e}",
+                        exc_info=True
+                    )
+
+    def _schedule_reconnect(self) -> None:
+        if not self._stopped and self._reconnect_task is None:
+            self._reconnect_task = self._loop.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = RECONNECT_DELAY_SECONDS
+        while not self._stopped:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect()
+                break
+            except Exception as e:
+                logger.warning(f"Notification listener reconnect failed: {e}")
+                delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+        self._reconnect_task = None
+        if self._stopped:
+            return
+
+        for handler in self._reconnect_handlers:
+            try:
+                handler()
+            except Exception as e:
+                logger.error(f"Error in notification reconnect handler: {e}", exc_info=True)
+
+
+notification_listener = NotificationListener()
@@ -0,0 +1,125 @@
+"""Password hashing in a dedicated process pool, so PBKDF2 never runs on request threads."""
+import asyncio
+import base64
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from app.metrics import MetricsRegistry, registry
+from app.security import hash_password, verify_password
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_TIMEOUT_MS = int(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT_MS", "2000"))
+PASSWORD_HASH_NICENESS = 10
+
+# Verified against for unknown or inactive users, so they cost the same as real ones
+DUMMY_PASSWORD_HASH = "%s:%s" % (
+    base64.b64encode(os.urandom(32)).decode("utf-8"),
+    base64.b64encode(os.urandom(32)).decode("utf-8"),
+)
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when no hashing worker frees up before the queue timeout."""
+
+
+def _lower_priority() -> None:
+    # Hashing yields the CPU to request handling whenever both want it
+    if hasattr(os, "nice"):
+        os.nice(PASSWORD_HASH_NICENESS)
+
+
+def _warm_up() -> None:
+    pass
+
+
+class PasswordHashPool:
+    """
+    Runs hash_password and verify_password in worker processes. At most
+    `workers` run at once; callers wait for a slot for up to queue_timeout
+    and then get PasswordPoolBusy, so a login flood is shed instead of
+    queueing without bound or taking CPU from the rest of the app.
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        queue_timeout: float = PASSWORD_HASH_QUEUE_TIMEOUT_MS / 1000,
+        metrics: MetricsRegistry = registry,
+    ):
+        self.workers = max(workers, 1)
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Created on first use so it belongs to the serving event loop
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+
+        metrics.gauge("password_hash_waiting", fn=lambda: self._waiting)
+        metrics.gauge("password_hash_running", fn=lambda: self._running)
+        self._rejected = metrics.counter("password_hash_rejected_total")
+        self._wait_latency = metrics.histogram("password_hash_wait_seconds")
+        self._run_latency = metrics.histogram("password_hash_run_seconds")
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process with a running event loop and open connections is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_lower_priority,
+            )
+        return self._executor
+
+    async def start(self) -> None:
+        """Spawn the workers up front so the first logins do not pay for it."""
+        executor = self._ensure_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm_up) for _ in range(self.workers)))
+        logger.info(f"Password hashing pool started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+        self._slots = None
+
+    async def _run(self, fn, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        slots = self._slots
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected.inc()
+            raise PasswordPoolBusy(f"No password hashing worker free within {self.queue_timeout:g}s")
+        finally:
+            self._waiting -= 1
+
+        running_started = time.perf_counter()
+        self._wait_latency.observe(running_started - started)
+        self._running += 1
+        try:
+            executor = self._ensure_executor()
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            self._running -= 1
+            slots.release()
+            self._run_latency.observe(time.perf_counter() - running_started)
+
+    async def hash_password(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify_password(self, password: str, password_hash: Optional[str]) -> bool:
+        """Verify a password; with no hash, spend the same effort and return False."""
+        valid = await self._run(verify_password, password, password_hash or DUMMY_PASSWORD_HASH)
+        return valid and password_hash is not None
+
+
+password_pool = PasswordHashPool()
@@ -4,6 +4,7 @@ import hmac
 import hashlib
 import base64
 import json
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
@@ -52,8 +53,12 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
+@lru_cache(maxsize=1)
 def get_secret_key() -> bytes:
-    """Get the secret key for token signing from environment variable."""
+    """
+    Get the secret key for token signing from environment variable.
+    Parsed once per process; changing the key requires a restart.
+    """
     secret = os.getenv("ADMIN_SECRET_KEY")
     if not secret:
         raise ValueError(
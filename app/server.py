@@ -1,13 +1,29 @@
 import logging
 import os
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Request, Response
 from app.api.v1.events import events_controller
 from app.api.v1.state import state_controller
 from app.api.v1.admin import admin_controller
 from app.api.v1.webrtc import webrtc_controller
-from app.db import init_db
+from app.api.v1.metrics import metrics_controller
+from app.api.v1.camera import camera_controller
+from app.api.v1.camera.camera_snapshot import frame_cache, frame_source
+from app.api.v1.events.dependencies import get_ingest_queue
+from app.api.v1.state.state_broadcaster import state_broadcaster
+from app.api.v1.state.state_cache import state_cache
+from app.api.v1.state.state_service import apply_state_notification
+from app.api.v1.admin.admin_cache import admin_session_cache, apply_admin_notification
+from app.api.v1.events.events_recent import (
+    recent_events, apply_events_notification, apply_events_reload_notification
+)
+from app.notify import (
+    notification_listener, STATE_CHANNEL, EVENTS_CHANNEL, EVENTS_RELOAD_CHANNEL, ADMIN_CHANNEL
+)
+from app.api.v1.webrtc.webrtc_sessions import whep_sessions
+from app.api.v1.webrtc.webrtc_upstream import mediamtx_client
+from app.password_pool import password_pool
+from app.static_assets import StaticAssets, asset_response
+from app.db import init_db, get_async_engine
 
 logger = logging.getLogger("server")
 logger.setLevel(logging.DEBUG)
@@ -16,6 +32,11 @@ v1_prefix = "/api/v1"
 app = FastAPI()
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CLIENT_DIR = os.path.join(BASE_DIR, "client")
+static_assets = StaticAssets(CLIENT_DIR)
+
+@app.on_event("startup")
+def build_static_assets():
+    static_assets.build()
 
 @app.on_event("startup")
 def on_startup():
@@ -23,16 +44,107 @@ def on_startup():
     init_db()
     logger.info("Database initialized successfully")
 
+@app.on_event("startup")
+async def start_state_broadcaster():
+    await state_broadcaster.start()
+
+@app.on_event("shutdown")
+async def stop_state_broadcaster():
+    await state_broadcaster.stop()
+
+@app.on_event("startup")
+async def start_notification_listener():
+    notification_listener.add_handler(STATE_CHANNEL, apply_state_notification)
+    # Notifications missed while disconnected would leave the cache stale
+    notification_listener.add_reconnect_handler(state_cache.invalidate)
+    notification_listener.add_handler(ADMIN_CHANNEL, apply_admin_notification)
+    notification_listener.add_reconnect_handler(admin_session_cache.invalidate)
+    notification_listener.add_handler(EVENTS_CHANNEL, apply_events_notification)
+    notification_listener.add_handler(EVENTS_RELOAD_CHANNEL, apply_events_reload_notification)
+    notification_listener.add_reconnect_handler(recent_events.schedule_reload)
+    await notification_listener.start()
+
+# After the listener, so events committed while loading arrive by NOTIFY
+@app.on_event("startup")
+async def load_recent_events():
+    await recent_events.reload()
+
+@app.on_event("shutdown")
+async def stop_notification_listener():
+    await notification_listener.stop()
+
+@app.on_event("startup")
+async def start_ingest_queue():
+    ingest_queue = await get_ingest_queue()
+    if ingest_queue:
+        await ingest_queue.start()
+
+@app.on_event("shutdown")
+async def stop_ingest_queue():
+    ingest_queue = await get_ingest_queue()
+    if ingest_queue:
+        logger.info(f"Flushing {ingest_queue.depth} queued events...")
+        await ingest_queue.stop()
+
+@app.on_event("startup")
+async def start_password_pool():
+    await password_pool.start()
+
+@app.on_event("shutdown")
+async def stop_password_pool():
+    await password_pool.stop()
+
+@app.on_event("startup")
+async def start_whep_session_reaper():
+    await whep_sessions.start()
+
+@app.on_event("shutdown")
+async def stop_whep_session_reaper():
+    await whep_sessions.stop()
+
+@app.on_event("startup")
+async def start_mediamtx_client():
+    await mediamtx_client.start()
+
+@app.on_event("shutdown")
+async def stop_mediamtx_client():
+    await mediamtx_client.stop()
+
+@app.on_event("startup")
+async def start_frame_source():
+    if frame_source:
+        await frame_source.start(frame_cache)
+    elif int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+        logger.warning("CAMERA_SNAPSHOT_FILE is not set, so camera frames pushed to one worker "
+                       "are not served by the others")
+
+@app.on_event("shutdown")
+async def stop_frame_source():
+    if frame_source:
+        await frame_source.stop()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await get_async_engine().dispose()
+
 app.include_router(events_controller.router, prefix=v1_prefix)
 app.include_router(state_controller.router, prefix=v1_prefix)
 app.include_router(admin_controller.router, prefix=f"{v1_prefix}/admin")
+app.include_router(metrics_controller.router, prefix=v1_prefix)
 app.include_router(webrtc_controller.router)
-app.mount("/static", StaticFiles(directory=CLIENT_DIR), name="static")
+app.include_router(camera_controller.router)
+
+@app.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+async def serve_static(path: str, request: Request) -> Response:
+    asset = static_assets.asset(path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return asset_response(request, asset)
 
-@app.get("/", response_class=FileResponse)
-async def serve_home():
-    return FileResponse(os.path.join(CLIENT_DIR, "index.html"))
+@app.api_route("/", methods=["GET", "HEAD"])
+async def serve_home(request: Request) -> Response:
+    return asset_response(request, static_assets.page("index.html"))
 
-@app.get("/admin", response_class=FileResponse)
-async def serve_admin():
-    return FileResponse(os.path.join(CLIENT_DIR, "admin.html"))
+@app.api_route("/admin", methods=["GET", "HEAD"])
+async def serve_admin(request: Request) -> Response:
+    return asset_response(request, static_assets.page("admin.html"))
@@ -0,0 +1,174 @@
+"""Fingerprinted, precompressed client assets held in memory and served with long-lived caching."""
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from fastapi import Request, Response, status
+from app.http_cache import etag_matches
+
+# Listed in requirements.txt; without it assets are precompressed with gzip only
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Fingerprinted URLs never change content, so they may be cached for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Pages and unfingerprinted URLs are revalidated on every use
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+# Below this, compression saves less than the header overhead
+MIN_COMPRESS_BYTES = 256
+
+_STATIC_REFERENCE = re.compile(r'((?:href|src)=")/static/([^"?#]+)(")')
+
+
+@dataclass
+class Asset:
+    content: bytes
+    media_type: str
+    etag: str
+    cache_control: str
+    # Precompressed bodies by content coding
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+
+def fingerprint(path: str, content: bytes) -> str:
+    """js/app.js -> js/app.<hash>.js"""
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest}{ext}"
+
+
+def _media_type(path: str) -> str:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type == "application/javascript":
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+def _compress(content: bytes, media_type: str) -> Dict[str, bytes]:
+    if len(content) < MIN_COMPRESS_BYTES or not media_type.startswith(COMPRESSIBLE_TYPES):
+        return {}
+    encoded = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(content, quality=11)
+    # Keep only codings that actually make the body smaller
+    return {coding: body for coding, body in encoded.items() if len(body) < len(content)}
+
+
+def _accepted_codings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    codings = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        codings[coding.strip().lower()] = quality
+    return codings
+
+
+class StaticAssets:
+    """
+    Loads the client directory into memory once. Every asset other than HTML
+    pages gets a content-hashed URL under /static/ and is precompressed with
+    gzip and brotli (gzip only if the brotli package is missing, which the
+    build log line shows). Pages have their /static/ references rewritten to
+    those URLs, so a deploy changes the URLs of exactly the assets that
+    changed.
+    """
+
+    def __init__(self, directory: str, url_prefix: str = "/static"):
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self._assets: Dict[str, Asset] = {}
+        self._pages: Dict[str, Asset] = {}
+        self._urls: Dict[str, str] = {}
+
+    def _add(self, content: bytes, media_type: str, cache_control: str) -> Asset:
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        return Asset(
+            content=content,
+            media_type=media_type,
+            etag=f'"{digest}"',
+            cache_control=cache_control,
+            encoded=_compress(content, media_type),
+        )
+
+    def build(self) -> None:
+        assets, pages, urls = {}, {}, {}
+        html_files = []
+        for root, _, files in os.walk(self.directory):
+            for name in sorted(files):
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                if name.endswith(".html"):
+                    html_files.append(path)
+                    continue
+                with open(full_path, "rb") as f:
+                    content = f.read()
+                media_type = _media_type(path)
+                hashed_path = fingerprint(path, content)
+                assets[hashed_path] = self._add(content, media_type, IMMUTABLE_CACHE_CONTROL)
+                # Old or hand-written references keep working, but must revalidate
+                assets[path] = self._add(content, media_type, REVALIDATE_CACHE_CONTROL)
+                urls[path] = f"{self.url_prefix}/{hashed_path}"
+
+        def rewrite(match: re.Match) -> str:
+            return match.group(1) + urls.get(match.group(2), f"{self.url_prefix}/{match.group(2)}") + match.group(3)
+
+        for path in html_files:
+            with open(os.path.join(self.directory, path), "r", encoding="utf-8") as f:
+                html = _STATIC_REFERENCE.sub(rewrite, f.read())
+            pages[path] = self._add(html.encode("utf-8"), "text/html; charset=utf-8", REVALIDATE_CACHE_CONTROL)
+
+        self._assets, self._pages, self._urls = assets, pages, urls
+        logger.info(f"Built {len(urls)} static assets and {len(pages)} pages "
+                    f"({'gzip, br' if brotli else 'gzip'})")
+
+    def url_for(self, path: str) -> str:
+        return self._urls.get(path, f"{self.url_prefix}/{path}")
+
+    def asset(self, path: str) -> Optional[Asset]:
+        return self._assets.get(path)
+
+    def page(self, path: str) -> Optional[Asset]:
+        return self._pages.get(path)
+
+
+def asset_response(request: Request, asset: Asset) -> Response:
+    """
+    Serve an asset in the best coding the client accepts. Each coding has its
+    own ETag, and a matching If-None-Match gets an empty 304.
+    """
+    accepted = _accepted_codings(request.headers.get("accept-encoding"))
+    coding = None
+    for candidate in ("br", "gzip"):
+        if candidate in asset.encoded and accepted.get(candidate, 0) > 0:
+            coding = candidate
+            break
+
+    etag = asset.etag if coding is None else f'{asset.etag[:-1]}-{coding}"'
+    headers = {"ETag": etag, "Cache-Control": asset.cache_control}
+    if asset.encoded:
+        headers["Vary"] = "Accept-Encoding"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    body = asset.content if coding is None else asset.encoded[coding]
+    return Response(content=body, media_type=asset.media_type, headers=headers)
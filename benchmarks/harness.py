@@ -0,0 +1,131 @@
+"""Load generation, latency statistics and baseline comparison for the benchmark suite."""
+import asyncio
+import math
+import time
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+# A request function returns the response; anything but an expected status counts as an error
+RequestFn = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+@dataclass
+class Scenario:
+    name: str
+    request: RequestFn
+    expected_status: tuple = (200,)
+    # Caps the request count for inherently slow scenarios
+    requests: Optional[int] = None
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int, warmup: int
+) -> ScenarioResult:
+    """
+    Issue `requests` requests from `concurrency` workers, after `warmup`
+    unmeasured ones, and summarize per-request latency.
+    """
+    for i in range(warmup):
+        await scenario.request(client, i)
+
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                response = await scenario.request(client, warmup + i)
+                ok = response.status_code in scenario.expected_status
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    to_ms = 1000
+    return ScenarioResult(
+        requests=requests,
+        errors=errors,
+        throughput_rps=round(requests / elapsed, 1),
+        mean_ms=round(sum(latencies) / len(latencies) * to_ms, 3),
+        p50_ms=round(percentile(latencies, 0.50) * to_ms, 3),
+        p95_ms=round(percentile(latencies, 0.95) * to_ms, 3),
+        p99_ms=round(percentile(latencies, 0.99) * to_ms, 3),
+        max_ms=round(latencies[-1] * to_ms, 3),
+    )
+
+
+def result_to_dict(result: ScenarioResult) -> Dict:
+    return asdict(result)
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float
+) -> List[str]:
+    """
+    Regressions against the baseline: p95 latency up, or throughput down, by
+    more than `threshold` (0.2 = 20%). Scenarios missing on either side are skipped.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{name}: {current['errors']} errors (baseline {previous.get('errors', 0)})")
+        if current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.2f} ms vs baseline {previous['p95_ms']:.2f} ms"
+            )
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {current['throughput_rps']:.0f} req/s vs baseline {previous['throughput_rps']:.0f} req/s"
+            )
+    return regressions
+
+
+def format_table(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None) -> str:
+    header = f"{'scenario':<40} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    if baseline:
+        header += f" {'Δp95':>8}"
+    lines = [header, "-" * len(header)]
+    for name, result in results.items():
+        line = (
+            f"{name:<40} {result['throughput_rps']:>9.1f} {result['p50_ms']:>9.2f} "
+            f"{result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['errors']:>7}"
+        )
+        previous = (baseline or {}).get(name)
+        if previous and previous["p95_ms"]:
+            line += f" {(result['p95_ms'] / previous['p95_ms'] - 1) * 100:>+7.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Replay an event stream against POST /api/v1/events at accelerated speed, one
+concurrent sender per device, and measure how long each event takes to show
+up as the current state.
+
+Sources: an export or archive file (.ndjson, .ndjson.gz, .csv) or a
+synthetic multi-device stream. Timestamps are rebased so that the replay
+starts now and compressed by --speed, so every event is newer than the
+current state when it is sent.
+
+    python benchmarks/replay_events.py --synthetic 20000 --devices 50 --speed 600 --in-process
+    python benchmarks/replay_events.py --input archive/events/events_2025_01.ndjson.gz --speed 3600 \\
+        --url http://localhost:8000
+
+Exits non-zero if the final state does not match the newest event sent.
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+import asyncio
+import csv
+import gzip
+import logging
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from benchmarks.harness import percentile
+from scripts.generate_events import DeviceCycle, CONFIDENCE
+from app.api.v1.events.events_model import Event
+
+
+def load_events(path: str) -> List[Event]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        if ".csv" in path:
+            return [Event.model_validate(row) for row in csv.DictReader(f)]
+        return [Event.model_validate_json(line) for line in f if line.strip()]
+
+
+def synthetic_events(count: int, devices: int, span_seconds: float, seed: Optional[int]) -> List[Event]:
+    rng = random.Random(seed)
+    cycles = [DeviceCycle(rng) for _ in range(devices)]
+    ticks = max(count // devices, 1)
+    tick_seconds = span_seconds / ticks
+    start = datetime.now()
+    events = []
+    for n in range(count):
+        tick, device_index = divmod(n, devices)
+        state = cycles[device_index].next_state()
+        low, high = CONFIDENCE[state]
+        events.append(Event(
+            event_id=f"synthetic-{n}",
+            source_device_id=f"camera_{device_index + 1:03d}",
+            bridge_state=state,
+            bridge_confidence=round(low + rng.random() * (high - low), 2),
+            timestamp=start + timedelta(seconds=tick * tick_seconds + rng.random() * tick_seconds / 4),
+        ))
+    return events
+
+
+def retime(events: List[Event], speed: float, start: datetime) -> List[Event]:
+    """
+    Rebase and compress timestamps so the replay starts at `start` and each
+    event's timestamp is the moment it is due to be sent. Event ids are made
+    unique to this run so replays never collide with stored events.
+    """
+    events = sorted(events, key=lambda event: event.timestamp)
+    first = events[0].timestamp
+    run_id = uuid.uuid4().hex[:8]
+    return [
+        event.model_copy(update={
+            "event_id": f"replay-{run_id}-{n}",
+            "timestamp": start + (event.timestamp - first) / speed,
+        })
+        for n, event in enumerate(events)
+    ]
+
+
+class ReplayStats:
+    def __init__(self):
+        self.sent_at: Dict[str, float] = {}
+        self.send_latencies: List[float] = []
+        self.state_latencies: List[float] = []
+        self.statuses: Dict[int, int] = {}
+        self.errors = 0
+        self.late_sends = 0
+
+    def observe_state(self, event_id: str) -> None:
+        sent_at = self.sent_at.pop(event_id, None)
+        if sent_at is not None:
+            self.state_latencies.append(time.perf_counter() - sent_at)
+
+
+def _state_ids(message: str) -> List[str]:
+    """Event ids of the state messages in a chunk of Server-Sent Events text."""
+    return [line[4:].strip() for line in message.splitlines() if line.startswith("id: ")]
+
+
+async def observe_in_process(stats: ReplayStats, ready: asyncio.Event) -> None:
+    # Subscribing directly avoids the HTTP transport, which buffers whole responses in-process
+    from app.api.v1.state.state_broadcaster import state_broadcaster
+    queue = state_broadcaster.subscribe()
+    ready.set()
+    try:
+        while True:
+            message = await queue.get()
+            if message is None:
+                return
+            for event_id in _state_ids(message.decode("utf-8")):
+                stats.observe_state(event_id)
+    finally:
+        state_broadcaster.unsubscribe(queue)
+
+
+async def observe_stream(client: httpx.AsyncClient, stats: ReplayStats, ready: asyncio.Event) -> None:
+    async with client.stream("GET", "/api/v1/state/stream", timeout=None) as response:
+        ready.set()
+        async for line in response.aiter_lines():
+            for event_id in _state_ids(line):
+                stats.observe_state(event_id)
+
+
+async def send_device_events(
+    client: httpx.AsyncClient, events: List[Event], run_started: float, speed_start: datetime, stats: ReplayStats
+) -> None:
+    """One simulated device: send its events in order, each at its scheduled time."""
+    for event in events:
+        delay = (event.timestamp - speed_start).total_seconds() - (time.perf_counter() - run_started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            stats.late_sends += 1
+        started = time.perf_counter()
+        stats.sent_at[event.event_id] = started
+        try:
+            response = await client.post("/api/v1/events", json=event.model_dump(mode="json"))
+            stats.statuses[response.status_code] = stats.statuses.get(response.status_code, 0) + 1
+            if response.status_code not in (200, 202):
+                stats.errors += 1
+                stats.sent_at.pop(event.event_id, None)
+        except Exception:
+            stats.errors += 1
+            stats.sent_at.pop(event.event_id, None)
+        stats.send_latencies.append(time.perf_counter() - started)
+
+
+@asynccontextmanager
+async def open_client(args) -> AsyncIterator[httpx.AsyncClient]:
+    timeout = httpx.Timeout(30.0)
+    if not args.in_process:
+        limits = httpx.Limits(max_connections=args.max_connections)
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+            yield client
+        return
+
+    from app.server import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=timeout) as client:
+            yield client
+
+
+def summarize(name: str, values: List[float]) -> str:
+    values = sorted(values)
+    if not values:
+        return f"{name}: no samples"
+    return (
+        f"{name}: p50 {percentile(values, 0.5) * 1000:.1f} ms, p95 {percentile(values, 0.95) * 1000:.1f} ms, "
+        f"p99 {percentile(values, 0.99) * 1000:.1f} ms, max {values[-1] * 1000:.1f} ms ({len(values)} samples)"
+    )
+
+
+async def replay(args) -> bool:
+    if args.input:
+        events = load_events(args.input)
+    else:
+        events = synthetic_events(args.synthetic, args.devices, args.span_seconds, args.seed)
+    if not events:
+        print("❌ Error: no events to replay")
+        return False
+
+    speed_start = datetime.now() + timedelta(seconds=1)
+    events = retime(events, args.speed, speed_start)
+    by_device: Dict[str, List[Event]] = {}
+    for event in events:
+        by_device.setdefault(event.source_device_id, []).append(event)
+    duration = (events[-1].timestamp - events[0].timestamp).total_seconds()
+    print(f"▶️  Replaying {len(events):,} events from {len(by_device)} devices over {duration:.1f}s "
+          f"({len(events) / max(duration, 0.001):,.0f} events/s at {args.speed:g}x)\n")
+
+    stats = ReplayStats()
+    async with open_client(args) as client:
+        ready = asyncio.Event()
+        if args.in_process:
+            observer = asyncio.create_task(observe_in_process(stats, ready))
+        else:
+            observer = asyncio.create_task(observe_stream(client, stats, ready))
+        await asyncio.wait_for(ready.wait(), timeout=10)
+
+        run_started = time.perf_counter() - (datetime.now() - speed_start).total_seconds()
+        sending_started = time.perf_counter()
+        await asyncio.gather(*(
+            send_device_events(client, device_events, run_started, speed_start, stats)
+            for device_events in by_device.values()
+        ))
+        sending_elapsed = time.perf_counter() - sending_started
+
+        # Let queued ingestion and notifications catch up
+        newest = events[-1]
+        deadline = time.perf_counter() + args.settle_seconds
+        while time.perf_counter() < deadline and newest.event_id in stats.sent_at:
+            await asyncio.sleep(0.05)
+
+        state = (await client.get("/api/v1/state")).json()
+        observer.cancel()
+
+    sent = sum(stats.statuses.values())
+    print(f"📤 Sent {sent:,} events in {sending_elapsed:.1f}s ({sent / sending_elapsed:,.0f}/s), "
+          f"{stats.errors} errors, {stats.late_sends} sent behind schedule")
+    print(f"   statuses: {dict(sorted(stats.statuses.items()))}")
+    print(f"   {summarize('POST /events', stats.send_latencies)}")
+    print(f"   {summarize('ingest → state', stats.state_latencies)}")
+    print(f"   {len(stats.sent_at)} accepted events never became the current state "
+          f"(superseded by a newer event before they were applied)")
+
+    matches = state.get("last_event_id") == newest.event_id and state.get("bridge_state") == newest.bridge_state.value
+    if matches:
+        print(f"\n✅ Final state matches the newest event ({newest.bridge_state.value}, {newest.event_id})")
+    else:
+        print(f"\n❌ Final state {state} does not match the newest event {newest.event_id}")
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay events against the ingest API")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="events file: .ndjson, .ndjson.gz or .csv")
+    source.add_argument("--synthetic", type=int, help="number of synthetic events to generate")
+    parser.add_argument("--devices", type=int, default=20, help="synthetic: number of devices")
+    parser.add_argument("--span-seconds", type=float, default=3600, help="synthetic: recorded time span")
+    parser.add_argument("--seed", type=int, default=None, help="synthetic: random seed")
+    parser.add_argument("--speed", type=float, default=60, help="speed-up factor over recorded time")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://localhost:8000", help="base URL of a running server")
+    target.add_argument("--in-process", action="store_true", help="drive the ASGI app in this process")
+    parser.add_argument("--max-connections", type=int, default=100, help="HTTP connection limit")
+    parser.add_argument("--settle-seconds", type=float, default=10, help="wait for the newest event to land")
+    args = parser.parse_args()
+
+    # Keep the app's own warnings (e.g. slow queries) from burying the report
+    logging.basicConfig(level=logging.ERROR)
+    if not asyncio.run(replay(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the API hot paths. Drives the ASGI app in-process through
+httpx against the Postgres named by DATABASE_URL, so results cover the full
+request path (routing, validation, services, database) without network noise.
+
+The database is written to: events are generated up to each table size and
+a "benchmark" admin user is created. Point DATABASE_URL at a scratch database.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.25
+
+With --baseline the run exits non-zero when any scenario's p95 latency rises,
+or its throughput falls, by more than the threshold.
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import text
+
+from benchmarks.harness import Scenario, run_scenario, result_to_dict, compare, format_table
+from scripts.generate_events import generate_chunks, COPY_STATEMENT
+from app.api.v1.admin.admin_model import AdminRole
+from app.api.v1.admin.admin_repository import AdminRepository
+from app.api.v1.events.events_partition_repository import EventsPartitionRepository, add_months, month_start
+from app.db import get_engine
+from app.security import hash_password
+
+BENCHMARK_USERNAME = "benchmark"
+BENCHMARK_PASSWORD = "benchmark-password"
+DEVICE_COUNT = 5
+HISTORY_DAYS = 180
+
+
+def count_events() -> int:
+    with get_engine().connect() as connection:
+        return connection.execute(text("SELECT count(*) FROM events")).scalar()
+
+
+def top_up_events(target: int) -> None:
+    """Generate events until the table holds at least `target` rows, then refresh planner statistics."""
+    missing = target - count_events()
+    if missing <= 0:
+        return
+    print(f"   generating {missing:,} events to reach {target:,}...")
+    engine = get_engine()
+    end = datetime.now() - timedelta(minutes=1)
+    start = end - timedelta(days=HISTORY_DAYS)
+    partitions = EventsPartitionRepository(engine)
+    if partitions.is_partitioned():
+        partitions.ensure_partitions(start, add_months(month_start(end), 1))
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for buffer, _, _ in generate_chunks(missing, DEVICE_COUNT, start, end, 100_000, seed=target):
+            buffer.seek(0)
+            cursor.copy_expert(COPY_STATEMENT, buffer)
+            connection.commit()
+        cursor.execute("ANALYZE events")
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def ensure_benchmark_admin() -> None:
+    repository = AdminRepository()
+    if repository.get_by_username(BENCHMARK_USERNAME) is None:
+        repository.create_admin(BENCHMARK_USERNAME, hash_password(BENCHMARK_PASSWORD), AdminRole.ADMIN)
+
+
+def new_event(i: int) -> dict:
+    return {
+        "event_id": f"benchmark-{uuid.uuid4().hex}",
+        "source_device_id": f"camera_{i % DEVICE_COUNT + 1:03d}",
+        "bridge_state": "OPEN" if i % 2 else "CLOSED",
+        "bridge_confidence": 0.95,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def events_scenarios(size: int):
+    label = f"[{size:,} rows]"
+    return [
+        Scenario(
+            f"GET /events {label}",
+            lambda client, i: client.get("/api/v1/events", params={"limit": 100}),
+        ),
+        Scenario(
+            f"GET /events limit=1000 {label}",
+            lambda client, i: client.get("/api/v1/events", params={"limit": 1000}),
+        ),
+        Scenario(
+            f"GET /events recent=100 {label}",
+            lambda client, i: client.get("/api/v1/events", params={"recent": 100}),
+        ),
+        Scenario(
+            f"GET /events by device {label}",
+            lambda client, i: client.get("/api/v1/events", params={
+                "source_device_id": f"camera_{i % DEVICE_COUNT + 1:03d}", "limit": 100
+            }),
+        ),
+        Scenario(
+            f"GET /events OPEN >=0.9 {label}",
+            lambda client, i: client.get("/api/v1/events", params={
+                "bridge_state": "OPEN", "min_confidence": 0.9, "limit": 100
+            }),
+        ),
+    ]
+
+
+def request_scenarios(etag: str):
+    login = {"username": BENCHMARK_USERNAME, "password": BENCHMARK_PASSWORD}
+    return [
+        Scenario(
+            "POST /events",
+            lambda client, i: client.post("/api/v1/events", json=new_event(i)),
+            expected_status=(200, 202),
+        ),
+        Scenario("GET /state", lambda client, i: client.get("/api/v1/state")),
+        Scenario(
+            "GET /state (If-None-Match)",
+            lambda client, i: client.get("/api/v1/state", headers={"If-None-Match": etag}),
+            expected_status=(200, 304),
+        ),
+        Scenario("GET /admin/me", lambda client, i: client.get("/api/v1/admin/me")),
+        # Password hashing is deliberately slow, so login gets fewer requests
+        Scenario(
+            "POST /admin/login",
+            lambda client, i: client.post("/api/v1/admin/login", json=login),
+            requests=50,
+        ),
+    ]
+
+
+def selected(scenario: Scenario, patterns) -> bool:
+    return not patterns or any(pattern.lower() in scenario.name.lower() for pattern in patterns)
+
+
+async def run(args) -> dict:
+    from app.server import app
+    from app.api.v1.admin.admin_throttle import login_throttle
+    from app.api.v1.events.events_recent import recent_events
+
+    # The login scenario measures password checking, not the attempt throttle
+    login_throttle.usernames.limit = login_throttle.ips.limit = sys.maxsize
+    results = {}
+
+    async def measure(scenario: Scenario, client: httpx.AsyncClient):
+        if not selected(scenario, args.scenarios):
+            return
+        requests = min(scenario.requests or args.requests, args.requests)
+        result = await run_scenario(client, scenario, requests, args.concurrency, args.warmup)
+        results[scenario.name] = result_to_dict(result)
+        print(f"   {scenario.name}: p50 {result.p50_ms:.2f} ms, p95 {result.p95_ms:.2f} ms, "
+              f"{result.throughput_rps:.0f} req/s, {result.errors} errors")
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            ensure_benchmark_admin()
+            response = await client.post("/api/v1/admin/login", json={
+                "username": BENCHMARK_USERNAME, "password": BENCHMARK_PASSWORD
+            })
+            response.raise_for_status()
+
+            for size in args.table_sizes:
+                print(f"\n📦 Table size {size:,}")
+                await asyncio.to_thread(top_up_events, size)
+                # Seeded rows bypass NOTIFY, so the recent events buffer has not seen them
+                await recent_events.reload()
+                for scenario in events_scenarios(size):
+                    await measure(scenario, client)
+
+            print("\n⚡ Request paths")
+            etag = (await client.get("/api/v1/state")).headers.get("ETag", "")
+            for scenario in request_scenarios(etag):
+                await measure(scenario, client)
+
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API hot paths")
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent in-flight requests")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per scenario")
+    parser.add_argument("--table-sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=[10_000, 100_000, 1_000_000], help="comma-separated events table sizes")
+    parser.add_argument("--scenarios", nargs="*", help="only run scenarios whose name contains one of these")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", help="write results JSON here as the new baseline")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run(args))
+
+    document = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "scenarios": results,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(document, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+
+    print("\n" + format_table(results, baseline))
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Script to archive and drop events partitions older than the retention period."""
+
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import gzip
+from datetime import datetime
+from app.api.v1.events.events_partition_repository import (
+    EventsPartitionRepository, month_start, add_months
+)
+from app.db import init_db
+from app.notify import notify_committed, EVENTS_RELOAD_CHANNEL
+
+def export_partition(repository: EventsPartitionRepository, name: str, archive_dir: str) -> int:
+    """Write a partition to <archive_dir>/<name>.ndjson.gz, one event per line."""
+    path = os.path.join(archive_dir, f"{name}.ndjson.gz")
+    partial_path = f"{path}.partial"
+    rows = 0
+    with gzip.open(partial_path, "wt", encoding="utf-8") as archive:
+        for event in repository.stream_partition(name):
+            archive.write(event.model_dump_json())
+            archive.write("\n")
+            rows += 1
+    # Only a complete file ever carries the final name
+    os.replace(partial_path, path)
+    return rows
+
+def archive_events():
+    """Export each expired monthly partition to compressed NDJSON, then drop it."""
+    
+    retention_months = int(os.getenv("EVENTS_RETENTION_MONTHS", "12"))
+    archive_dir = os.getenv("EVENTS_ARCHIVE_DIR", "archive/events")
+    os.makedirs(archive_dir, exist_ok=True)
+    
+    init_db()
+    repository = EventsPartitionRepository()
+    if not repository.is_partitioned():
+        print("❌ Error: events table is not partitioned; run scripts/migrate_events_partitions.py first")
+        sys.exit(1)
+    
+    cutoff = add_months(month_start(datetime.now()), -retention_months)
+    print(f"🗄️  Archiving events partitions before {cutoff.strftime('%Y-%m')} to {archive_dir}\n")
+    
+    archived = 0
+    for name, month in repository.get_partitions():
+        if month >= cutoff:
+            continue
+        try:
+            rows = export_partition(repository, name, archive_dir)
+            repository.drop_partition(name, expected_rows=rows)
+            archived += 1
+            print(f"✅ {name}: {rows} events archived and partition dropped")
+        except Exception as e:
+            if archived:
+                notify_committed(EVENTS_RELOAD_CHANNEL, ["archived"])
+            print(f"❌ Failed to archive {name}: {str(e)}")
+            sys.exit(1)
+    
+    if archived:
+        # Running servers may still be serving events from the dropped partitions
+        notify_committed(EVENTS_RELOAD_CHANNEL, ["archived"])
+    
+    print(f"\n✨ Archived {archived} partitions")
+
+
+if __name__ == "__main__":
+    archive_events()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Script to rebuild the hourly and daily event rollups from the events table."""
+
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import time
+from app.api.v1.events.events_rollup_repository import EventRollupRepository
+from app.db import init_db
+
+def backfill_rollups():
+    """Recompute every rollup row from the full event history."""
+    
+    # Create the rollup tables if this database predates them
+    init_db()
+    
+    print("🔄 Rebuilding event rollups...\n")
+    started = time.perf_counter()
+    try:
+        written = EventRollupRepository().rebuild()
+    except Exception as e:
+        print(f"❌ Failed to rebuild rollups: {str(e)}")
+        sys.exit(1)
+    
+    for bucket, rows in written.items():
+        print(f"✅ {bucket.value}: {rows} rollup rows")
+    print(f"\n✨ Rollups rebuilt in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    backfill_rollups()
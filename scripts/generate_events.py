@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Script to bulk-load synthetic bridge events for scale and query-plan testing."""
+
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+import io
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from app.api.v1.events.events_model import Event, BridgeState
+from app.api.v1.events.events_partition_repository import EventsPartitionRepository, add_months, month_start
+from app.api.v1.events.events_rollup_repository import EventRollupRepository
+from app.api.v1.state.state_repository import StateRepository
+from app.api.v1.state.state_service import state_from_event
+from app.db import get_engine, init_db
+from app.notify import notify_committed, EVENTS_RELOAD_CHANNEL
+
+# One bridge cycle, with how many consecutive readings each state lasts
+CYCLE = [
+    (BridgeState.CLOSED, (6, 30)),
+    (BridgeState.OPENING, (1, 3)),
+    (BridgeState.OPEN, (3, 15)),
+    (BridgeState.CLOSING, (1, 3)),
+]
+
+# Same confidence ranges as scripts/seed_events.py
+CONFIDENCE = {
+    BridgeState.CLOSED: (0.85, 0.99),
+    BridgeState.OPEN: (0.85, 0.99),
+    BridgeState.OPENING: (0.65, 0.85),
+    BridgeState.CLOSING: (0.65, 0.85),
+    BridgeState.UNKNOWN: (0.30, 0.60),
+}
+
+# Share of readings where the camera could not tell
+UNKNOWN_RATE = 0.01
+
+COPY_STATEMENT = (
+    "COPY events (event_id, source_device_id, bridge_state, bridge_confidence, timestamp) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+
+class DeviceCycle:
+    """Walks one device through CLOSED→OPENING→OPEN→CLOSING, starting at a random point."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.phase = rng.randrange(len(CYCLE))
+        self.remaining = self._duration()
+
+    def _duration(self) -> int:
+        return self.rng.randint(*CYCLE[self.phase][1])
+
+    def next_state(self) -> BridgeState:
+        if self.remaining == 0:
+            self.phase = (self.phase + 1) % len(CYCLE)
+            self.remaining = self._duration()
+        self.remaining -= 1
+        if self.rng.random() < UNKNOWN_RATE:
+            return BridgeState.UNKNOWN
+        return CYCLE[self.phase][0]
+
+
+def generate_chunks(event_count: int, device_count: int, start: datetime, end: datetime,
+                    chunk_size: int, seed: int):
+    """
+    Yield (csv_buffer, rows, newest_row) chunks in tick order. Every device
+    reports once per tick, with a little jitter, across [start, end). Jitter
+    means the last row is not always the newest, so newest_row is the row
+    with the latest timestamp generated so far.
+    """
+    rng = random.Random(seed)
+    run_id = uuid.uuid4().hex[:8]
+    devices = [f"camera_{n:03d}" for n in range(1, device_count + 1)]
+    cycles = [DeviceCycle(rng) for _ in devices]
+    ticks = max(event_count // device_count, 1)
+    tick_seconds = (end - start).total_seconds() / ticks
+    jitter = tick_seconds / 4
+
+    buffer = io.StringIO()
+    rows = 0
+    newest_row = None
+    newest_timestamp = None
+    for n in range(event_count):
+        tick, device_index = divmod(n, device_count)
+        state = cycles[device_index].next_state()
+        low, high = CONFIDENCE[state]
+        timestamp = start + timedelta(seconds=tick * tick_seconds + rng.random() * jitter)
+        row = (
+            f"{run_id}-{n}",
+            devices[device_index],
+            state.value,
+            round(low + rng.random() * (high - low), 2),
+            timestamp.isoformat(),
+        )
+        if newest_timestamp is None or timestamp > newest_timestamp:
+            newest_row, newest_timestamp = row, timestamp
+        buffer.write("%s,%s,%s,%s,%s\n" % row)
+        rows += 1
+        if rows == chunk_size:
+            yield buffer, rows, newest_row
+            buffer = io.StringIO()
+            rows = 0
+    if rows:
+        yield buffer, rows, newest_row
+
+
+def generate_events(args):
+    """Load the synthetic events with COPY, then bring state and rollups in line."""
+
+    end = datetime.fromisoformat(args.end) if args.end else datetime.now()
+    start = end - timedelta(days=args.days)
+
+    init_db()
+    engine = get_engine()
+    partitions = EventsPartitionRepository(engine)
+    if partitions.is_partitioned():
+        partitions.ensure_partitions(start, add_months(month_start(end), 1))
+
+    print(f"🌱 Loading {args.events:,} events from {args.devices} devices "
+          f"between {start:%Y-%m-%d} and {end:%Y-%m-%d}...\n")
+
+    started = time.perf_counter()
+    loaded = 0
+    newest = None
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for buffer, rows, newest_row in generate_chunks(
+            args.events, args.devices, start, end, args.chunk_size, args.seed
+        ):
+            buffer.seek(0)
+            cursor.copy_expert(COPY_STATEMENT, buffer)
+            connection.commit()
+            loaded += rows
+            newest = newest_row
+            elapsed = time.perf_counter() - started
+            print(f"   {loaded:,} events ({loaded / elapsed:,.0f}/s)", end="\r")
+        cursor.close()
+    except Exception as e:
+        connection.rollback()
+        if loaded:
+            notify_committed(EVENTS_RELOAD_CHANNEL, ["generated"], engine)
+        print(f"\n❌ Failed after {loaded:,} events: {str(e)}")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Loaded {loaded:,} events in {elapsed:.1f}s ({loaded / elapsed * 60:,.0f} per minute)")
+
+    # COPY sends no per-event notifications, so running servers reload their recent events
+    notify_committed(EVENTS_RELOAD_CHANNEL, ["generated"], engine)
+
+    # Current state follows the newest generated event, unless real data is newer
+    if newest:
+        event_id, device, state, confidence, timestamp = newest
+        state = StateRepository(engine).update_current_state(state_from_event(Event(
+            event_id=event_id,
+            source_device_id=device,
+            bridge_state=BridgeState(state),
+            bridge_confidence=confidence,
+            timestamp=datetime.fromisoformat(timestamp)
+        )))
+        print(f"✅ Current state: {state.bridge_state.value} at {state.timestamp:%Y-%m-%d %H:%M:%S}")
+
+    if not args.skip_rollups:
+        print("📈 Rebuilding event rollups...")
+        EventRollupRepository(engine).rebuild()
+        print("✅ Rollups rebuilt")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=1_000_000, help="number of events to generate")
+    parser.add_argument("--devices", type=int, default=3, help="number of cameras reporting")
+    parser.add_argument("--days", type=float, default=30, help="time span the events cover")
+    parser.add_argument("--end", help="ISO timestamp of the newest event (default: now)")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="events per COPY")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for repeatable data")
+    parser.add_argument("--skip-rollups", action="store_true", help="do not rebuild rollups afterwards")
+    generate_events(parser.parse_args())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Script to load archived events (.ndjson.gz files) back into the events table."""
+
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import gzip
+from app.api.v1.events.events_model import Event
+from app.api.v1.events.events_partition_repository import EventsPartitionRepository
+from app.db import init_db
+from app.notify import notify_committed, EVENTS_RELOAD_CHANNEL
+
+IMPORT_BATCH_SIZE = 1000
+
+def import_events_archive(paths):
+    """Insert every event from the given archive files, skipping ones already present."""
+    
+    if not paths:
+        print("❌ Error: no archive files given")
+        print("\nUsage:")
+        print("  python scripts/import_events_archive.py archive/events/events_2024_01.ndjson.gz ...")
+        sys.exit(1)
+    
+    init_db()
+    repository = EventsPartitionRepository()
+    
+    imported = 0
+    for path in paths:
+        inserted = 0
+        read = 0
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as archive:
+                batch = []
+                for line in archive:
+                    batch.append(Event.model_validate_json(line))
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        inserted += repository.import_events(batch)
+                        read += len(batch)
+                        batch = []
+                inserted += repository.import_events(batch)
+                read += len(batch)
+        except Exception as e:
+            if imported + inserted:
+                notify_committed(EVENTS_RELOAD_CHANNEL, ["imported"])
+            print(f"❌ Failed to import {path}: {str(e)}")
+            sys.exit(1)
+        imported += inserted
+        print(f"✅ {path}: {inserted} of {read} events imported")
+    
+    if imported:
+        # Let running servers pick up imported events that are among the newest
+        notify_committed(EVENTS_RELOAD_CHANNEL, ["imported"])
+    
+    print("\nℹ️  Imported months are archived again on the next scripts/archive_events.py run")
+
+
+if __name__ == "__main__":
+    import_events_archive(sys.argv[1:])
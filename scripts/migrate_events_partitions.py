@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Script to convert an existing unpartitioned events table to monthly partitions."""
+
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from datetime import datetime
+from sqlalchemy import text
+from sqlmodel import Session
+from app.api.v1.events.events_repository import EventSQLModel
+from app.api.v1.events.events_partition_repository import (
+    EventsPartitionRepository, month_start, add_months
+)
+from app.db import get_engine, init_db
+
+LEGACY_TABLE = "events_unpartitioned"
+LEGACY_INDEXES = ["ix_events_event_id", "ix_events_bridge_state", "ix_events_source_device_id",
+                  "ix_events_timestamp", "ix_events_bridge_confidence"]
+
+def migrate_events_partitions():
+    """
+    Copy events into a partitioned table, all in one transaction. Writes to
+    events block until it commits, so run it during a quiet period.
+    """
+    
+    engine = get_engine()
+    repository = EventsPartitionRepository(engine)
+    if repository.is_partitioned():
+        print("ℹ️  events table is already partitioned, nothing to do")
+        return
+    
+    print("🔄 Migrating events to monthly partitions...\n")
+    try:
+        with Session(engine) as session:
+            session.execute(text("LOCK TABLE events IN ACCESS EXCLUSIVE MODE"))
+            
+            # state.last_event_id can no longer reference events.event_id
+            session.execute(text("ALTER TABLE state DROP CONSTRAINT IF EXISTS state_last_event_id_fkey"))
+            
+            # Move the old table, and everything named after it, out of the way
+            session.execute(text(f"ALTER TABLE events RENAME TO {LEGACY_TABLE}"))
+            session.execute(text(f"ALTER SEQUENCE events_id_seq RENAME TO {LEGACY_TABLE}_id_seq"))
+            session.execute(text(f"ALTER TABLE {LEGACY_TABLE} DROP CONSTRAINT events_pkey"))
+            index_names = LEGACY_INDEXES + [index.name for index in EventSQLModel.__table__.indexes]
+            for index_name in index_names:
+                session.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+            
+            EventSQLModel.__table__.create(session.connection(), checkfirst=True)
+            
+            # Partitions for the existing history and the coming months
+            oldest, newest = session.execute(
+                text(f"SELECT min(timestamp), max(timestamp) FROM {LEGACY_TABLE}")
+            ).one()
+            if oldest is not None:
+                repository.ensure_partitions(oldest, add_months(month_start(newest), 1), session)
+            current = month_start(datetime.now())
+            repository.ensure_partitions(add_months(current, -1), add_months(current, 4), session)
+            
+            copied = session.execute(text(
+                f"INSERT INTO events (id, event_id, source_device_id, bridge_state, bridge_confidence, timestamp) "
+                f"SELECT id, event_id, source_device_id, bridge_state, bridge_confidence, timestamp "
+                f"FROM {LEGACY_TABLE}"
+            )).rowcount
+            session.execute(text(
+                "SELECT setval(pg_get_serial_sequence('events', 'id'), "
+                "coalesce((SELECT max(id) FROM events), 0) + 1, false)"
+            ))
+            session.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
+            session.commit()
+    except Exception as e:
+        print(f"❌ Migration failed, nothing was changed: {str(e)}")
+        sys.exit(1)
+    
+    print(f"✅ Copied {copied} events into {len(repository.get_partitions())} monthly partitions")
+    
+    # Create anything else that is missing, such as newer tables and indexes
+    init_db()
+    print("\n✨ Migration complete")
+
+
+if __name__ == "__main__":
+    migrate_events_partitions()
@@ -10,9 +10,9 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from app.api.v1.admin.admin_model import AdminCreate, AdminRole
-from app.api.v1.admin.admin_service import AdminService
-from app.db import get_engine
-from sqlmodel import SQLModel
+from app.api.v1.admin.admin_repository import AdminRepository
+from app.db import get_engine, init_db
+from app.security import hash_password
 
 def seed_admin():
     """Create an initial admin user from environment variables."""
@@ -36,20 +36,15 @@ def seed_admin():
         print(f"❌ Error: Invalid role '{role_str}'. Must be one of: VIEWER, EDITOR, ADMIN")
         sys.exit(1)
     
-    # Initialize the database (create tables if they don't exist)
-    # Import all models to register them with SQLModel.metadata
-    from app.api.v1.events.events_repository import EventSQLModel
-    from app.api.v1.state.state_repository import StateSQLModel
-    from app.api.v1.admin.admin_repository import AdminUserSQLModel
-    
+    # Create missing tables and indexes, and the events partitions for recent months
+    init_db()
     engine = get_engine()
-    SQLModel.metadata.create_all(engine)
     
-    # Initialize service
-    admin_service = AdminService()
+    # Initialize repository
+    admin_repo = AdminRepository(engine)
     
     # Check if admin already exists
-    existing = admin_service.repository.get_by_username(username)
+    existing = admin_repo.get_by_username(username)
     if existing:
         # Check if we should force recreate (for testing/debugging)
         force_recreate = os.getenv("FORCE_RECREATE_ADMIN", "false").lower() == "true"
@@ -81,7 +76,11 @@ def seed_admin():
             password=password,
             role=role
         )
-        created_admin = admin_service.create_admin(admin_create)
+        created_admin = admin_repo.create_admin(
+            admin_create.username,
+            hash_password(admin_create.password),
+            admin_create.role
+        )
         print(f"\n✅ Successfully created admin user!")
         print(f"   ID: {created_admin.id}")
         print(f"   Username: {created_admin.username}")
@@ -12,27 +12,23 @@ if project_root not in sys.path:
 import uuid
 from datetime import datetime, timedelta
 import random
-from app.api.v1.events.events_model import Event, BridgeState
+from app.api.v1.events.events_model import Event, BridgeState, EventsQuery
 from app.api.v1.events.events_repository import EventsRepository
-from app.api.v1.state.state_service import StateService
-from app.db import get_engine
-from sqlmodel import SQLModel
+from app.api.v1.events.events_rollup_repository import EventRollupRepository
+from app.api.v1.state.state_repository import StateRepository
+from app.api.v1.state.state_service import state_from_event
+from app.db import get_engine, init_db
 
 def seed_events():
     """Create and insert 10 dummy events into the database."""
     
-    # Initialize the database (create tables if they don't exist)
-    # Import all models to register them with SQLModel.metadata
-    from app.api.v1.events.events_repository import EventSQLModel
-    from app.api.v1.state.state_repository import StateSQLModel
-    from app.api.v1.admin.admin_repository import AdminUserSQLModel
-    
+    # Create missing tables and indexes, and the events partitions for recent months
+    init_db()
     engine = get_engine()
-    SQLModel.metadata.create_all(engine)
     
-    # Initialize repository and service
+    # Initialize repositories
     events_repo = EventsRepository(engine)
-    state_service = StateService()
+    state_repo = StateRepository(engine)
     
     # Define some device IDs to simulate multiple cameras
     device_ids = ["camera_001", "camera_002", "camera_003"]
@@ -102,28 +98,45 @@ def seed_events():
     if latest_event:
         print("\n🔄 Updating state table with latest event...")
         try:
-            updated_state = state_service.update_current_state(latest_event)
+            updated_state = state_repo.update_current_state(state_from_event(latest_event))
             print(f"✅ State updated: {updated_state.bridge_state.value} "
                   f"at {updated_state.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
         except Exception as e:
             print(f"❌ Failed to update state: {str(e)}")
     
+    # Seeded events bypass ingestion, so recompute the rollups from scratch
+    print("\n📈 Rebuilding event rollups...")
+    try:
+        EventRollupRepository(engine).rebuild()
+        print("✅ Rollups rebuilt")
+    except Exception as e:
+        print(f"❌ Failed to rebuild rollups: {str(e)}")
+    
     # Display summary
     print("\n📊 Summary:")
-    all_events = events_repo.get_events()
-    print(f"Total events in database: {len(all_events)}")
-    
-    # Count by state
+    total_events = 0
     state_counts = {}
-    for event in all_events:
-        state_counts[event.bridge_state] = state_counts.get(event.bridge_state, 0) + 1
+    query = EventsQuery(limit=1000)
+    while True:
+        page = events_repo.get_events(query)
+        total_events += len(page.items)
+        
+        # Count by state
+        for event in page.items:
+            state_counts[event.bridge_state] = state_counts.get(event.bridge_state, 0) + 1
+        
+        if not page.next_cursor:
+            break
+        query = query.model_copy(update={"cursor": page.next_cursor})
+    
+    print(f"Total events in database: {total_events}")
     
     print("\nEvents by state:")
     for state, count in sorted(state_counts.items(), key=lambda x: x[1], reverse=True):
         print(f"  {state.value}: {count}")
     
     # Show current state
-    current_state = state_service.get_current_state()
+    current_state = state_repo.get_current_state()
     if current_state:
         print(f"\n🎯 Current State: {current_state.bridge_state.value}")
         print(f"   Last updated: {current_state.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
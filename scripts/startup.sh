@@ -30,5 +30,8 @@ else
 fi
 
 # Start the application
+# Behind a reverse proxy or tunnel, set FORWARDED_ALLOW_IPS to its address so the
+# client IP (used to throttle logins) comes from X-Forwarded-For instead of the proxy
 echo "🎯 Starting FastAPI server..."
-exec uvicorn main:app --host 0.0.0.0 --port 8000 --reload
+exec uvicorn main:app --host 0.0.0.0 --port 8000 --reload \
+  --proxy-headers --forwarded-allow-ips "${FORWARDED_ALLOW_IPS:-127.0.0.1}"
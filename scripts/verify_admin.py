@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Script to verify admin user exists and test password."""
 
+import asyncio
 import os
 import sys
 
@@ -10,11 +11,22 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from app.api.v1.admin.admin_service import AdminService
-from app.api.v1.admin.admin_repository import AdminUserSQLModel
-from app.db import get_engine
+from app.api.v1.admin.admin_repository import AdminRepository, AdminUserSQLModel
+from app.db import get_engine, get_async_engine, UnitOfWork
+from app.password_pool import password_pool
 from sqlmodel import SQLModel
 from app.security import verify_password
 
+async def authenticate(username: str, password: str):
+    """Run the service's login path on the async engine, as the API does."""
+    try:
+        async with UnitOfWork() as uow:
+            return await AdminService(uow).authenticate(username, password)
+    finally:
+        await password_pool.stop()
+        await get_async_engine().dispose()
+
+
 def verify_admin():
     """Verify admin user exists and test authentication."""
     
@@ -31,11 +43,11 @@ def verify_admin():
     
     print(f"🔍 Verifying admin user: {username}\n")
     
-    # Initialize service
-    admin_service = AdminService()
+    # Initialize repository
+    admin_repo = AdminRepository(engine)
     
     # Check if admin exists
-    admin_sql = admin_service.repository.get_by_username(username)
+    admin_sql = admin_repo.get_by_username(username)
     if not admin_sql:
         print(f"❌ Admin user '{username}' does not exist!")
         print("   Run the seed script to create it:")
@@ -65,7 +77,7 @@ def verify_admin():
     
     # Test authentication through service
     print(f"\n🔑 Testing authentication through service...")
-    admin = admin_service.authenticate(username, password)
+    admin = asyncio.run(authenticate(username, password))
     if admin:
         print(f"✅ Authentication successful!")
         print(f"   Authenticated as: {admin.username} ({admin.role.value})")
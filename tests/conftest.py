@@ -0,0 +1,36 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from app.api.v1.events.events_model import BridgeState, Event
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "clock(module): module whose clock the clock fixture replaces")
+
+
+def make_event(i: int) -> Event:
+    """The i-th event from camera_001, i seconds into 2026."""
+    return Event(
+        event_id=f"event-{i}",
+        source_device_id="camera_001",
+        bridge_state=BridgeState.OPEN,
+        bridge_confidence=0.9,
+        timestamp=datetime(2026, 1, 1, 0, 0, i),
+    )
+
+
+@pytest.fixture
+def clock(request, monkeypatch) -> SimpleNamespace:
+    """
+    Replaces the clock of the module named by the test's clock marker, e.g.
+    `pytestmark = pytest.mark.clock(admin_cache)`, with one the test
+    advances by hand.
+    """
+    marker = request.node.get_closest_marker("clock")
+    if marker is None:
+        raise pytest.UsageError("the clock fixture needs a clock(module) marker")
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(
+        marker.args[0], "time", SimpleNamespace(monotonic=lambda: clock.now, perf_counter=lambda: clock.now)
+    )
+    return clock
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+import pytest
+from app.api.v1.admin import admin_cache
+from app.api.v1.admin.admin_cache import AdminSessionCache
+from app.api.v1.admin.admin_model import AdminRole, AdminUser
+from app.metrics import MetricsRegistry
+
+pytestmark = pytest.mark.clock(admin_cache)
+
+
+def make_admin(admin_id: int) -> AdminUser:
+    return AdminUser(
+        id=admin_id,
+        username=f"admin{admin_id}",
+        role=AdminRole.ADMIN,
+        created_at=datetime(2026, 1, 1),
+        updated_at=datetime(2026, 1, 1),
+    )
+
+
+def test_entry_expires_after_the_ttl(clock):
+    cache = AdminSessionCache(ttl=60, metrics=MetricsRegistry())
+    cache.set("token", make_admin(1))
+
+    clock.now += 59
+    assert cache.get("token") == make_admin(1)
+    clock.now += 2
+    assert cache.get("token") is None
+
+
+def test_entry_lifetime_is_capped_by_token_expiry(clock):
+    cache = AdminSessionCache(ttl=60, metrics=MetricsRegistry())
+    cache.set("token", make_admin(1), token_expires_at=datetime.utcnow() + timedelta(seconds=10))
+
+    clock.now += 9
+    assert cache.get("token") == make_admin(1)
+    clock.now += 2
+    assert cache.get("token") is None
+
+
+def test_expired_token_is_not_cached(clock):
+    cache = AdminSessionCache(ttl=60, metrics=MetricsRegistry())
+
+    cache.set("token", make_admin(1), token_expires_at=datetime.utcnow() - timedelta(seconds=1))
+
+    assert cache.get("token") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = AdminSessionCache(max_size=2, ttl=60, metrics=MetricsRegistry())
+    cache.set("first", make_admin(1))
+    cache.set("second", make_admin(2))
+    cache.get("first")
+
+    cache.set("third", make_admin(3))
+
+    assert cache.get("second") is None
+    assert cache.get("first") == make_admin(1)
+    assert cache.get("third") == make_admin(3)
+
+
+def test_invalidate_admin_drops_only_their_sessions(clock):
+    cache = AdminSessionCache(ttl=60, metrics=MetricsRegistry())
+    cache.set("laptop", make_admin(1))
+    cache.set("phone", make_admin(1))
+    cache.set("other", make_admin(2))
+
+    cache.invalidate_admin(1)
+
+    assert cache.get("laptop") is None
+    assert cache.get("phone") is None
+    assert cache.get("other") == make_admin(2)
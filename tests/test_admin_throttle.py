@@ -0,0 +1,80 @@
+import pytest
+from app.api.v1.admin import admin_throttle
+from app.api.v1.admin.admin_throttle import LoginThrottle, SlidingWindowLimiter
+
+pytestmark = pytest.mark.clock(admin_throttle)
+
+
+def test_limiter_refuses_attempts_past_the_limit_until_the_oldest_leaves_the_window(clock):
+    limiter = SlidingWindowLimiter(limit=2, window=60)
+    assert limiter.acquire("key") is None
+    clock.now += 10
+    assert limiter.acquire("key") is None
+
+    clock.now += 5
+    assert limiter.acquire("key") == pytest.approx(45)
+    clock.now += 45
+    assert limiter.acquire("key") is None
+
+
+def test_refused_attempts_do_not_extend_the_window(clock):
+    limiter = SlidingWindowLimiter(limit=1, window=60)
+    limiter.acquire("key")
+    for _ in range(5):
+        clock.now += 10
+        limiter.acquire("key")
+
+    clock.now += 10
+    assert limiter.acquire("key") is None
+
+
+def test_limiter_keys_are_independent(clock):
+    limiter = SlidingWindowLimiter(limit=1, window=60)
+    limiter.acquire("first")
+
+    assert limiter.acquire("second") is None
+
+
+def test_limiter_forgets_least_recent_keys_past_max_keys(clock):
+    limiter = SlidingWindowLimiter(limit=1, window=60, max_keys=2)
+    limiter.acquire("first")
+    limiter.acquire("second")
+    limiter.acquire("third")
+
+    assert limiter.acquire("first") is None
+    assert limiter.acquire("third") is not None
+
+
+def test_throttle_limits_each_username_across_addresses(clock):
+    throttle = LoginThrottle(per_username=2, per_ip=100, window=60)
+    throttle.acquire("alice", "10.0.0.1")
+    throttle.acquire("Alice", "10.0.0.2")
+
+    assert throttle.acquire("ALICE", "10.0.0.3") == 60
+    assert throttle.acquire("bob", "10.0.0.3") is None
+
+
+def test_throttle_limits_each_address_across_usernames(clock):
+    throttle = LoginThrottle(per_username=100, per_ip=2, window=60)
+    throttle.acquire("alice", "10.0.0.1")
+    throttle.acquire("bob", "10.0.0.1")
+
+    assert throttle.acquire("carol", "10.0.0.1") == 60
+    assert throttle.acquire("carol", "10.0.0.2") is None
+
+
+def test_retry_after_is_at_least_one_second(clock):
+    throttle = LoginThrottle(per_username=1, per_ip=100, window=60)
+    throttle.acquire("alice", "10.0.0.1")
+
+    clock.now += 59.9
+    assert throttle.acquire("alice", "10.0.0.1") == 1
+
+
+def test_successful_login_clears_the_username(clock):
+    throttle = LoginThrottle(per_username=1, per_ip=100, window=60)
+    throttle.acquire("alice", "10.0.0.1")
+
+    throttle.succeeded("Alice")
+
+    assert throttle.acquire("alice", "10.0.0.1") is None
@@ -0,0 +1,32 @@
+from app.db_metrics import bind_shape, normalize_statement
+
+
+def test_literals_and_parameters_become_placeholders():
+    statement = "SELECT * FROM events WHERE source_device_id = 'camera_001' AND bridge_confidence >= 0.8 LIMIT %(limit)s"
+
+    assert normalize_statement(statement) == (
+        "SELECT * FROM events WHERE source_device_id = ? AND bridge_confidence >= ? LIMIT ?"
+    )
+
+
+def test_multi_row_values_share_one_label_whatever_the_batch_size():
+    two_rows = "INSERT INTO events (a, b) VALUES ($1, $2), ($3, $4)"
+    three_rows = "INSERT INTO events (a, b)\n  VALUES ($1, $2), ($3, $4), ($5, $6)"
+
+    assert normalize_statement(two_rows) == normalize_statement(three_rows) == "INSERT INTO events (a, b) VALUES (?, ...)"
+
+
+def test_in_lists_collapse():
+    assert normalize_statement("SELECT 1 FROM admin_users WHERE id IN (%s, %s, %s)") == (
+        "SELECT ? FROM admin_users WHERE id IN (?, ...)"
+    )
+
+
+def test_bind_shape_never_includes_values():
+    shape = bind_shape({"username": "alice", "ids": [1, 2], "payloads": ["x"] * 20})
+
+    assert shape == {"username": "str[5]", "ids": ["int", "int"], "payloads": "list[20]"}
+
+
+def test_bind_shape_describes_executemany_by_its_first_row():
+    assert bind_shape([{"event_id": "event-1"}, {"event_id": "event-2"}]) == "2 x {'event_id': 'str[7]'}"
@@ -0,0 +1,62 @@
+import uuid
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from app.api.v1.events.events_model import Event, EventsQuery, EventStatsQuery
+from app.db import get_engine
+
+
+def event_payload(timestamp: str, source_device_id: str) -> dict:
+    return {
+        "event_id": str(uuid.uuid4()),
+        "source_device_id": source_device_id,
+        "bridge_state": "OPEN",
+        "bridge_confidence": 0.9,
+        "timestamp": timestamp,
+    }
+
+
+@pytest.mark.parametrize("timestamp", ["2026-03-01T12:30:00Z", "2026-03-01T14:30:00+02:00", "2026-03-01T12:30:00"])
+def test_timestamps_become_naive_utc(timestamp):
+    event = Event.model_validate(event_payload(timestamp, "camera_001"))
+
+    assert event.timestamp == datetime(2026, 3, 1, 12, 30)
+
+
+def test_filter_and_stats_datetimes_become_naive_utc():
+    query = EventsQuery(since="2026-03-01T00:00:00Z", until="2026-03-01T02:00:00+01:00")
+    stats = EventStatsQuery.model_validate({"from": "2026-03-01T00:00:00Z", "to": "2026-03-02T00:00:00"})
+
+    assert query.since == datetime(2026, 3, 1, 0, 0)
+    assert query.until == datetime(2026, 3, 1, 1, 0)
+    assert stats.from_ == datetime(2026, 3, 1, 0, 0)
+
+
+@pytest.fixture(scope="module")
+def client():
+    try:
+        with get_engine().connect():
+            pass
+    except Exception:
+        pytest.skip("database not reachable")
+
+    from app.server import app
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("timestamp", ["2026-03-01T12:30:00Z", "2026-03-01T14:30:00+02:00"])
+def test_post_event_with_time_zone(client, timestamp):
+    source_device_id = f"tz_{uuid.uuid4().hex[:8]}"
+    payload = event_payload(timestamp, source_device_id)
+
+    response = client.post("/api/v1/events", json=payload)
+
+    assert response.status_code in (200, 202), response.text
+    if response.status_code == 200:
+        listed = client.get("/api/v1/events", params={
+            "source_device_id": source_device_id, "since": "2026-03-01T12:00:00Z"
+        })
+        assert listed.status_code == 200, listed.text
+        assert [item["event_id"] for item in listed.json()["items"]] == [payload["event_id"]]
+        assert listed.json()["items"][0]["timestamp"] == "2026-03-01T12:30:00"
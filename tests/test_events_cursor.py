@@ -0,0 +1,33 @@
+import base64
+from datetime import datetime
+import pytest
+from app.api.v1.events.events_repository import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips():
+    timestamp = datetime(2026, 3, 1, 12, 30, 15, 250000)
+
+    assert decode_cursor(encode_cursor(timestamp, 42)) == (timestamp, 42)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime(2026, 3, 1, 12, 30), 10 ** 12)
+
+    assert cursor.replace("-", "").replace("_", "").rstrip("=").isalnum()
+
+
+def test_cursor_with_time_zone_decodes_to_naive_utc():
+    cursor = base64.urlsafe_b64encode(b"2026-03-01T14:30:00+02:00|7").decode()
+
+    assert decode_cursor(cursor) == (datetime(2026, 3, 1, 12, 30), 7)
+
+
+@pytest.mark.parametrize("raw", [b"not a cursor", b"2026-03-01T12:30:00|x", b"yesterday|7", b"\xff\xfe"])
+def test_malformed_cursor_is_rejected(raw):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(base64.urlsafe_b64encode(raw).decode())
+
+
+def test_cursor_that_is_not_base64_is_rejected():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("!!!")
@@ -0,0 +1,50 @@
+import asyncio
+import gzip
+import json
+from datetime import datetime
+from app.api.v1.events.events_export import encode_rows, gzip_stream
+from app.api.v1.events.events_json import EVENT_COLUMNS
+from app.api.v1.events.events_model import BridgeState, ExportFormat
+
+ROWS = [
+    ("event-1", "camera_001", BridgeState.OPEN, 0.9, datetime(2026, 3, 1, 12, 30)),
+    ("event-2", "camera_002", BridgeState.CLOSED, 0.8, datetime(2026, 3, 1, 12, 31, 5)),
+]
+
+
+async def chunks():
+    for row in ROWS:
+        yield [row]
+
+
+async def collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+def test_ndjson_has_one_event_per_line_in_api_shape():
+    body = asyncio.run(collect(encode_rows(chunks(), EVENT_COLUMNS, ExportFormat.NDJSON)))
+
+    lines = body.decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"event_id": "event-1", "source_device_id": "camera_001", "bridge_state": "OPEN",
+         "bridge_confidence": 0.9, "timestamp": "2026-03-01T12:30:00"},
+        {"event_id": "event-2", "source_device_id": "camera_002", "bridge_state": "CLOSED",
+         "bridge_confidence": 0.8, "timestamp": "2026-03-01T12:31:05"},
+    ]
+
+
+def test_csv_starts_with_a_header_row():
+    body = asyncio.run(collect(encode_rows(chunks(), EVENT_COLUMNS, ExportFormat.CSV)))
+
+    assert body.decode().splitlines() == [
+        "event_id,source_device_id,bridge_state,bridge_confidence,timestamp",
+        "event-1,camera_001,OPEN,0.9,2026-03-01T12:30:00",
+        "event-2,camera_002,CLOSED,0.8,2026-03-01T12:31:05",
+    ]
+
+
+def test_gzip_stream_is_one_member_of_the_whole_body():
+    plain = asyncio.run(collect(encode_rows(chunks(), EVENT_COLUMNS, ExportFormat.CSV)))
+    compressed = asyncio.run(collect(gzip_stream(encode_rows(chunks(), EVENT_COLUMNS, ExportFormat.CSV))))
+
+    assert gzip.decompress(compressed) == plain
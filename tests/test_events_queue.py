@@ -0,0 +1,90 @@
+import asyncio
+from typing import List
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+from app.api.v1.events.events_model import Event
+from app.api.v1.events.events_queue import EventsIngestQueue, IngestQueueUnavailable
+from app.metrics import MetricsRegistry
+from conftest import make_event
+
+
+class FakeService:
+    """Stands in for EventsService; fails the first `outages` calls, and any batch holding a poison event."""
+
+    def __init__(self, outages: int = 0, poison: str = None):
+        self.outages = outages
+        self.poison = poison
+        self.calls = 0
+        self.written: List[Event] = []
+
+    def __call__(self, uow) -> "FakeService":
+        return self
+
+    async def create_events(self, events: List[Event]) -> None:
+        self.calls += 1
+        if self.calls <= self.outages:
+            raise OperationalError("INSERT", {}, ConnectionRefusedError("database is down"))
+        if any(event.event_id == self.poison for event in events):
+            raise IntegrityError("INSERT", {}, ValueError("bad row"))
+        self.written.extend(events)
+
+
+def run_queue(service: FakeService, events: List[Event], **kwargs) -> EventsIngestQueue:
+    async def scenario():
+        queue = EventsIngestQueue(
+            batch_size=len(events), flush_interval=0.01, service_factory=service, retry_backoff=0.001,
+            metrics=MetricsRegistry(), **kwargs
+        )
+        await queue.start()
+        for event in events:
+            await queue.enqueue(event)
+        await asyncio.sleep(0.1)
+        await queue.stop()
+        return queue
+
+    return asyncio.run(scenario())
+
+
+def test_first_flush_failing_is_retried():
+    events = [make_event(i) for i in range(4)]
+    service = FakeService(outages=1)
+
+    run_queue(service, events)
+
+    assert service.calls == 2
+    assert service.written == events
+
+
+def test_batch_failing_past_retries_is_held_back_and_written_later():
+    events = [make_event(i) for i in range(4)]
+    service = FakeService(outages=3)
+
+    queue = run_queue(service, events, max_retries=1)
+
+    assert service.written == events
+    assert queue.depth == 0
+
+
+def test_poison_event_does_not_sink_the_batch():
+    events = [make_event(i) for i in range(8)]
+    service = FakeService(poison="event-5")
+
+    run_queue(service, events)
+
+    assert service.written == [event for event in events if event.event_id != "event-5"]
+
+
+def test_queue_that_never_started_rejects_events_and_stops_cleanly():
+    service = FakeService()
+
+    async def scenario():
+        queue = EventsIngestQueue(service_factory=service, metrics=MetricsRegistry())
+        with pytest.raises(IngestQueueUnavailable):
+            await queue.enqueue(make_event(0))
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(scenario())
+
+    assert queue.depth == 0
+    assert service.calls == 0
@@ -0,0 +1,182 @@
+import asyncio
+from datetime import datetime
+from typing import List
+import pytest
+from app.api.v1.events import events_recent
+from app.api.v1.events.events_model import BridgeState, Event, EventsFilter, EventsQuery
+from app.api.v1.events.events_recent import RecentEventsBuffer
+from app.metrics import MetricsRegistry
+from conftest import make_event
+
+
+def event_ids(rows: List[tuple]) -> List[str]:
+    return [row[0] for row in rows]
+
+
+class FakeUnitOfWork:
+    async def __aenter__(self) -> "FakeUnitOfWork":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
+@pytest.fixture
+def table(monkeypatch) -> List[Event]:
+    """Stands in for the events table behind RecentEventsBuffer.reload()."""
+    rows: List[Event] = []
+
+    class FakeRepository:
+        def __init__(self, uow):
+            pass
+
+        async def get_recent_events(self, limit: int) -> List[Event]:
+            return sorted(rows, key=lambda event: event.timestamp, reverse=True)[:limit]
+
+    monkeypatch.setattr(events_recent, "UnitOfWork", FakeUnitOfWork)
+    monkeypatch.setattr(events_recent, "AsyncEventsRepository", FakeRepository)
+    return rows
+
+
+def test_out_of_band_insert_is_served_after_reload_notification(table, monkeypatch):
+    table.extend(make_event(i) for i in range(3))
+    buffer = RecentEventsBuffer(capacity=10, metrics=MetricsRegistry())
+    monkeypatch.setattr(events_recent, "recent_events", buffer)
+
+    async def scenario():
+        await buffer.reload()
+        # Written by a script, e.g. scripts/generate_events.py, without per-event notifications
+        table.append(make_event(5))
+        before = buffer.newest(10, EventsFilter())
+
+        events_recent.apply_events_reload_notification("generated")
+        during = buffer.newest(10, EventsFilter())
+        await buffer._reload
+        return before, during, buffer.newest(10, EventsFilter())
+
+    before, during, after = asyncio.run(scenario())
+
+    assert event_ids(before) == ["event-2", "event-1", "event-0"]
+    assert during is None
+    assert event_ids(after) == ["event-5", "event-2", "event-1", "event-0"]
+
+
+def make_device_event(i: int, device: str, bridge_state: BridgeState = BridgeState.OPEN, second: int = None) -> Event:
+    return Event(
+        event_id=f"event-{i}",
+        source_device_id=device,
+        bridge_state=bridge_state,
+        bridge_confidence=i / 10,
+        timestamp=datetime(2026, 1, 1, 0, 0, i if second is None else second),
+    )
+
+
+def test_newest_returns_events_newest_first_whatever_order_they_arrived_in():
+    buffer = RecentEventsBuffer(capacity=10, metrics=MetricsRegistry())
+    buffer.load([])
+
+    buffer.add([make_event(i) for i in (3, 1, 4, 0, 2)])
+
+    assert event_ids(buffer.newest(10, EventsFilter())) == ["event-4", "event-3", "event-2", "event-1", "event-0"]
+
+
+def test_rows_carry_every_event_column():
+    buffer = RecentEventsBuffer(capacity=10, metrics=MetricsRegistry())
+    buffer.load([make_device_event(7, "camera_002", BridgeState.CLOSING)])
+
+    assert buffer.newest(1, EventsFilter()) == [
+        ("event-7", "camera_002", BridgeState.CLOSING, 0.7, datetime(2026, 1, 1, 0, 0, 7))
+    ]
+
+
+def test_events_with_the_same_timestamp_keep_arrival_order():
+    buffer = RecentEventsBuffer(capacity=10, metrics=MetricsRegistry())
+    buffer.load([])
+
+    buffer.add([make_device_event(i, "camera_001", second=5) for i in range(3)])
+
+    assert event_ids(buffer.newest(10, EventsFilter())) == ["event-2", "event-1", "event-0"]
+
+
+def test_duplicate_events_are_buffered_once():
+    buffer = RecentEventsBuffer(capacity=10, metrics=MetricsRegistry())
+    buffer.load([make_event(1)])
+
+    buffer.add([make_event(1), make_event(1)])
+
+    assert len(buffer) == 1
+
+
+def test_full_buffer_evicts_its_oldest_event_and_ignores_older_ones():
+    buffer = RecentEventsBuffer(capacity=3, metrics=MetricsRegistry())
+    buffer.load([make_event(i) for i in (3, 2, 1)])
+
+    buffer.add([make_event(4), make_event(0)])
+
+    assert event_ids(buffer.newest(3, EventsFilter())) == ["event-4", "event-3", "event-2"]
+
+
+def test_late_event_is_slotted_in_and_evicts_the_oldest():
+    buffer = RecentEventsBuffer(capacity=3, metrics=MetricsRegistry())
+    buffer.load([make_event(i) for i in (6, 4, 2)])
+
+    buffer.add([make_event(5)])
+
+    assert event_ids(buffer.newest(3, EventsFilter())) == ["event-6", "event-5", "event-4"]
+
+
+def test_query_running_past_the_oldest_event_of_a_full_buffer_goes_to_the_database():
+    buffer = RecentEventsBuffer(capacity=3, metrics=MetricsRegistry())
+    buffer.load([make_event(i) for i in (3, 2, 1)])
+
+    assert event_ids(buffer.newest(3, EventsFilter())) == ["event-3", "event-2", "event-1"]
+    assert buffer.newest(4, EventsFilter()) is None
+    # Not known to be complete once full, even if the database had no more
+    assert buffer.newest(1, EventsFilter(source_device_id="camera_002")) is None
+
+
+def test_buffer_holding_every_event_answers_short_queries_in_full():
+    buffer = RecentEventsBuffer(capacity=10, metrics=MetricsRegistry())
+    buffer.load([make_event(i) for i in (2, 1)])
+
+    assert event_ids(buffer.newest(5, EventsFilter())) == ["event-2", "event-1"]
+    assert buffer.newest(5, EventsFilter(source_device_id="camera_002")) == []
+
+
+def test_filters_apply_to_buffered_events():
+    buffer = RecentEventsBuffer(capacity=10, metrics=MetricsRegistry())
+    buffer.load([
+        make_device_event(4, "camera_001", BridgeState.CLOSED),
+        make_device_event(3, "camera_002", BridgeState.OPEN),
+        make_device_event(2, "camera_001", BridgeState.OPEN),
+        make_device_event(1, "camera_001", BridgeState.OPEN),
+    ])
+
+    assert event_ids(buffer.newest(10, EventsFilter(source_device_id="camera_001", bridge_state=BridgeState.OPEN))) == [
+        "event-2", "event-1"
+    ]
+    assert event_ids(buffer.newest(10, EventsFilter(min_confidence=0.25))) == ["event-4", "event-3"]
+    assert event_ids(buffer.newest(10, EventsFilter(
+        since=datetime(2026, 1, 1, 0, 0, 2), until=datetime(2026, 1, 1, 0, 0, 4)
+    ))) == ["event-3", "event-2"]
+
+
+def test_since_inside_a_full_buffer_is_answered_from_memory():
+    buffer = RecentEventsBuffer(capacity=3, metrics=MetricsRegistry())
+    buffer.load([make_event(i) for i in (5, 4, 3)])
+
+    assert event_ids(buffer.newest(10, EventsFilter(since=datetime(2026, 1, 1, 0, 0, 4)))) == ["event-5", "event-4"]
+
+
+def test_buffer_is_not_consulted_before_it_is_loaded():
+    buffer = RecentEventsBuffer(capacity=10, metrics=MetricsRegistry())
+    buffer.add([make_event(1)])
+
+    assert buffer.newest(1, EventsFilter()) is None
+
+
+def test_recent_cannot_be_combined_with_a_cursor():
+    with pytest.raises(ValueError, match="recent cannot be combined with cursor"):
+        EventsQuery(recent=10, cursor="abc")
+
+    assert EventsQuery(recent=10).recent == 10
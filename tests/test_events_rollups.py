@@ -0,0 +1,81 @@
+from datetime import datetime
+from app.api.v1.events.events_model import BridgeState, Event, StatsBucket
+from app.api.v1.events.events_rollup_repository import EventRollupDeviceSQLModel, rollup_deltas
+
+
+def make_event(i: int, bridge_state: BridgeState, timestamp: datetime, device: str = "camera_001") -> Event:
+    return Event(
+        event_id=f"event-{i}",
+        source_device_id=device,
+        bridge_state=bridge_state,
+        bridge_confidence=0.9,
+        timestamp=timestamp,
+    )
+
+
+def test_open_period_is_credited_to_the_bucket_it_began_in():
+    device = EventRollupDeviceSQLModel(source_device_id="camera_001")
+    events = [
+        make_event(1, BridgeState.CLOSED, datetime(2026, 3, 1, 9, 50)),
+        make_event(2, BridgeState.OPEN, datetime(2026, 3, 1, 9, 55)),
+        make_event(3, BridgeState.OPEN, datetime(2026, 3, 1, 10, 0)),
+        make_event(4, BridgeState.CLOSED, datetime(2026, 3, 1, 10, 5)),
+    ]
+
+    rows = rollup_deltas(events, {"camera_001": device})
+
+    nine = rows[(StatsBucket.HOUR, datetime(2026, 3, 1, 9), "camera_001")]
+    ten = rows[(StatsBucket.HOUR, datetime(2026, 3, 1, 10), "camera_001")]
+    day = rows[(StatsBucket.DAY, datetime(2026, 3, 1), "camera_001")]
+    assert (nine["event_count"], nine["openings"], nine["open_periods"], nine["open_seconds"]) == (2, 1, 1, 600)
+    assert (ten["event_count"], ten["openings"], ten["open_periods"]) == (2, 0, 0)
+    assert (day["event_count"], day["openings"], day["max_open_seconds"]) == (4, 1, 600)
+    assert (device.bridge_state, device.timestamp, device.open_since) == (
+        BridgeState.CLOSED, datetime(2026, 3, 1, 10, 5), None
+    )
+
+
+def test_open_period_continues_across_batches():
+    device = EventRollupDeviceSQLModel(
+        source_device_id="camera_001",
+        bridge_state=BridgeState.OPEN,
+        timestamp=datetime(2026, 3, 1, 9, 58),
+        open_since=datetime(2026, 3, 1, 9, 55),
+    )
+
+    rows = rollup_deltas(
+        [make_event(1, BridgeState.CLOSING, datetime(2026, 3, 1, 10, 1))], {"camera_001": device}
+    )
+
+    nine = rows[(StatsBucket.HOUR, datetime(2026, 3, 1, 9), "camera_001")]
+    assert (nine["event_count"], nine["open_periods"], nine["open_seconds"]) == (0, 1, 360)
+    assert rows[(StatsBucket.HOUR, datetime(2026, 3, 1, 10), "camera_001")]["event_count"] == 1
+
+
+def test_late_event_is_counted_without_moving_the_state_machine():
+    device = EventRollupDeviceSQLModel(
+        source_device_id="camera_001", bridge_state=BridgeState.CLOSED, timestamp=datetime(2026, 3, 1, 10)
+    )
+
+    rows = rollup_deltas([make_event(1, BridgeState.OPEN, datetime(2026, 3, 1, 9))], {"camera_001": device})
+
+    nine = rows[(StatsBucket.HOUR, datetime(2026, 3, 1, 9), "camera_001")]
+    assert (nine["event_count"], nine["openings"]) == (1, 0)
+    assert (device.bridge_state, device.timestamp) == (BridgeState.CLOSED, datetime(2026, 3, 1, 10))
+
+
+def test_devices_are_rolled_up_separately():
+    devices = {
+        name: EventRollupDeviceSQLModel(source_device_id=name, bridge_state=BridgeState.CLOSED)
+        for name in ("camera_001", "camera_002")
+    }
+    events = [
+        make_event(1, BridgeState.OPEN, datetime(2026, 3, 1, 9, 10), "camera_001"),
+        make_event(2, BridgeState.CLOSED, datetime(2026, 3, 1, 9, 20), "camera_002"),
+    ]
+
+    rows = rollup_deltas(events, devices)
+
+    assert rows[(StatsBucket.HOUR, datetime(2026, 3, 1, 9), "camera_001")]["openings"] == 1
+    assert rows[(StatsBucket.HOUR, datetime(2026, 3, 1, 9), "camera_002")]["openings"] == 0
+    assert devices["camera_002"].open_since is None
@@ -0,0 +1,73 @@
+import asyncio
+from typing import List
+from app.api.v1.events.events_model import Event
+from app.api.v1.events.events_recent import RecentEventsBuffer
+from app.api.v1.events.events_service import EventsService
+from app.metrics import MetricsRegistry
+from conftest import make_event
+
+
+class FakeUnitOfWork:
+    def after_commit(self, callback) -> None:
+        self.callback = callback
+
+    async def commit(self) -> None:
+        self.callback()
+
+
+class FakeRepository:
+    """Inserts each (event_id, timestamp) once, like the unique index on events."""
+
+    def __init__(self, stored: List[Event]):
+        self.keys = {(event.event_id, event.timestamp) for event in stored}
+
+    async def create_events(self, events: List[Event]) -> List[Event]:
+        inserted = []
+        for event in events:
+            key = (event.event_id, event.timestamp)
+            if key not in self.keys:
+                self.keys.add(key)
+                inserted.append(event)
+        return inserted
+
+
+class FakeStateService:
+    def __init__(self):
+        self.updates: List[Event] = []
+
+    async def update_current_state(self, event: Event) -> None:
+        self.updates.append(event)
+
+
+class FakeRollups:
+    async def apply_events(self, events: List[Event]) -> None:
+        pass
+
+
+def create_events(stored: List[Event], batch: List[Event]):
+    state_service = FakeStateService()
+    service = EventsService(
+        FakeUnitOfWork(),
+        repository=FakeRepository(stored),
+        state_service=state_service,
+        rollup_repository=FakeRollups(),
+        recent=RecentEventsBuffer(capacity=10, metrics=MetricsRegistry()),
+    )
+    result = asyncio.run(service.create_events(batch))
+    return result, state_service.updates
+
+
+def test_state_follows_newest_inserted_event():
+    result, updates = create_events(
+        stored=[make_event(9)], batch=[make_event(1), make_event(9), make_event(2), make_event(1)]
+    )
+
+    assert updates == [make_event(2)]
+    assert (result.inserted, result.duplicates, result.repeated) == (2, 1, 1)
+
+
+def test_batch_of_stored_events_leaves_state_alone():
+    result, updates = create_events(stored=[make_event(1), make_event(2)], batch=[make_event(1), make_event(2)])
+
+    assert updates == []
+    assert (result.inserted, result.duplicates, result.repeated) == (0, 2, 0)
@@ -0,0 +1,20 @@
+import pytest
+from app.metrics import MetricsRegistry
+
+
+def test_gauge_callback_cannot_be_taken_over_by_a_second_owner():
+    metrics = MetricsRegistry()
+    owner = metrics.gauge("queue_depth", fn=lambda: 1)
+
+    with pytest.raises(ValueError, match="queue_depth"):
+        metrics.gauge("queue_depth", fn=lambda: 2)
+    assert metrics.gauge("queue_depth") is owner
+    assert owner.value == 1
+
+
+def test_gauges_with_other_labels_are_separate():
+    metrics = MetricsRegistry()
+    metrics.gauge("sessions", fn=lambda: 1, kind="viewer")
+    metrics.gauge("sessions", fn=lambda: 2, kind="admin")
+
+    assert {entry["labels"]["kind"]: entry["value"] for entry in metrics.snapshot()} == {"viewer": 1, "admin": 2}
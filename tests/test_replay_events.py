@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+from benchmarks.replay_events import _state_ids, retime, synthetic_events
+from app.api.v1.events.events_model import BridgeState, Event
+
+
+def make_event(i: int, timestamp: datetime) -> Event:
+    return Event(
+        event_id=f"event-{i}",
+        source_device_id="camera_001",
+        bridge_state=BridgeState.OPEN,
+        bridge_confidence=0.9,
+        timestamp=timestamp,
+    )
+
+
+def test_retime_rebases_sorts_and_compresses_timestamps():
+    events = [
+        make_event(2, datetime(2025, 1, 1, 0, 10)),
+        make_event(1, datetime(2025, 1, 1, 0, 0)),
+        make_event(3, datetime(2025, 1, 1, 1, 0)),
+    ]
+    start = datetime(2026, 3, 1, 12, 0)
+
+    replayed = retime(events, speed=60, start=start)
+
+    assert [event.timestamp for event in replayed] == [
+        start, start + timedelta(seconds=10), start + timedelta(seconds=60)
+    ]
+    assert [event.bridge_state for event in replayed] == [BridgeState.OPEN] * 3
+
+
+def test_retime_gives_each_run_fresh_event_ids():
+    events = [make_event(1, datetime(2025, 1, 1))]
+
+    first = retime(events, speed=1, start=datetime(2026, 3, 1))
+    second = retime(events, speed=1, start=datetime(2026, 3, 1))
+
+    assert first[0].event_id != second[0].event_id != "event-1"
+
+
+def test_synthetic_events_interleave_devices_and_are_repeatable():
+    first = synthetic_events(12, devices=3, span_seconds=60, seed=7)
+    second = synthetic_events(12, devices=3, span_seconds=60, seed=7)
+
+    assert [event.source_device_id for event in first[:3]] == ["camera_001", "camera_002", "camera_003"]
+    assert [(event.bridge_state, event.bridge_confidence) for event in first] == [
+        (event.bridge_state, event.bridge_confidence) for event in second
+    ]
+
+
+def test_state_ids_are_read_from_sse_messages():
+    message = ": heartbeat\n\nevent: state\nid: event-1\ndata: {}\n\nevent: state\nid: event-2\ndata: {}\n\n"
+
+    assert _state_ids(message) == ["event-1", "event-2"]
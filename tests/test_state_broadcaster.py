@@ -0,0 +1,100 @@
+import asyncio
+from datetime import datetime
+from typing import List
+from app.api.v1.events.events_model import BridgeState
+from app.api.v1.state.state_broadcaster import (
+    HEARTBEAT_MESSAGE, RETRY_MESSAGE, StateBroadcaster, format_state_message
+)
+from app.api.v1.state.state_model import State
+from app.metrics import MetricsRegistry
+
+
+def make_state(i: int) -> State:
+    return State(
+        state_id=f"state-{i}",
+        bridge_state=BridgeState.OPEN,
+        timestamp=datetime(2026, 3, 1, 12, i),
+        last_event_id=f"event-{i}",
+    )
+
+
+def drain(queue: asyncio.Queue) -> List[bytes]:
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+
+def test_slow_subscriber_loses_its_oldest_messages():
+    async def scenario():
+        broadcaster = StateBroadcaster(buffer_size=2, heartbeat_interval=60, metrics=MetricsRegistry())
+        await broadcaster.start()
+        slow = broadcaster.subscribe()
+        for i in range(4):
+            broadcaster.publish(make_state(i))
+        await asyncio.sleep(0)
+        await broadcaster.stop()
+        return drain(slow)
+
+    # States 2 and 3 were buffered, then the end-of-stream marker displaced state 2
+    assert asyncio.run(scenario()) == [format_state_message(make_state(3)), None]
+
+
+def test_every_subscriber_gets_each_state():
+    async def scenario():
+        broadcaster = StateBroadcaster(buffer_size=8, heartbeat_interval=60, metrics=MetricsRegistry())
+        await broadcaster.start()
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        broadcaster.publish(make_state(1))
+        await asyncio.sleep(0)
+        await broadcaster.stop()
+        return drain(first), drain(second)
+
+    expected = [format_state_message(make_state(1)), None]
+    assert asyncio.run(scenario()) == (expected, expected)
+
+
+def test_heartbeat_reaches_idle_subscribers_without_displacing_states():
+    async def scenario():
+        broadcaster = StateBroadcaster(buffer_size=1, heartbeat_interval=0.01, metrics=MetricsRegistry())
+        await broadcaster.start()
+        idle, busy = broadcaster.subscribe(), broadcaster.subscribe()
+        broadcaster.publish(make_state(1))
+        await asyncio.sleep(0)
+        busy_messages = drain(busy)
+        drain(idle)
+        await asyncio.sleep(0.05)
+        idle_messages = drain(idle)
+        await broadcaster.stop()
+        return busy_messages, idle_messages
+
+    busy_messages, idle_messages = asyncio.run(scenario())
+
+    assert busy_messages == [format_state_message(make_state(1))]
+    assert idle_messages == [HEARTBEAT_MESSAGE]
+
+
+def test_stream_sends_retry_and_initial_state_then_unsubscribes():
+    async def scenario():
+        broadcaster = StateBroadcaster(buffer_size=8, heartbeat_interval=60, metrics=MetricsRegistry())
+        await broadcaster.start()
+        queue = broadcaster.subscribe()
+        broadcaster.publish(make_state(2))
+        await asyncio.sleep(0)
+        await broadcaster.stop()
+        messages = [message async for message in broadcaster.stream(queue, initial=make_state(1))]
+        return messages, len(broadcaster._subscribers)
+
+    messages, subscribers = asyncio.run(scenario())
+
+    assert messages == [RETRY_MESSAGE, format_state_message(make_state(1)), format_state_message(make_state(2))]
+    assert subscribers == 0
+
+
+def test_publish_before_start_is_ignored():
+    broadcaster = StateBroadcaster(metrics=MetricsRegistry())
+    queue = broadcaster.subscribe()
+
+    broadcaster.publish(make_state(1))
+
+    assert queue.empty()
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1.events.events_model import BridgeState
+from app.api.v1.state import state_controller
+from app.api.v1.state.dependencies import get_service
+from app.api.v1.state.state_cache import CurrentStateCache, state_etag
+from app.api.v1.state.state_model import State
+from app.api.v1.state.state_service import StateService
+
+
+def make_state(event_id: str, minute: int = 0) -> State:
+    return State(
+        state_id=f"state-{event_id}",
+        bridge_state=BridgeState.OPEN,
+        timestamp=datetime(2026, 3, 1, 12, minute),
+        last_event_id=event_id,
+    )
+
+
+class FakeRepository:
+    def __init__(self, state: Optional[State]):
+        self.state = state
+        self.reads = 0
+
+    async def get_current_state(self) -> Optional[State]:
+        self.reads += 1
+        return self.state
+
+
+def test_cached_state_is_served_without_reading_the_database():
+    repository = FakeRepository(make_state("event-1"))
+    service = StateService(None, repository=repository, cache=CurrentStateCache(ttl=60))
+
+    async def scenario():
+        return [await service.get_current_state() for _ in range(3)]
+
+    states = asyncio.run(scenario())
+
+    assert states == [make_state("event-1")] * 3
+    assert repository.reads == 1
+
+
+def test_missing_state_is_cached_too():
+    cache = CurrentStateCache(ttl=60)
+
+    cache.set(None)
+
+    assert cache.get() == (True, None)
+
+
+def test_expired_entry_is_a_miss():
+    cache = CurrentStateCache(ttl=0)
+    cache.set(make_state("event-1"))
+
+    assert cache.get() == (False, None)
+
+
+def test_older_state_does_not_replace_newer_one():
+    cache = CurrentStateCache(ttl=60)
+    cache.set(make_state("event-2", minute=5))
+
+    assert cache.set(make_state("event-1", minute=1)) is False
+    assert cache.get() == (True, make_state("event-2", minute=5))
+
+
+@pytest.fixture
+def client():
+    repository = FakeRepository(make_state("event-1"))
+    app = FastAPI()
+    app.include_router(state_controller.router, prefix="/api/v1")
+    app.dependency_overrides[get_service] = lambda: StateService(
+        None, repository=repository, cache=CurrentStateCache(ttl=60)
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+def test_state_carries_an_etag(client):
+    response = client.get("/api/v1/state")
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == state_etag(make_state("event-1"))
+    assert response.json()["last_event_id"] == "event-1"
+
+
+@pytest.mark.parametrize("if_none_match", ["{etag}", "W/{etag}", '"other", {etag}', "*"])
+def test_matching_etag_gets_304(client, if_none_match):
+    etag = state_etag(make_state("event-1"))
+
+    response = client.get("/api/v1/state", headers={"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+def test_stale_etag_gets_the_state(client):
+    response = client.get("/api/v1/state", headers={"If-None-Match": state_etag(make_state("event-0"))})
+
+    assert response.status_code == 200
+    assert response.json()["last_event_id"] == "event-1"
@@ -0,0 +1,59 @@
+from datetime import datetime
+import pytest
+from sqlmodel import Session, func, select
+from app.api.v1.events.events_model import BridgeState
+from app.api.v1.state.state_model import State
+from app.api.v1.state.state_repository import (
+    CURRENT_STATE_ID, StateSQLModel, _upsert_current_state_statement, collapse_state_history
+)
+from app.db import get_engine, init_db
+
+
+def make_state(event_id: str, year: int) -> State:
+    return State(
+        state_id=f"state-{event_id}",
+        bridge_state=BridgeState.OPEN,
+        timestamp=datetime(year, 1, 1),
+        last_event_id=event_id,
+    )
+
+
+@pytest.fixture
+def session():
+    try:
+        with get_engine().connect():
+            pass
+    except Exception:
+        pytest.skip("database not reachable")
+
+    init_db()
+    # Rolled back afterwards, so the real current state is left alone
+    with Session(get_engine()) as session:
+        yield session
+        session.rollback()
+
+
+def test_upsert_only_advances_to_newer_states(session):
+    newest = session.exec(_upsert_current_state_statement(make_state("newest", 9999))).first()
+    older = session.exec(_upsert_current_state_statement(make_state("older", 9998))).first()
+    replayed = session.exec(_upsert_current_state_statement(make_state("newest", 9999))).first()
+
+    assert newest.last_event_id == "newest"
+    assert older is None
+    assert replayed is None
+
+
+def test_collapse_moves_the_newest_of_many_rows_into_the_current_state_row(session):
+    # One row per state change, as older versions inserted them
+    for row_id, year in [(900001, 9997), (900002, 9999), (900003, 9998)]:
+        session.add(StateSQLModel(id=row_id, **make_state(f"row-{row_id}", year).model_dump()))
+    session.flush()
+
+    deleted = collapse_state_history(session)
+
+    current = session.get(StateSQLModel, CURRENT_STATE_ID, populate_existing=True)
+    assert current.last_event_id == "row-900002"
+    assert current.timestamp == datetime(9999, 1, 1)
+    assert session.exec(select(func.count()).select_from(StateSQLModel)).one() == 1
+    assert deleted >= 3
+    assert collapse_state_history(session) == 0
@@ -0,0 +1,94 @@
+import gzip
+import pytest
+from fastapi import Request
+from app import static_assets
+from app.static_assets import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, StaticAssets, asset_response, fingerprint
+
+SCRIPT = b"console.log('hutch');\n" * 40
+
+
+@pytest.fixture
+def assets(tmp_path) -> StaticAssets:
+    (tmp_path / "js").mkdir()
+    (tmp_path / "js" / "app.js").write_bytes(SCRIPT)
+    (tmp_path / "index.html").write_text(
+        '<link href="/static/styles.css"><script src="/static/js/app.js"></script>', encoding="utf-8"
+    )
+    assets = StaticAssets(str(tmp_path))
+    assets.build()
+    return assets
+
+
+def make_request(**headers: str) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_page_references_are_rewritten_to_fingerprinted_urls(assets):
+    html = assets.page("index.html").content.decode()
+
+    assert f'src="/static/{fingerprint("js/app.js", SCRIPT)}"' in html
+    # Files that do not exist keep their reference as written
+    assert 'href="/static/styles.css"' in html
+
+
+def test_fingerprinted_url_is_immutable_and_plain_url_revalidates(assets):
+    hashed = assets.asset(fingerprint("js/app.js", SCRIPT))
+
+    assert hashed.cache_control == IMMUTABLE_CACHE_CONTROL
+    assert assets.asset("js/app.js").cache_control == REVALIDATE_CACHE_CONTROL
+    assert assets.url_for("js/app.js") == f"/static/{fingerprint('js/app.js', SCRIPT)}"
+
+
+def test_changed_content_changes_the_fingerprint():
+    assert fingerprint("js/app.js", SCRIPT) != fingerprint("js/app.js", SCRIPT + b"\n")
+
+
+@pytest.mark.skipif(static_assets.brotli is None, reason="brotli is not installed")
+def test_brotli_is_preferred_when_accepted(assets):
+    response = asset_response(make_request(accept_encoding="gzip, deflate, br"), assets.asset("js/app.js"))
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert static_assets.brotli.decompress(response.body) == SCRIPT
+
+
+def test_gzip_is_served_when_brotli_is_refused(assets):
+    response = asset_response(make_request(accept_encoding="br;q=0, gzip"), assets.asset("js/app.js"))
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(response.body) == SCRIPT
+
+
+def test_identity_is_served_without_accept_encoding(assets):
+    response = asset_response(make_request(), assets.asset("js/app.js"))
+
+    assert "content-encoding" not in response.headers
+    assert response.body == SCRIPT
+
+
+def test_each_coding_has_its_own_etag_and_revalidates_to_304(assets):
+    asset = assets.asset("js/app.js")
+    plain = asset_response(make_request(), asset)
+    gzipped = asset_response(make_request(accept_encoding="gzip"), asset)
+
+    assert plain.headers["etag"] != gzipped.headers["etag"]
+    revalidated = asset_response(
+        make_request(accept_encoding="gzip", if_none_match=gzipped.headers["etag"]), asset
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.body == b""
+    assert asset_response(make_request(if_none_match=gzipped.headers["etag"]), asset).status_code == 200
+
+
+def test_small_assets_are_not_compressed(tmp_path):
+    (tmp_path / "tiny.js").write_bytes(b"1;")
+    assets = StaticAssets(str(tmp_path))
+    assets.build()
+
+    response = asset_response(make_request(accept_encoding="gzip, br"), assets.asset("tiny.js"))
+
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
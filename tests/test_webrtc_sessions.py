@@ -0,0 +1,120 @@
+import asyncio
+from types import SimpleNamespace
+from typing import List, Optional
+import httpx
+import pytest
+from app.api.v1.webrtc import webrtc_sessions
+from app.api.v1.webrtc.webrtc_sessions import ViewerLimitReached, WhepSessionRegistry, upstream_path_from_location
+from app.metrics import MetricsRegistry
+
+pytestmark = pytest.mark.clock(webrtc_sessions)
+
+
+@pytest.mark.parametrize("location, path", [
+    ("/cam/whep/session/abc", "/cam/whep/session/abc"),
+    ("http://mediamtx:8889/cam/whep/session/abc", "/cam/whep/session/abc"),
+    ("http://mediamtx:8889/cam/whep/session/abc?token=1", "/cam/whep/session/abc?token=1"),
+])
+def test_session_location_becomes_a_path_on_mediamtx(location, path):
+    assert upstream_path_from_location(location) == path
+
+
+class FakeUpstream:
+    """Answers every request with `status`, or fails to connect when it is None."""
+
+    def __init__(self, status: Optional[int]):
+        self.status = status
+        self.requests: List[tuple] = []
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        self.requests.append((method, path))
+        if self.status is None:
+            raise httpx.ConnectError("MediaMTX unreachable")
+        return httpx.Response(self.status)
+
+
+def test_viewers_cannot_take_the_slots_reserved_for_admins(clock):
+    sessions = WhepSessionRegistry(max_viewers=3, admin_reserved=1, upstream=FakeUpstream(200), metrics=MetricsRegistry())
+    sessions.admit(is_admin=False)
+    sessions.admit(is_admin=False)
+
+    with pytest.raises(ViewerLimitReached):
+        sessions.admit(is_admin=False)
+    sessions.admit(is_admin=True)
+    with pytest.raises(ViewerLimitReached):
+        sessions.admit(is_admin=True)
+    assert (sessions.count(is_admin=False), sessions.count(is_admin=True)) == (2, 1)
+
+
+def test_admins_may_take_any_free_slot(clock):
+    sessions = WhepSessionRegistry(max_viewers=3, admin_reserved=1, upstream=FakeUpstream(200), metrics=MetricsRegistry())
+    for _ in range(3):
+        sessions.admit(is_admin=True)
+
+    with pytest.raises(ViewerLimitReached):
+        sessions.admit(is_admin=False)
+
+
+def test_removing_a_session_frees_its_slot(clock):
+    sessions = WhepSessionRegistry(max_viewers=1, admin_reserved=0, upstream=FakeUpstream(200), metrics=MetricsRegistry())
+    session = sessions.admit(is_admin=False)
+
+    sessions.remove(session.session_id)
+
+    sessions.admit(is_admin=False)
+
+
+def test_reserve_larger_than_the_cap_leaves_viewers_no_slots(clock):
+    sessions = WhepSessionRegistry(max_viewers=2, admin_reserved=5, upstream=FakeUpstream(200), metrics=MetricsRegistry())
+
+    with pytest.raises(ViewerLimitReached):
+        sessions.admit(is_admin=False)
+    sessions.admit(is_admin=True)
+    sessions.admit(is_admin=True)
+
+
+def idle_session(sessions: WhepSessionRegistry, clock: SimpleNamespace, heartbeat: bool = False):
+    session = sessions.admit(is_admin=False)
+    session.upstream_path = f"/cam/whep/session/{session.session_id}"
+    sessions.touch(session.session_id, heartbeat=heartbeat)
+    clock.now += sessions.idle_timeout + 1
+    return session
+
+
+def test_idle_session_still_open_on_mediamtx_is_kept(clock):
+    sessions = WhepSessionRegistry(idle_timeout=30, upstream=FakeUpstream(204), metrics=MetricsRegistry())
+    session = idle_session(sessions, clock)
+
+    assert asyncio.run(sessions.reap()) == 0
+    assert sessions.get(session.session_id).last_activity == clock.now
+
+
+def test_idle_session_closed_on_mediamtx_is_reaped(clock):
+    upstream = FakeUpstream(404)
+    sessions = WhepSessionRegistry(idle_timeout=30, upstream=upstream, metrics=MetricsRegistry())
+    session = idle_session(sessions, clock)
+
+    assert asyncio.run(sessions.reap()) == 1
+    assert sessions.get(session.session_id) is None
+    assert [method for method, _ in upstream.requests] == ["PATCH"]
+
+
+def test_unreachable_mediamtx_only_reaps_sessions_whose_heartbeats_stopped(clock):
+    upstream = FakeUpstream(None)
+    sessions = WhepSessionRegistry(idle_timeout=30, upstream=upstream, metrics=MetricsRegistry())
+    player = idle_session(sessions, clock)
+    heartbeating = idle_session(sessions, clock, heartbeat=True)
+
+    assert asyncio.run(sessions.reap()) == 1
+    assert sessions.get(player.session_id) is not None
+    assert sessions.get(heartbeating.session_id) is None
+    assert ("DELETE", heartbeating.upstream_path) in upstream.requests
+
+
+def test_session_still_being_set_up_is_not_reaped(clock):
+    sessions = WhepSessionRegistry(idle_timeout=30, upstream=FakeUpstream(404), metrics=MetricsRegistry())
+    session = sessions.admit(is_admin=False)
+    clock.now += 60
+
+    assert asyncio.run(sessions.reap()) == 0
+    assert sessions.get(session.session_id) is not None
@@ -0,0 +1,101 @@
+import asyncio
+import httpx
+import pytest
+from app.api.v1.webrtc import webrtc_upstream
+from app.api.v1.webrtc.webrtc_upstream import CircuitBreaker, MediaMTXClient, UpstreamUnavailable
+from app.metrics import MetricsRegistry
+
+pytestmark = pytest.mark.clock(webrtc_upstream)
+
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert not breaker.is_open
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.is_open
+    with pytest.raises(UpstreamUnavailable) as rejected:
+        breaker.before_call()
+    assert rejected.value.retry_after == 10
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert not breaker.is_open
+
+
+def test_one_trial_call_is_let_through_after_the_reset_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.now += 10
+
+    breaker.before_call()
+
+    with pytest.raises(UpstreamUnavailable):
+        breaker.before_call()
+
+
+def test_successful_trial_closes_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_call()
+
+    breaker.record_success()
+
+    assert not breaker.is_open
+    breaker.before_call()
+
+
+def test_failed_trial_reopens_the_circuit_for_another_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=10)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 10
+    breaker.before_call()
+
+    breaker.record_failure()
+
+    clock.now += 9
+    with pytest.raises(UpstreamUnavailable):
+        breaker.before_call()
+    clock.now += 1
+    breaker.before_call()
+
+
+def test_aborted_trial_lets_another_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_call()
+
+    breaker.record_aborted()
+
+    breaker.before_call()
+
+
+def test_client_counts_server_errors_against_the_circuit():
+    statuses = iter([503, 503, 201])
+    client = MediaMTXClient(base_url="http://mediamtx:8889", breaker=CircuitBreaker(2, reset_timeout=60), metrics=MetricsRegistry())
+    client._client = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(lambda request: httpx.Response(next(statuses))),
+    )
+
+    async def scenario():
+        responses = [await client.request("POST", "/cam/whep") for _ in range(2)]
+        with pytest.raises(UpstreamUnavailable):
+            await client.request("POST", "/cam/whep")
+        await client.stop()
+        return responses
+
+    assert [response.status_code for response in asyncio.run(scenario())] == [503, 503]